@@ -37,26 +37,42 @@ Attributes:
 """
 
 
+from bisect import bisect_left, bisect_right
+from calendar import monthrange
 from datetime import date
+from functools import lru_cache
 from itertools import combinations
 from itertools import repeat
-from dateutil.relativedelta import relativedelta
+
+from .metric_key import ALL_CHARACTERISTICS, CHARACTERISTICS, \
+    CHARACTERISTIC_SUBSETS, MetricKey, project
 
 
 # We measure in 1-year follow up periods up to 10 years after date of release.
 FOLLOW_UP_PERIODS = range(1, 11)
 
+# Age buckets indexed by age, up to the age at which the last bucket begins.
+_AGE_BUCKETS_BY_AGE = (('<25',) * 25 + ('25-29',) * 5 + ('30-34',) * 5
+                       + ('35-39',) * 5 + ('40<',))
+
+# Stay length buckets indexed by whole years of stay, up to the year at which
+# the last bucket begins.
+_STAY_LENGTH_BUCKETS_BY_YEAR = ('<12', '12-24', '24-36', '36-48', '48-60',
+                                '60-72', '72-84', '84-96', '96-108',
+                                '108-120', '120<')
 
-def map_recidivism_combinations(person, recidivism_events):
+
+def map_recidivism_combinations(person, recidivism_events, as_of=None):
     """Transforms the given recidivism events and person details into unique
     recidivism metric combinations to count.
 
     Takes in a person and all of her recidivism events and returns an array of
-    "recidivism combinations". These are key-value pairs where the key
-    represents a specific metric and the value represents whether or not
-    recidivism occurred. If a metric does count towards recidivism, then the
-    value is 1 if event-based or 1/k if offender-based, where k = the number of
-    releases for that person within the follow-up period after the release.
+    "recidivism combinations". These are key-value pairs where the key is a
+    MetricKey representing a specific metric and the value represents whether
+    or not recidivism occurred. If a metric does count towards recidivism,
+    then the value is 1 if event-based or 1/k if offender-based, where k = the
+    number of releases for that person within the follow-up period after the
+    release.
     If it does not count towards recidivism, then the value is 0 in either
     methodology.
 
@@ -68,7 +84,7 @@ def map_recidivism_combinations(person, recidivism_events):
     people, and more depending on other dimensions in the data.
 
     Example output for a hispanic female age 27 who was released in 2008 and
-    went back to prison in 2014:
+    went back to prison in 2014, with keys shown as their combinations:
     [
       ({"methodology": "EVENT", "release_cohort": 2008, "follow_up_period": 5,
         "sex": "female", "age": "25-29"}, 0),
@@ -84,33 +100,86 @@ def map_recidivism_combinations(person, recidivism_events):
     Args:
         person: the person
         recidivism_events: the list of RecidivismEvents for the person.
+        as_of: the Date through which follow-up periods are measured.
+            Defaults to today.
 
     Returns:
-        A list of key-value tuples representing specific metric combinations and
+        A list of key-value tuples representing specific metric keys and
         the recidivism value corresponding to that metric.
     """
+    return [(project(key, characteristics), value)
+            for key, value in map_recidivism_cells(person, recidivism_events,
+                                                   as_of)
+            for characteristics in CHARACTERISTIC_SUBSETS]
+
+
+def map_recidivism_cells(person, recidivism_events, as_of=None):
+    """Transforms the given recidivism events and person details into
+    finest-grain recidivism metric cells to count.
+
+    This is map_recidivism_combinations restricted to the metrics sliced by
+    every characteristic. Every other metric can be derived by summing these
+    cells with cube.rollup, which lets the pipeline shuffle one value per
+    event, period and methodology instead of one per characteristic subset.
+
+    Args:
+        person: the person
+        recidivism_events: the list of RecidivismEvents for the person.
+        as_of: the Date through which follow-up periods are measured.
+            Defaults to today.
+
+    Returns:
+        A list of key-value tuples of finest-grain metric keys and the
+        recidivism value corresponding to that metric.
+    """
     metrics = []
     all_reincarceration_dates = reincarceration_dates(recidivism_events)
+    as_of = as_of or date.today()
 
     for release_cohort, event in recidivism_events.items():
-        characteristic_combos = characteristic_combinations(person, event)
-
         earliest_recidivism_period = earliest_recidivated_follow_up_period(
             event.release_date, event.reincarceration_date)
 
-        relevant_periods = relevant_follow_up_periods(
-            event.release_date, date.today(), FOLLOW_UP_PERIODS)
+        anniversaries = release_anniversaries(event.release_date,
+                                              FOLLOW_UP_PERIODS)
+        relevant_periods = FOLLOW_UP_PERIODS[
+            :bisect_right(anniversaries, as_of)]
+        reincarcerations_by_period = count_reincarcerations_in_windows(
+            anniversaries, relevant_periods, all_reincarceration_dates)
 
-        for combo in characteristic_combos:
-            combo["release_cohort"] = release_cohort
-
-            metrics.extend(combination_metrics(
-                combo, event, all_reincarceration_dates,
-                earliest_recidivism_period, relevant_periods))
+        metrics.extend(combination_metrics(
+            (release_cohort, ALL_CHARACTERISTICS,
+             event_characteristics(person, event)), event,
+            reincarcerations_by_period, earliest_recidivism_period,
+            relevant_periods))
 
     return metrics
 
 
+def next_period_start(recidivism_events, as_of):
+    """The first date after the given date on which another follow-up period
+    becomes relevant for one of the given recidivism events.
+
+    Metrics mapped from these events as of any date before this one are the
+    same as those mapped as of the given date, so there is no need to map the
+    events again until then unless they change.
+
+    Args:
+        recidivism_events: the list of RecidivismEvents for a person.
+        as_of: the Date the events were last mapped as of.
+
+    Returns:
+        A Date, or None if every follow-up period is already relevant for
+        every event.
+    """
+    starts = (anniversary
+              for event in recidivism_events.values()
+              for anniversary in release_anniversaries(
+                  event.release_date, FOLLOW_UP_PERIODS)[:-1]
+              if anniversary > as_of)
+    return min(starts, default=None)
+
+
 def reincarceration_dates(recidivism_events):
     """The dates of reincarceration within the given recidivism events.
 
@@ -123,12 +192,12 @@ def reincarceration_dates(recidivism_events):
         recidivism_events: the list of recidivism events.
 
     Returns:
-        A list of reincarceration dates, in the order in which they appear in
-        the given list of objects.
+        A list of reincarceration dates, sorted in ascending order so that
+        windows of it can be counted with bisect.
     """
-    return [event.reincarceration_date
-            for _cohort, event in recidivism_events.items()
-            if event.reincarceration_date]
+    return sorted(event.reincarceration_date
+                  for _cohort, event in recidivism_events.items()
+                  if event.reincarceration_date)
 
 
 def count_reincarcerations_in_window(start_date,
@@ -149,19 +218,80 @@ def count_reincarcerations_in_window(start_date,
     Args:
         start_date: a Date to start tracking from
         follow_up_period: the follow-up period to count within
-        all_reincarceration_dates: the list of reincarceration dates to check
+        all_reincarceration_dates: the list of reincarceration dates to check,
+            sorted in ascending order
 
     Returns:
         How many of the given reincarceration dates are within the follow-up
         period from the given start date.
     """
-    reincarcerations_in_window = \
-        [reincarceration_date for reincarceration_date
-         in all_reincarceration_dates
-         if start_date + relativedelta(years=follow_up_period)
-         > reincarceration_date >= start_date]
+    end_date = _add_years(start_date, follow_up_period)
+    return bisect_left(all_reincarceration_dates, end_date) \
+        - bisect_left(all_reincarceration_dates, start_date)
+
+
+def release_anniversaries(release_date, follow_up_periods):
+    """The anniversaries of the given release date that bound the given
+    follow-up periods.
+
+    Anniversaries are cached per release date and longest period, as many
+    releases share a date, and are computed once per release rather than for
+    every period and every characteristic combination.
+
+    Example:
+        release_anniversaries("2016-02-29", range(1, 3)) =
+            ["2016-02-29", "2017-02-28", "2018-02-28"]
+
+    Args:
+        release_date: the release Date we are tracking from
+        follow_up_periods: the follow-up periods that will be measured
+
+    Returns:
+        A tuple of Dates where index n is n years after the release date, up
+        to and including the longest of the given follow-up periods. Follow-up
+        period p therefore starts its final year at index p - 1 and ends,
+        exclusive, at index p.
+    """
+    return _anniversaries(release_date, max(follow_up_periods, default=0))
+
+
+@lru_cache(maxsize=1 << 16)
+def _anniversaries(release_date, years):
+    return tuple(_add_years(release_date, year) for year in range(years + 1))
+
+
+def _add_years(start_date, years):
+    """The date the given number of years after the given date, moving leap
+    days to February 28th as relativedelta does."""
+    try:
+        return start_date.replace(year=start_date.year + years)
+    except ValueError:
+        return start_date.replace(year=start_date.year + years, day=28)
+
+
+def count_reincarcerations_in_windows(anniversaries, follow_up_periods,
+                                      all_reincarceration_dates):
+    """The number of the given reincarceration dates within each of the given
+    follow-up periods after a release.
 
-    return len(reincarcerations_in_window)
+    Equivalent to calling count_reincarcerations_in_window for each period,
+    but bisects from the release date only once.
+
+    Args:
+        anniversaries: the release anniversaries, as returned by
+            release_anniversaries
+        follow_up_periods: the follow-up periods to count within
+        all_reincarceration_dates: the list of reincarceration dates to check,
+            sorted in ascending order
+
+    Returns:
+        A dictionary from each follow-up period to the number of the given
+        reincarceration dates within that period from the release date.
+    """
+    start = bisect_left(all_reincarceration_dates, anniversaries[0])
+    return {period: bisect_left(all_reincarceration_dates,
+                                anniversaries[period], start) - start
+            for period in follow_up_periods}
 
 
 def earliest_recidivated_follow_up_period(release_date, reincarceration_date):
@@ -224,8 +354,9 @@ def relevant_follow_up_periods(release_date, current_date, follow_up_periods):
         The list of follow up periods which are relevant to measure, i.e.
         already completed or still in progress.
     """
-    return [period for period in follow_up_periods
-            if release_date + relativedelta(years=period - 1) <= current_date]
+    anniversaries = release_anniversaries(release_date, follow_up_periods)
+    relevant = bisect_right(anniversaries, current_date)
+    return [period for period in follow_up_periods if period <= relevant]
 
 
 def age_at_date(person, check_date):
@@ -253,17 +384,12 @@ def age_bucket(age):
         age: the person's age
 
     Returns:
-        A string representation of the age bucket for the person.
+        A string representation of the age bucket for the person. None if the
+        age is not known.
     """
-    if age < 25:
-        return '<25'
-    if age <= 29:
-        return '25-29'
-    if age <= 34:
-        return '30-34'
-    if age <= 39:
-        return '35-39'
-    return '40<'
+    if age is None:
+        return None
+    return _AGE_BUCKETS_BY_AGE[min(max(age, 0), len(_AGE_BUCKETS_BY_AGE) - 1)]
 
 
 def stay_length_from_event(event):
@@ -285,8 +411,24 @@ def stay_length_from_event(event):
     if event.original_entry_date is None or event.release_date is None:
         return None
 
-    delta = relativedelta(event.release_date, event.original_entry_date)
-    return delta.years * 12 + delta.months
+    return _months_between(event.original_entry_date, event.release_date)
+
+
+def _months_between(start_date, end_date):
+    """The whole months from the start date to the end date, counted as
+    relativedelta(end_date, start_date) counts them.
+
+    A month from the 31st ends on the last day of a shorter month, e.g. there
+    is one month from 2015-01-31 to 2015-02-28.
+    """
+    months = (end_date.year - start_date.year) * 12 \
+        + end_date.month - start_date.month
+    day = min(start_date.day, monthrange(end_date.year, end_date.month)[1])
+    if end_date >= start_date and end_date.day < day:
+        months -= 1
+    elif end_date < start_date and end_date.day > day:
+        months += 1
+    return months
 
 
 def stay_length_bucket(stay_length):
@@ -304,27 +446,8 @@ def stay_length_bucket(stay_length):
     """
     if stay_length is None:
         return None
-    if stay_length < 12:
-        return '<12'
-    if stay_length < 24:
-        return '12-24'
-    if stay_length < 36:
-        return '24-36'
-    if stay_length < 48:
-        return '36-48'
-    if stay_length < 60:
-        return '48-60'
-    if stay_length < 72:
-        return '60-72'
-    if stay_length < 84:
-        return '72-84'
-    if stay_length < 96:
-        return '84-96'
-    if stay_length < 108:
-        return '96-108'
-    if stay_length < 120:
-        return '108-120'
-    return '120<'
+    return _STAY_LENGTH_BUCKETS_BY_YEAR[
+        min(max(stay_length, 0) // 12, len(_STAY_LENGTH_BUCKETS_BY_YEAR) - 1)]
 
 
 def characteristic_combinations(person, event):
@@ -362,17 +485,28 @@ def characteristic_combinations(person, event):
         A list of dictionaries containing all unique combinations of
         characteristics.
     """
+    return for_characteristics(
+        dict(zip(CHARACTERISTICS, event_characteristics(person, event))))
+
+
+def event_characteristics(person, event):
+    """The metric characteristics picked from the given person and recidivism
+    event.
+
+    Args:
+        person: the person we are picking characteristics from
+        event: the recidivism event we are picking characteristics from
+
+    Returns:
+        A tuple of the characteristic values, in metric_key.CHARACTERISTICS
+        order.
+    """
     entry_age = age_at_date(person, event.original_entry_date)
     entry_age_bucket = age_bucket(entry_age)
     event_stay_length = stay_length_from_event(event)
     event_stay_length_bucket = stay_length_bucket(event_stay_length)
-    characteristics = {"age": entry_age_bucket,
-                       "race": person.race,
-                       "sex": person.sex,
-                       "stay_length": event_stay_length_bucket,
-                       "release_facility": event.release_facility}
-
-    return for_characteristics(characteristics)
+    return (entry_age_bucket, person.race, person.sex,
+            event_stay_length_bucket, event.release_facility)
 
 
 def for_characteristics(characteristics):
@@ -405,7 +539,7 @@ def for_characteristics(characteristics):
     return combos
 
 
-def combination_metrics(combo, event, all_reincarceration_dates,
+def combination_metrics(combo, event, reincarcerations_by_period,
                         earliest_recidivism_period, relevant_periods):
     """Returns all unique recidivism metrics for the given combination.
 
@@ -415,16 +549,20 @@ def combination_metrics(combo, event, all_reincarceration_dates,
     to 0 or 1 accordingly.
 
     Args:
-        combo: a characteristic combination to convert into metrics
+        combo: a characteristic combination to convert into metrics, as a
+            (release cohort, characteristics bitmask, characteristic values)
+            tuple
         event: the recidivism event from which the combination was derived
-        all_reincarceration_dates: all dates of reincarceration for the person's
-            recidivism events
+        reincarcerations_by_period: a dictionary from each relevant period to
+            the number of the person's reincarcerations within that period
+            after the event's release, as from
+            count_reincarcerations_in_windows
         earliest_recidivism_period: the earliest follow-up period under which
             recidivism occurred
         relevant_periods: the list of periods relevant for measurement
 
     Returns:
-        A list of key-value tuples representing specific metric combinations and
+        A list of key-value tuples representing specific metric keys and
         the recidivism value corresponding to that metric.
     """
     metrics = []
@@ -449,34 +587,25 @@ def combination_metrics(combo, event, all_reincarceration_dates,
         else:
             metrics.append((offender_based_combo, 1))
 
-            reincarcerations_in_window = \
-                count_reincarcerations_in_window(
-                    event.release_date, period,
-                    all_reincarceration_dates)
-
-            for _ in repeat(None, reincarcerations_in_window):
+            for _ in repeat(None, reincarcerations_by_period[period]):
                 metrics.append((event_based_combo, 1))
 
     return metrics
 
 
 def augment_combination(characteristic_combo, methodology, period):
-    """A copy of the given combo with the given additional parameters added.
-
-    Creates a shallow copy of the given characteristic combination and sets the
-    given methodology and follow-up period on the copy. This avoids updating the
-    existing characteristic combo.
+    """The MetricKey for the given combo with the given additional parameters.
 
     Args:
-        characteristic_combo: the combination to copy and augment
+        characteristic_combo: the (release cohort, characteristics bitmask,
+            characteristic values) tuple to augment
         methodology: the methodology to set, i.e. "OFFENDER" or "EVENT"
         period: the follow-up period to set
 
     Returns:
-        The augmented characteristic combination, ready for tracking.
+        The MetricKey for the augmented characteristic combination, ready for
+        tracking.
     """
-
-    augmented_combo = characteristic_combo.copy()
-    augmented_combo["methodology"] = methodology
-    augmented_combo["follow_up_period"] = period
-    return augmented_combo
+    release_cohort, characteristics, values = characteristic_combo
+    return MetricKey(release_cohort, period, methodology, characteristics,
+                     *values)
@@ -0,0 +1,75 @@
+# Recidiviz - a platform for tracking granular recidivism metrics in real time
+# Copyright (C) 2019 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+
+"""Rolls finest-grain recidivism cells up into every metric.
+
+The map phase only needs to count each event once per follow-up period and
+methodology, in the cell sliced by every characteristic. Every other metric,
+i.e. every subset of the characteristics, is a sum over those cells, so it is
+derived here after the cells have been combined, the way SQL's GROUP BY CUBE
+derives grouping sets.
+
+The rollup drops one characteristic at a time: after aggregating the cells,
+each key that still has the first characteristic is summed into its parent
+without it, then the same is done for the second characteristic over the
+result, and so on. Each subset is reached by exactly one sequence of drops, so
+every cell contributes to every subset exactly once, and each step only
+touches the already aggregated keys of the step before.
+"""
+
+from .metric_key import ALL_CHARACTERISTICS, CHARACTERISTICS, MetricKey
+
+
+def rollup(cells):
+    """Derives every metric from the given finest-grain cells.
+
+    Args:
+        cells: a dictionary from MetricKeys sliced by every characteristic to
+            (total_records, total_recidivism) pairs.
+
+    Returns:
+        A new dictionary from the MetricKey of every subset of characteristics
+        to its (total_records, total_recidivism) pair.
+
+    Raises:
+        ValueError: if a key is not sliced by every characteristic.
+    """
+    totals = {}
+    for key, pair in cells.items():
+        if key.characteristics != ALL_CHARACTERISTICS:
+            raise ValueError('Can only roll up finest-grain cells, got '
+                             '{}'.format(key))
+        totals[key] = pair
+
+    for index in range(len(CHARACTERISTICS)):
+        for key, (records, recidivism) in list(totals.items()):
+            parent = _drop(key, index)
+            if parent in totals:
+                total_records, total_recidivism = totals[parent]
+                totals[parent] = (total_records + records,
+                                  total_recidivism + recidivism)
+            else:
+                totals[parent] = (records, recidivism)
+    return totals
+
+
+def _drop(key, index):
+    """The key without the characteristic at the given index."""
+    position = 4 + index
+    return MetricKey._make(
+        key[:3] + (key.characteristics & ~(1 << index),)
+        + key[4:position] + (None,) + key[position + 1:])
@@ -0,0 +1,226 @@
+# Recidiviz - a platform for tracking granular recidivism metrics in real time
+# Copyright (C) 2019 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+
+"""Incremental recidivism metric calculation.
+
+Rather than mapping every person on every run, an IncrementalCalculator keeps
+the finest-grain cell totals from the previous run along with each person's
+contribution to them. A refresh retracts the previous contribution of each
+person who needs to be mapped again and adds their new one, and all metrics
+are then rolled up from the cells.
+
+A person needs to be mapped again when their person or booking rows have
+changed (see database.read_person_ids_changed_since), or when one of their
+follow-up periods has become relevant since the last run, because metrics
+depend on the as-of date as well as on the records.
+
+For the next run to refresh only the people who need it, the calculator is
+saved between runs. save and load store it as JSON, which serialize and
+deserialize produce and parse for storage other than a local file. Person keys
+must therefore be ints or strings, like person ids.
+
+Example:
+    calculator = IncrementalCalculator.load(state_path)
+    changed = database.read_person_ids_changed_since(session, last_run_time)
+    calculator.refresh(changed, load_people, date.today())
+    metrics = calculator.metrics()
+    calculator.save(state_path)
+"""
+
+import datetime
+import json
+from collections import Counter, defaultdict
+
+from . import metric_key, pipeline
+from .calculator import map_recidivism_cells, next_period_start
+from .cube import rollup
+
+
+class IncrementalCalculator:
+    """Maintains recidivism metric cells across runs."""
+
+    def __init__(self):
+        # The date the cells were last mapped as of.
+        self.as_of = None
+
+        # Finest-grain MetricKeys to (total_records, total_recidivism).
+        self._cells = {}
+
+        # Person keys to that person's share of self._cells.
+        self._contributions = {}
+
+        # Person keys to the date on which a new follow-up period becomes
+        # relevant for that person.
+        self._next_period_starts = {}
+
+    def people_to_update(self, changed_person_keys, as_of):
+        """The keys of the people who must be mapped again to refresh as of the
+        given date.
+
+        Args:
+            changed_person_keys: the keys of people whose records have changed
+                since the last refresh.
+            as_of: the Date to refresh as of.
+
+        Returns:
+            A set of the changed person keys and the keys of every person with
+            a follow-up period that has become relevant by the given date.
+        """
+        due = {person_key for person_key, start
+               in self._next_period_starts.items() if start <= as_of}
+        return due | set(changed_person_keys)
+
+    def refresh(self, changed_person_keys, load_people, as_of):
+        """Brings the cells up to date as of the given date.
+
+        Args:
+            changed_person_keys: the keys of people whose records have changed
+                since the last refresh, including people who were added or
+                deleted.
+            load_people: a function that takes a set of person keys and
+                returns an iterable of (person_key, person, records, snapshots)
+                tuples for those that still exist.
+            as_of: the Date to refresh as of.
+
+        Returns:
+            The number of people that were mapped again.
+
+        Raises:
+            ValueError: if as_of is earlier than the previous refresh.
+        """
+        if self.as_of is not None and as_of < self.as_of:
+            raise ValueError('Cannot refresh as of {}, already refreshed as '
+                             'of {}'.format(as_of, self.as_of))
+
+        person_keys = self.people_to_update(changed_person_keys, as_of)
+        for person_key in person_keys:
+            self._retract(person_key)
+
+        for person_key, person, records, snapshots in load_people(
+                person_keys):
+            self._add(person_key, person, records, snapshots, as_of)
+
+        self.as_of = as_of
+        return len(person_keys)
+
+    def metrics(self, counters=None):
+        """Every RecidivismMetric, rolled up from the current cells.
+
+        Args:
+            counters: the Counter to increment while reducing. Defaults to a
+                new Counter rather than the module-level pipeline COUNTERS.
+        """
+        if counters is None:
+            counters = Counter()
+        return [pipeline.reduce_combined_values(key, combined, counters)
+                for key, combined in rollup(self._cells).items()]
+
+    def save(self, path):
+        """Writes the calculator to a local file that load can read back."""
+        with open(path, 'w') as f:
+            f.write(self.serialize())
+
+    @staticmethod
+    def load(path):
+        """Reads a calculator written by save.
+
+        Raises:
+            ValueError: if the file does not hold a saved calculator.
+        """
+        with open(path) as f:
+            return IncrementalCalculator.deserialize(f.read())
+
+    def serialize(self):
+        """Serializes the calculator to a JSON string that deserialize can
+        read back."""
+        return json.dumps({
+            'as_of': self.as_of.isoformat() if self.as_of else None,
+            'cells': _serialize_cells(self._cells),
+            'contributions': [
+                [person_key, _serialize_cells(contribution)]
+                for person_key, contribution in self._contributions.items()],
+            'next_period_starts': [
+                [person_key, start.isoformat()]
+                for person_key, start in self._next_period_starts.items()],
+        }, separators=(',', ':'))
+
+    @staticmethod
+    def deserialize(serialized):
+        """Parses a string produced by serialize back into a calculator.
+
+        Raises:
+            ValueError: if the string is not a serialized calculator.
+        """
+        try:
+            state = json.loads(serialized)
+            calculator = IncrementalCalculator()
+            if state['as_of'] is not None:
+                calculator.as_of = datetime.date.fromisoformat(state['as_of'])
+            calculator._cells = _deserialize_cells(state['cells'])
+            calculator._contributions = {
+                person_key: _deserialize_cells(contribution)
+                for person_key, contribution in state['contributions']}
+            calculator._next_period_starts = {
+                person_key: datetime.date.fromisoformat(start)
+                for person_key, start in state['next_period_starts']}
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(
+                'Not a serialized IncrementalCalculator: {}'.format(e))
+        return calculator
+
+    def _add(self, person_key, person, records, snapshots, as_of):
+        recidivism_events = pipeline.find_recidivism_events(records,
+                                                            snapshots)
+
+        values_by_key = defaultdict(list)
+        for key, value in map_recidivism_cells(person, recidivism_events,
+                                               as_of):
+            values_by_key[key].append(value)
+        contribution = {key: pipeline.combine_values(values)
+                        for key, values in values_by_key.items()}
+
+        for key, (records_to_add, recidivism_to_add) in contribution.items():
+            total_records, total_recidivism = self._cells.get(key, (0, 0))
+            self._cells[key] = (total_records + records_to_add,
+                                total_recidivism + recidivism_to_add)
+
+        if contribution:
+            self._contributions[person_key] = contribution
+        start = next_period_start(recidivism_events, as_of)
+        if start is not None:
+            self._next_period_starts[person_key] = start
+
+    def _retract(self, person_key):
+        self._next_period_starts.pop(person_key, None)
+        contribution = self._contributions.pop(person_key, {})
+        for key, (records, recidivism) in contribution.items():
+            total_records, total_recidivism = self._cells[key]
+            if total_records == records:
+                del self._cells[key]
+            else:
+                self._cells[key] = (total_records - records,
+                                    total_recidivism - recidivism)
+
+
+def _serialize_cells(cells):
+    return [[metric_key.serialize(key), records, recidivism]
+            for key, (records, recidivism) in cells.items()]
+
+
+def _deserialize_cells(serialized):
+    return {metric_key.deserialize(key): (records, recidivism)
+            for key, records, recidivism in serialized}
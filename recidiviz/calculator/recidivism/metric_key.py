@@ -0,0 +1,145 @@
+# Recidiviz - a platform for tracking granular recidivism metrics in real time
+# Copyright (C) 2019 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+
+"""Keys identifying a single recidivism metric.
+
+A MetricKey is a fixed-order tuple of every dimension a metric can be sliced
+by. Which optional characteristics are part of the metric is recorded in a
+bitmask, because a metric for people of unknown race (race=None) is distinct
+from a metric across all races.
+
+Keys are hashable and can be used directly through map, shuffle and reduce.
+Where a key has to cross a process or storage boundary as a string, serialize
+and deserialize convert it to and from a JSON list.
+
+Example:
+    key = MetricKey.for_characteristics(
+        2008, 5, 'EVENT', {'race': 'black', 'sex': 'female'})
+    key.race == 'black'
+    key.age is None
+    key.to_combination() == {'release_cohort': 2008, 'follow_up_period': 5,
+                             'methodology': 'EVENT', 'race': 'black',
+                             'sex': 'female'}
+"""
+
+import json
+import sys
+from itertools import combinations
+from typing import NamedTuple, Optional
+
+# The optional characteristics a metric can be sliced by, in key order.
+CHARACTERISTICS = ('age', 'race', 'sex', 'stay_length', 'release_facility')
+
+_REQUIRED = ('release_cohort', 'follow_up_period', 'methodology')
+
+# Bitmask of a metric sliced by every characteristic, i.e. a finest-grain cell.
+ALL_CHARACTERISTICS = (1 << len(CHARACTERISTICS)) - 1
+
+# Bitmasks of every subset of CHARACTERISTICS, ordered by subset size and then
+# in the same order as itertools.combinations.
+CHARACTERISTIC_SUBSETS = tuple(
+    sum(1 << CHARACTERISTICS.index(name) for name in subset)
+    for size in range(len(CHARACTERISTICS) + 1)
+    for subset in combinations(CHARACTERISTICS, size))
+
+
+class MetricKey(NamedTuple):
+    """The dimensions identifying a single recidivism metric."""
+
+    release_cohort: int
+    follow_up_period: int
+    methodology: str
+
+    # Bitmask of the CHARACTERISTICS this metric is sliced by.
+    characteristics: int = 0
+
+    age: Optional[str] = None
+    race: Optional[str] = None
+    sex: Optional[str] = None
+    stay_length: Optional[str] = None
+    release_facility: Optional[str] = None
+
+    @staticmethod
+    def for_characteristics(release_cohort, follow_up_period, methodology,
+                            characteristics):
+        """Builds a key from a dictionary of characteristic names to values."""
+        mask = 0
+        values = []
+        for index, name in enumerate(CHARACTERISTICS):
+            if name in characteristics:
+                mask |= 1 << index
+            values.append(characteristics.get(name))
+        return MetricKey(release_cohort, follow_up_period, methodology, mask,
+                         *values)
+
+    @staticmethod
+    def from_combination(combination):
+        """Builds a key from a metric combination dictionary, the inverse of
+        to_combination."""
+        characteristics = {name: value for name, value in combination.items()
+                           if name not in _REQUIRED}
+        return MetricKey.for_characteristics(
+            combination['release_cohort'], combination['follow_up_period'],
+            combination['methodology'], characteristics)
+
+    def has_characteristic(self, name):
+        """Whether the metric is sliced by the given characteristic."""
+        return bool(self.characteristics
+                    & (1 << CHARACTERISTICS.index(name)))
+
+    def to_combination(self):
+        """The metric combination dictionary this key represents."""
+        combination = {name: getattr(self, name) for name in _REQUIRED}
+        for name in CHARACTERISTICS:
+            if self.has_characteristic(name):
+                combination[name] = getattr(self, name)
+        return combination
+
+
+def project(key, characteristics):
+    """The key for the given subset of the characteristics in the given key.
+
+    Args:
+        key: the MetricKey to project.
+        characteristics: a bitmask of the characteristics to keep.
+
+    Returns:
+        A MetricKey sliced by only the given characteristics.
+    """
+    characteristics &= key.characteristics
+    return MetricKey(key.release_cohort, key.follow_up_period,
+                     key.methodology, characteristics,
+                     *(value if characteristics & (1 << index) else None
+                       for index, value in enumerate(key[4:])))
+
+
+def serialize(key):
+    """Serializes a MetricKey to a string that deserialize can read back."""
+    return json.dumps(key, separators=(',', ':'))
+
+
+def deserialize(serialized):
+    """Parses a string produced by serialize back into a MetricKey.
+
+    Raises:
+        ValueError: if the string is not a serialized MetricKey.
+    """
+    values = json.loads(serialized)
+    if not isinstance(values, list) or len(values) != len(MetricKey._fields):
+        raise ValueError('Not a serialized MetricKey: {}'.format(serialized))
+    return MetricKey(*(sys.intern(value) if isinstance(value, str) else value
+                       for value in values))
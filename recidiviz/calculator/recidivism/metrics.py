@@ -45,6 +45,9 @@ class RecidivismMetric:
         sex: the sex of the person the metric describes.
         release_facility: the facility the person was released from prior to
             recidivating.
+        characteristics: the bitmask of the optional characteristics this
+            metric is sliced by, as on MetricKey. This tells a metric for
+            people of unknown race apart from a metric across all races.
         total_records: the integer number of records that the characteristics in
             this metric describe.
         total_recidivism: the total number of records that led to recidivism
@@ -61,7 +64,8 @@ class RecidivismMetric:
     def __init__(self, execution_id=None, release_cohort=None,
                  follow_up_period=None, methodology=None, age_bucket=None,
                  stay_length_bucket=None, race=None, sex=None,
-                 release_facility=None, total_records=None,
+                 release_facility=None, characteristics=None,
+                 total_records=None,
                  total_recidivism=None, recidivism_rate=None, created_on=None,
                  updated_on=None):
         # Id of the calculation pipeline that created this metric
@@ -78,6 +82,7 @@ class RecidivismMetric:
         self.race = race
         self.sex = sex
         self.release_facility = release_facility
+        self.characteristics = characteristics
 
         # Metric values
         self.total_records = total_records
@@ -19,28 +19,33 @@
 
 This includes functions for the `map` and `reduce` phases of the pipeline,
 a pipeline class that composes all MapReduce components, and a request handler
-class that initiates pipelines on web requests.
+class that initiates pipelines on web requests. See runner.py for a local
+engine that executes these phases across a pool of processes.
 """
 
+from collections import Counter
 
-from .calculator import map_recidivism_combinations
+from .calculator import map_recidivism_cells, map_recidivism_combinations
 from .identifier import find_recidivism
+from .metric_key import CHARACTERISTIC_SUBSETS, MetricKey, deserialize
 from .metrics import RecidivismMetric
 
-# placeholder - these should be distributed counters
-COUNTERS = {
+# Default counters, used when a caller does not provide its own. The local
+# runner gives each worker task its own Counter and sums them afterwards.
+COUNTERS = Counter({
     'total_people_mapped': 0,
     'total_metric_combinations_mapped': 0,
+    'total_metric_cells_mapped': 0,
     'unique_metric_keys_reduced': 0,
     'total_records_reduced': 0,
     'total_recidivisms_reduced': 0,
-}
+})
 
 
 # placeholder - should be mapreduce execution id
 EXECUTION_ID = 1234
 
-def map_person(person, records, snapshots):
+def map_person(person, records, snapshots, counters=None, as_of=None):
     """Performs the `map` phase of the pipeline.
 
     Maps the Person read from the database into a set of metric combinations for
@@ -54,28 +59,78 @@ def map_person(person, records, snapshots):
         records: placeholder - records for person ordered by custody date
         snapshots: placeholder - snapshots for person ordered descending by
             creation date
+        counters: the Counter to increment. Defaults to the module COUNTERS.
+        as_of: the Date through which follow-up periods are measured. A run
+            should capture this once and pass it for every person, so that
+            people mapped on either side of midnight agree. Defaults to
+            today.
 
     Yields:
         Metrics for each unique recidivism metric derived from the person. Also
         MapReduce Increment counters for a variety of metrics related to the
         `map` phase.
     """
-    params = {}
-    include_conditional_violations = \
-        params.get('include_conditional_violations')
+    recidivism_events = find_recidivism_events(records, snapshots)
+    metric_combinations = map_recidivism_combinations(person, recidivism_events,
+                                                      as_of)
 
-    recidivism_events = find_recidivism(records, snapshots,
-                                        include_conditional_violations)
-    metric_combinations = map_recidivism_combinations(person, recidivism_events)
-
-    COUNTERS['total_people_mapped'] += 1
+    if counters is None:
+        counters = COUNTERS
+    counters['total_people_mapped'] += 1
 
     for combination in metric_combinations:
-        COUNTERS['total_metric_combinations_mapped'] += 1
+        counters['total_metric_combinations_mapped'] += 1
         yield combination
 
 
-def reduce_recidivism_events(metric_key, values):
+def map_person_cells(person, records, snapshots, counters=None,
+                     as_of=None):
+    """Performs the `map` phase of the pipeline, emitting only finest-grain
+    cells.
+
+    Like map_person, but yields only the metric combinations sliced by every
+    characteristic. The remaining combinations are derived from the combined
+    cells with cube.rollup before reduction, so this yields a small fraction
+    of what map_person does. total_metric_combinations_mapped is still
+    incremented by the number of combinations each cell stands for.
+
+    Args:
+        person: a Person to be mapped into recidivism metrics.
+        records: placeholder - records for person ordered by custody date
+        snapshots: placeholder - snapshots for person ordered descending by
+            creation date
+        counters: the Counter to increment. Defaults to the module COUNTERS.
+        as_of: the Date through which follow-up periods are measured, as for
+            map_person.
+
+    Yields:
+        Finest-grain (MetricKey, value) cells derived from the person.
+    """
+    recidivism_events = find_recidivism_events(records, snapshots)
+    cells = map_recidivism_cells(person, recidivism_events, as_of)
+
+    if counters is None:
+        counters = COUNTERS
+    counters['total_people_mapped'] += 1
+
+    for cell in cells:
+        counters['total_metric_cells_mapped'] += 1
+        counters['total_metric_combinations_mapped'] += \
+            len(CHARACTERISTIC_SUBSETS)
+        yield cell
+
+
+def find_recidivism_events(records, snapshots):
+    """Identifies the recidivism events in a person's records, as mapped by
+    map_person and map_person_cells."""
+    params = {}
+    include_conditional_violations = \
+        params.get('include_conditional_violations')
+
+    return find_recidivism(records, snapshots, include_conditional_violations)
+
+
+def reduce_recidivism_events(metric_key, values, counters=None):
     """Performs the `reduce` phase of the pipeline.
 
     Takes in a unique key, i.e. a mapping of characteristics to identify a
@@ -84,13 +139,13 @@ def reduce_recidivism_events(metric_key, values):
     recidivism rate for that combination.
 
     Args:
-        metric_key: the mapping of characteristics for a particular recidivism
-            metric. This is a json-serialized string representation of a
-            dictionary because all keys in the GAE MapReduce framework must be
-            strings.
+        metric_key: the MetricKey identifying a particular recidivism metric,
+            or its serialized string form where the framework requires
+            string keys.
         values: a list containing recidivism values, i.e. 0s, for instances when
             recidivism did not occur, 1s when it did occur, or maybe floating
             point values between (0,1] where the methodology is 'OFFENDER'.
+        counters: the Counter to increment. Defaults to the module COUNTERS.
 
     Yields:
         A RecidivismMetric instance to be persisted by the framework. Also
@@ -102,17 +157,54 @@ def reduce_recidivism_events(metric_key, values):
         # empty values parameter, but we'll be defensive.
         return
 
-    total_records = len(values)
-    value_numerals = map(float, values)
-    total_recidivism = sum(event for event in value_numerals if event > 0)
+    yield reduce_combined_values(metric_key, combine_values(values), counters)
+
 
+def combine_values(values):
+    """Combines recidivism values into a (total_records, total_recidivism)
+    pair.
+
+    This is the map-side combiner: partial pairs for the same metric key can be
+    summed element-wise before the shuffle without changing the final metric.
+
+    Args:
+        values: an iterable of recidivism values for a single metric key.
+
+    Returns:
+        A tuple of the number of values and the sum of the positive values.
+    """
+    total_records = 0
+    total_recidivism = 0
+    for value in map(float, values):
+        total_records += 1
+        if value > 0:
+            total_recidivism += value
+    return total_records, total_recidivism
+
+
+def reduce_combined_values(metric_key, combined, counters=None):
+    """Performs the `reduce` phase for values already combined on the map side.
+
+    Args:
+        metric_key: the MetricKey identifying a particular recidivism metric,
+            as for reduce_recidivism_events.
+        combined: a (total_records, total_recidivism) pair, as produced by
+            combine_values and summed across map outputs.
+        counters: the Counter to increment. Defaults to the module COUNTERS.
+
+    Returns:
+        A RecidivismMetric instance.
+    """
+    total_records, total_recidivism = combined
     metric = to_metric(metric_key, total_records, total_recidivism)
 
-    COUNTERS['unique_metric_keys_reduced'] += 1
-    COUNTERS['total_records_reduced'] += total_records
-    COUNTERS['total_recidivisms_reduced'] += total_recidivism
+    if counters is None:
+        counters = COUNTERS
+    counters['unique_metric_keys_reduced'] += 1
+    counters['total_records_reduced'] += total_records
+    counters['total_recidivisms_reduced'] += total_recidivism
 
-    yield metric
+    return metric
 
 
 def to_metric(metric_key, total_records, total_recidivism):
@@ -122,10 +214,8 @@ def to_metric(metric_key, total_records, total_recidivism):
     records into a new RecidivismMetric instance for persistence.
 
     Args:
-        metric_key: the mapping of characteristics for a particular recidivism
-            metric. This is a json-serialized string representation of a
-            dictionary because all keys in the GAE MapReduce framework must be
-            strings.
+        metric_key: the MetricKey identifying a particular recidivism metric,
+            or its serialized string form.
         total_records: the integer number of records to whom this metric key
             applies.
         total_recidivism: the total number of records that led to recidivism
@@ -144,23 +234,18 @@ def to_metric(metric_key, total_records, total_recidivism):
     metric.total_recidivism = total_recidivism
     metric.recidivism_rate = recidivism_rate
 
-    # TODO: eval is evil. Find a better way to pass the key through
-    # map and shuffle to reduce as a dictionary.
-    key_mapping = eval(metric_key)  # pylint: disable=eval-used
-
-    metric.release_cohort = key_mapping["release_cohort"]
-    metric.follow_up_period = key_mapping["follow_up_period"]
-    metric.methodology = key_mapping["methodology"]
-
-    if 'age' in key_mapping:
-        metric.age_bucket = key_mapping["age"]
-    if 'race' in key_mapping:
-        metric.race = key_mapping["race"]
-    if 'sex' in key_mapping:
-        metric.sex = key_mapping["sex"]
-    if 'release_facility' in key_mapping:
-        metric.release_facility = key_mapping["release_facility"]
-    if 'stay_length' in key_mapping:
-        metric.stay_length_bucket = key_mapping["stay_length"]
+    if not isinstance(metric_key, MetricKey):
+        metric_key = deserialize(metric_key)
+
+    # Characteristics a metric is not sliced by are None on the key.
+    metric.release_cohort = metric_key.release_cohort
+    metric.follow_up_period = metric_key.follow_up_period
+    metric.methodology = metric_key.methodology
+    metric.characteristics = metric_key.characteristics
+    metric.age_bucket = metric_key.age
+    metric.race = metric_key.race
+    metric.sex = metric_key.sex
+    metric.release_facility = metric_key.release_facility
+    metric.stay_length_bucket = metric_key.stay_length
 
     return metric
@@ -0,0 +1,164 @@
+# Recidiviz - a platform for tracking granular recidivism metrics in real time
+# Copyright (C) 2019 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+
+"""Streams people and their bookings out of the database for calculation.
+
+People are read in chunks of person ids using keyset pagination, i.e. each
+chunk is the next `chunk_size` people ordered by id after the last id of the
+previous chunk, so every query is an index range scan no matter how far into
+the table it is, and at most one chunk of rows is held in memory at a time.
+Bookings and booking history are then read for the whole chunk with one query
+each, rather than once per person.
+
+Only the columns the identifier and calculator read are selected, and rows
+are converted into small immutable values rather than ORM entities, so the
+session's identity map does not grow as the table is read, and the values
+can be pickled and sent to runner.py's worker processes.
+
+Example:
+    session = Session()
+    result = runner.run(reader.read_people(session, region='us_ny'))
+"""
+
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Optional
+
+import attr
+
+from recidiviz.common.constants.booking import CustodyStatus
+from recidiviz.persistence.database.schema import (
+    Booking, BookingHistory, Person)
+
+DEFAULT_CHUNK_SIZE = 1000
+
+_RELEASED_STATUSES = (CustodyStatus.RELEASED.value,
+                      CustodyStatus.INFERRED_RELEASE.value)
+
+
+@attr.s(frozen=True)
+class CalculationPerson:
+    """The characteristics of a person that metrics are sliced by."""
+
+    key: int = attr.ib()
+    birthdate: Optional[date] = attr.ib()
+    race: Optional[str] = attr.ib()
+    sex: Optional[str] = attr.ib()
+
+
+@attr.s(frozen=True)
+class CalculationRecord:
+    """A single booking, i.e. one instance of incarceration."""
+
+    key: int = attr.ib()
+    custody_date: Optional[date] = attr.ib()
+    is_released: bool = attr.ib()
+    latest_release_date: Optional[date] = attr.ib()
+
+    # Bookings are not re-opened on re-entry, so this is always None.
+    last_custody_date: Optional[date] = attr.ib(default=None)
+
+
+@attr.s(frozen=True)
+class CalculationSnapshot:
+    """The state of a booking's facility at some point in time."""
+
+    parent: int = attr.ib()
+    created_on: datetime = attr.ib()
+    latest_facility: Optional[str] = attr.ib()
+
+
+def read_people(session, region=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Reads every person, along with their records and snapshots.
+
+    Args:
+        session: the database session to read with.
+        region: if given, only people in this region are read.
+        chunk_size: the number of people to read per query.
+
+    Yields:
+        (person, records, snapshots) tuples in order of person id, where
+        records are ordered by custody date and snapshots are ordered
+        descending by creation date, as find_recidivism expects.
+    """
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be positive, got '
+                         '{}'.format(chunk_size))
+
+    last_person_id = None
+    while True:
+        query = session.query(Person.person_id, Person.birthdate,
+                              Person.race, Person.gender)
+        if region is not None:
+            query = query.filter(Person.region == region)
+        if last_person_id is not None:
+            query = query.filter(Person.person_id > last_person_id)
+        rows = query.order_by(Person.person_id).limit(chunk_size).all()
+        if not rows:
+            return
+
+        person_ids = [row.person_id for row in rows]
+        records = _read_records(session, person_ids)
+        snapshots = _read_snapshots(session, person_ids)
+
+        for person_id, birthdate, race, gender in rows:
+            person = CalculationPerson(key=person_id, birthdate=birthdate,
+                                       race=race, sex=gender)
+            yield (person, records.get(person_id, []),
+                   snapshots.get(person_id, []))
+
+        last_person_id = person_ids[-1]
+
+
+def _read_records(session, person_ids):
+    """Person ids to their records, ordered by custody date."""
+    # Bookings without an admission date cannot be processed (see Issue #49),
+    # and leaving them out keeps them from being mistaken for the next record
+    # of the booking before them.
+    query = session.query(Booking.person_id, Booking.booking_id,
+                          Booking.admission_date, Booking.release_date,
+                          Booking.custody_status) \
+        .filter(Booking.person_id.in_(person_ids)) \
+        .filter(Booking.admission_date.isnot(None)) \
+        .order_by(Booking.person_id, Booking.admission_date,
+                  Booking.booking_id)
+
+    records = defaultdict(list)
+    for person_id, booking_id, admission_date, release_date, custody_status \
+            in query:
+        is_released = release_date is not None \
+            or custody_status in _RELEASED_STATUSES
+        records[person_id].append(CalculationRecord(
+            key=booking_id, custody_date=admission_date,
+            is_released=is_released, latest_release_date=release_date))
+    return records
+
+
+def _read_snapshots(session, person_ids):
+    """Person ids to their snapshots, ordered descending by creation date."""
+    query = session.query(BookingHistory.person_id, BookingHistory.booking_id,
+                          BookingHistory.valid_from, BookingHistory.facility) \
+        .filter(BookingHistory.person_id.in_(person_ids)) \
+        .order_by(BookingHistory.person_id, BookingHistory.valid_from.desc(),
+                  BookingHistory.booking_history_id.desc())
+
+    snapshots = defaultdict(list)
+    for person_id, booking_id, valid_from, facility in query:
+        snapshots[person_id].append(CalculationSnapshot(
+            parent=booking_id, created_on=valid_from,
+            latest_facility=facility))
+    return snapshots
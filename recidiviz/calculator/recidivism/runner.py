@@ -0,0 +1,190 @@
+# Recidiviz - a platform for tracking granular recidivism metrics in real time
+# Copyright (C) 2019 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+
+"""Local multi-process runner for the recidivism MapReduce pipeline.
+
+Runs the `map` and `reduce` phases from pipeline.py on a single machine:
+
+1. People are split into chunks and each chunk is mapped in a worker process.
+   Only finest-grain cells are mapped (see cube.py), and they are combined
+   per metric key inside the worker (a map-side combiner), so only one
+   (total_records, total_recidivism) pair per cell per chunk leaves the
+   worker.
+2. Combined pairs are hash-partitioned by release cohort, follow-up period
+   and methodology, and merged per partition.
+3. Each partition is rolled up into every characteristic combination and
+   reduced in a worker process into RecidivismMetrics.
+
+Every worker task counts into its own Counter, and the runner sums them into
+the returned PipelineResult instead of relying on the module-level COUNTERS.
+
+Example:
+    result = runner.run(
+        (person, records, snapshots) for person, records, snapshots in rows)
+    for metric in result.metrics:
+        ...
+"""
+
+import multiprocessing
+import zlib
+from collections import Counter, defaultdict
+from datetime import date
+from itertools import islice
+from typing import Dict, List, Tuple
+
+import attr
+
+from . import pipeline
+from .cube import rollup
+from .metric_key import MetricKey
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+@attr.s(frozen=True)
+class PipelineResult:
+    """The output of a local pipeline run."""
+
+    # All RecidivismMetrics produced by the reduce phase.
+    metrics: List = attr.ib()
+
+    # Counters summed across every map and reduce task.
+    counters: Counter = attr.ib()
+
+
+def partition_for(key, num_partitions):
+    """The partition a MetricKey is shuffled to.
+
+    Only the release cohort, follow-up period and methodology are hashed, so
+    every cell that rolls up into a given metric lands in the same partition.
+
+    Uses crc32 rather than hash() because string hashes are salted per
+    process, and every map worker must agree on the partition of a key.
+    """
+    shard = '{}|{}|{}'.format(key.release_cohort, key.follow_up_period,
+                              key.methodology)
+    return zlib.crc32(shard.encode('utf-8')) % num_partitions
+
+
+def run(people, num_workers=None, num_partitions=None,
+        chunk_size=DEFAULT_CHUNK_SIZE, as_of=None):
+    """Runs the recidivism pipeline over the given people.
+
+    Args:
+        people: an iterable of (person, records, snapshots) tuples, as taken by
+            pipeline.map_person. It is consumed lazily, one chunk at a time.
+        num_workers: the number of worker processes. Defaults to the CPU
+            count. With a single worker everything runs in this process.
+        num_partitions: the number of shuffle partitions, i.e. reduce tasks.
+            Defaults to the number of workers.
+        chunk_size: the number of people mapped per map task.
+        as_of: the Date through which follow-up periods are measured.
+            Defaults to today, captured once when the run starts so that
+            every map task measures through the same date.
+
+    Returns:
+        A PipelineResult with every metric and the summed counters.
+    """
+    num_workers = num_workers or multiprocessing.cpu_count()
+    num_partitions = num_partitions or num_workers
+    as_of = as_of or date.today()
+    chunks = _chunks(people, chunk_size)
+
+    if num_workers == 1:
+        return _run_serially(chunks, num_partitions, as_of)
+
+    with multiprocessing.Pool(num_workers) as pool:
+        map_outputs = pool.imap_unordered(
+            _map_chunk, ((chunk, num_partitions, as_of) for chunk in chunks))
+        partitions, counters = _shuffle(map_outputs, num_partitions)
+        reduce_outputs = pool.imap_unordered(_reduce_partition, partitions)
+        return _collect(reduce_outputs, counters)
+
+
+def _run_serially(chunks, num_partitions, as_of):
+    map_outputs = (_map_chunk((chunk, num_partitions, as_of))
+                   for chunk in chunks)
+    partitions, counters = _shuffle(map_outputs, num_partitions)
+    return _collect(map(_reduce_partition, partitions), counters)
+
+
+def _chunks(iterable, chunk_size):
+    iterator = iter(iterable)
+    chunk = list(islice(iterator, chunk_size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, chunk_size))
+
+
+CombinedValues = Dict[MetricKey, Tuple[int, float]]
+
+
+def _merge_into(target: CombinedValues, source: CombinedValues):
+    for key, (records, recidivism) in source.items():
+        if key in target:
+            total_records, total_recidivism = target[key]
+            target[key] = (total_records + records,
+                           total_recidivism + recidivism)
+        else:
+            target[key] = (records, recidivism)
+
+
+def _map_chunk(args):
+    """Maps a chunk of people and combines the output per metric key.
+
+    Returns:
+        A tuple of the per-partition combined values and the map counters.
+    """
+    chunk, num_partitions, as_of = args
+    counters: Counter = Counter()
+    values_by_key: Dict[MetricKey, List] = defaultdict(list)
+    for person, records, snapshots in chunk:
+        for key, value in pipeline.map_person_cells(
+                person, records, snapshots, counters, as_of):
+            values_by_key[key].append(value)
+
+    partitions: List[CombinedValues] = [{} for _ in range(num_partitions)]
+    for key, values in values_by_key.items():
+        partitions[partition_for(key, num_partitions)][key] = \
+            pipeline.combine_values(values)
+    return partitions, counters
+
+
+def _shuffle(map_outputs, num_partitions):
+    """Merges map outputs into one combined dict per partition."""
+    partitions: List[CombinedValues] = [{} for _ in range(num_partitions)]
+    counters: Counter = Counter()
+    for map_partitions, map_counters in map_outputs:
+        counters.update(map_counters)
+        for partition, map_partition in zip(partitions, map_partitions):
+            _merge_into(partition, map_partition)
+    return partitions, counters
+
+
+def _reduce_partition(partition: CombinedValues):
+    counters: Counter = Counter()
+    metrics = [pipeline.reduce_combined_values(key, combined, counters)
+               for key, combined in rollup(partition).items()]
+    return metrics, counters
+
+
+def _collect(reduce_outputs, counters):
+    metrics: List = []
+    for partition_metrics, reduce_counters in reduce_outputs:
+        metrics.extend(partition_metrics)
+        counters.update(reduce_counters)
+    return PipelineResult(metrics=metrics, counters=counters)
@@ -0,0 +1,232 @@
+# Recidiviz - a platform for tracking granular recidivism metrics in real time
+# Copyright (C) 2019 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+
+"""Writes RecidivismMetrics out to the database and to files.
+
+Every run of the pipeline writes its metrics under its own execution id:
+
+1. start_execution records the execution.
+2. write_metrics writes metrics in batches, with one multi-row INSERT per
+   batch rather than one statement per metric. Metrics are keyed by execution
+   id and serialized MetricKey, and writing a metric that was already written
+   for the execution replaces it, so a batch can safely be retried.
+3. complete_execution marks the execution as the current one, in place of
+   the previously current execution.
+
+Readers only see the metrics of the current execution (see
+read_current_metrics), so when the session is committed after
+complete_execution they switch from one complete set of metrics to the next
+at once, and never see a partially written execution.
+
+None of these functions commit, so the caller controls the transactions.
+
+Example:
+    sink.start_execution(session, execution_id)
+    sink.write_metrics(session, execution_id, result.metrics)
+    sink.complete_execution(session, execution_id)
+    session.commit()
+"""
+
+import datetime
+from itertools import islice
+
+import pandas as pd
+
+from recidiviz.persistence.database.schema import (
+    RecidivismMetricExecution, RecidivismMetricRow)
+from .metric_key import CHARACTERISTICS, MetricKey, serialize
+from .metrics import RecidivismMetric
+
+DEFAULT_BATCH_SIZE = 5000
+
+# MetricKey fields mapped to the RecidivismMetric attribute each is stored in.
+_CHARACTERISTIC_ATTRIBUTES = (
+    ('age', 'age_bucket'),
+    ('race', 'race'),
+    ('sex', 'sex'),
+    ('stay_length', 'stay_length_bucket'),
+    ('release_facility', 'release_facility'),
+)
+
+_METRIC_COLUMNS = ('release_cohort', 'follow_up_period', 'methodology',
+                   'characteristics', 'age_bucket', 'stay_length_bucket',
+                   'race', 'sex', 'release_facility', 'total_records',
+                   'total_recidivism', 'recidivism_rate', 'created_on')
+
+
+def start_execution(session, execution_id, started_on=None):
+    """Records the start of a new execution.
+
+    Args:
+        session: the database session to write with.
+        execution_id: the id to write the execution's metrics under.
+        started_on: a DateTime for when the execution started. Defaults to
+            now.
+    """
+    session.add(RecidivismMetricExecution(
+        execution_id=str(execution_id),
+        started_on=started_on or datetime.datetime.now(),
+        is_current=False))
+    session.flush()
+
+
+def write_metrics(session, execution_id, metrics,
+                  batch_size=DEFAULT_BATCH_SIZE, created_on=None):
+    """Writes metrics for an execution in batches.
+
+    Args:
+        session: the database session to write with.
+        execution_id: the id of an execution begun with start_execution.
+        metrics: an iterable of RecidivismMetrics. It is consumed one batch
+            at a time, so it can be a generator.
+        batch_size: the number of metrics to write per statement.
+        created_on: a DateTime to store as the creation time of every metric.
+            Defaults to now.
+
+    Returns:
+        The number of metrics written.
+    """
+    if batch_size < 1:
+        raise ValueError('batch_size must be positive, got '
+                         '{}'.format(batch_size))
+
+    execution_id = str(execution_id)
+    created_on = created_on or datetime.datetime.now()
+    rows = (_to_row(execution_id, metric, created_on) for metric in metrics)
+
+    total = 0
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return total
+        _write_batch(session, execution_id, batch)
+        total += len(batch)
+
+
+def complete_execution(session, execution_id, completed_on=None,
+                       delete_previous=False):
+    """Makes an execution the current one.
+
+    Args:
+        session: the database session to write with.
+        execution_id: the id of an execution whose metrics have been written.
+        completed_on: a DateTime for when the execution completed. Defaults
+            to now.
+        delete_previous: whether to delete the metrics of every other
+            execution, e.g. to keep the table from growing without bound.
+
+    Raises:
+        ValueError: if no execution with the given id was started.
+    """
+    execution_id = str(execution_id)
+    execution = session.query(RecidivismMetricExecution).get(execution_id)
+    if execution is None:
+        raise ValueError('No execution with id {}'.format(execution_id))
+
+    session.query(RecidivismMetricExecution) \
+        .filter(RecidivismMetricExecution.is_current.is_(True)) \
+        .update({RecidivismMetricExecution.is_current: False},
+                synchronize_session='fetch')
+    execution.completed_on = completed_on or datetime.datetime.now()
+    execution.is_current = True
+
+    if delete_previous:
+        session.query(RecidivismMetricRow) \
+            .filter(RecidivismMetricRow.execution_id != execution_id) \
+            .delete(synchronize_session=False)
+    session.flush()
+
+
+def read_current_metrics(session):
+    """Reads every metric of the current execution.
+
+    Returns:
+        A list of RecidivismMetrics, empty if no execution has completed.
+    """
+    query = session.query(RecidivismMetricRow) \
+        .join(RecidivismMetricExecution) \
+        .filter(RecidivismMetricExecution.is_current.is_(True))
+    return [_to_metric(row) for row in query]
+
+
+def export_metrics(metrics, path):
+    """Writes metrics to a CSV or Parquet file, chosen by the path's extension.
+
+    Writing Parquet requires pyarrow or fastparquet to be installed.
+
+    Args:
+        metrics: an iterable of RecidivismMetrics.
+        path: the path of the file to write, ending in '.csv' or '.parquet'.
+
+    Raises:
+        ValueError: if the path has neither extension.
+    """
+    rows = [_to_row(metric.execution_id, metric, metric.created_on)
+            for metric in metrics]
+    columns = ['execution_id', 'metric_key'] + list(_METRIC_COLUMNS)
+    df = pd.DataFrame(rows, columns=columns)
+
+    if path.endswith('.csv'):
+        df.to_csv(path, index=False)
+    elif path.endswith('.parquet'):
+        df.to_parquet(path, index=False)
+    else:
+        raise ValueError('Cannot export metrics to {}, expected a .csv or '
+                         '.parquet path'.format(path))
+
+
+def _write_batch(session, execution_id, rows):
+    """Replaces any metrics already written for the batch's keys, then
+    inserts the batch."""
+    session.query(RecidivismMetricRow) \
+        .filter(RecidivismMetricRow.execution_id == execution_id) \
+        .filter(RecidivismMetricRow.metric_key.in_(
+            [row['metric_key'] for row in rows])) \
+        .delete(synchronize_session=False)
+    session.execute(RecidivismMetricRow.__table__.insert(), rows)
+
+
+def _to_row(execution_id, metric, created_on):
+    """The recidivism_metric row for a metric, as a dictionary."""
+    row = {column: getattr(metric, column) for column in _METRIC_COLUMNS}
+    row['execution_id'] = execution_id
+    row['created_on'] = created_on
+    if row['characteristics'] is None:
+        row['characteristics'] = _characteristics_of(metric)
+    row['metric_key'] = serialize(MetricKey(
+        metric.release_cohort, metric.follow_up_period, metric.methodology,
+        row['characteristics'],
+        *(getattr(metric, attribute)
+          for _, attribute in _CHARACTERISTIC_ATTRIBUTES)))
+    return row
+
+
+def _to_metric(row):
+    """The RecidivismMetric stored in a recidivism_metric row."""
+    return RecidivismMetric(
+        execution_id=row.execution_id,
+        **{column: getattr(row, column) for column in _METRIC_COLUMNS})
+
+
+def _characteristics_of(metric):
+    """The characteristics bitmask of a metric that does not record one,
+    assuming it is sliced by exactly its characteristics that are not None."""
+    mask = 0
+    for name, attribute in _CHARACTERISTIC_ATTRIBUTES:
+        if getattr(metric, attribute) is not None:
+            mask |= 1 << CHARACTERISTICS.index(name)
+    return mask
@@ -0,0 +1,321 @@
+# Recidiviz - a platform for tracking granular recidivism metrics in real time
+# Copyright (C) 2019 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+
+"""Columnar recidivism metric calculation with NumPy and pandas.
+
+This computes the same metrics as mapping every person through
+calculator.map_recidivism_combinations and reducing the output, but operates
+on arrays of recidivism events rather than on one person at a time.
+
+Rather than emitting one (combination, value) pair per characteristic combo,
+follow-up period and methodology, it builds a single row per event and
+follow-up period, with every characteristic encoded as an integer. These rows
+are summed into cells keyed by every characteristic, and each subset of
+characteristics is then rolled up from those cells with a group-by.
+
+Example:
+    events = vectorized.events_frame(
+        (person, identifier.find_recidivism(records, snapshots))
+        for person, records, snapshots in rows)
+    metrics = vectorized.to_recidivism_metrics(
+        vectorized.calculate_metrics(events))
+"""
+
+from datetime import date
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from . import metric_key
+from .calculator import FOLLOW_UP_PERIODS
+from .metrics import RecidivismMetric
+from .pipeline import EXECUTION_ID
+
+# Characteristic names, as used in metric combination keys, mapped to the
+# RecidivismMetric attribute each one is stored in.
+CHARACTERISTICS = {
+    'age': 'age_bucket',
+    'race': 'race',
+    'sex': 'sex',
+    'stay_length': 'stay_length_bucket',
+    'release_facility': 'release_facility',
+}
+
+METHODOLOGIES = ('OFFENDER', 'EVENT')
+
+_AGE_BUCKET_EDGES = [25, 30, 35, 40]
+_AGE_BUCKETS = ['<25', '25-29', '30-34', '35-39', '40<']
+_STAY_LENGTH_BUCKET_EDGES = list(range(12, 121, 12))
+_STAY_LENGTH_BUCKETS = ['<12', '12-24', '24-36', '36-48', '48-60', '60-72',
+                        '72-84', '84-96', '96-108', '108-120', '120<']
+
+_EVENT_COLUMNS = ['person', 'release_cohort', 'recidivated',
+                  'original_entry_date', 'release_date',
+                  'reincarceration_date', 'release_facility', 'birthdate',
+                  'race', 'sex']
+
+
+def events_frame(people_events):
+    """Builds a DataFrame with one row per recidivism event.
+
+    Args:
+        people_events: an iterable of (person, recidivism_events) tuples, where
+            recidivism_events is the dict returned by
+            identifier.find_recidivism for that person.
+
+    Returns:
+        A DataFrame with the columns needed by calculate_metrics.
+    """
+    rows = []
+    for person_index, (person, recidivism_events) in enumerate(people_events):
+        for release_cohort, event in recidivism_events.items():
+            rows.append((person_index, release_cohort, event.recidivated,
+                         event.original_entry_date, event.release_date,
+                         event.reincarceration_date, event.release_facility,
+                         person.birthdate, person.race, person.sex))
+
+    frame = pd.DataFrame.from_records(rows, columns=_EVENT_COLUMNS)
+    for column in ('original_entry_date', 'release_date',
+                   'reincarceration_date', 'birthdate'):
+        frame[column] = _to_days(frame[column])
+    return frame
+
+
+def calculate_metrics(events, current_date=None):
+    """Calculates every recidivism metric for the given events.
+
+    Args:
+        events: a DataFrame of recidivism events, as built by events_frame.
+        current_date: the Date up to which follow-up periods are measured.
+            Defaults to today.
+
+    Returns:
+        A DataFrame with one row per metric. Each row has a column per
+        characteristic (None where not part of the metric or not known), a
+        'characteristics' column holding the tuple of characteristic names the
+        metric is sliced by, and the release_cohort, follow_up_period,
+        methodology, total_records, total_recidivism and recidivism_rate
+        columns.
+    """
+    current_date = np.datetime64(current_date or date.today(), 'D')
+    periods = np.asarray(FOLLOW_UP_PERIODS)
+
+    release_dates = _to_days(events['release_date'])
+    entry_dates = _to_days(events['original_entry_date'])
+    reincarceration_dates = _to_days(events['reincarceration_date'])
+
+    # Per-event, per-period values, shaped (events, periods).
+    relevant = _add_months(release_dates[:, None],
+                           12 * (periods - 1)) <= current_date
+    earliest = _earliest_recidivated_periods(release_dates,
+                                             reincarceration_dates)
+    recidivated = (events['recidivated'].values.astype(bool)[:, None]
+                   & (earliest[:, None] != 0)
+                   & (periods >= earliest[:, None]))
+    window_counts = _count_reincarcerations_in_windows(
+        events['person'].values, release_dates, reincarceration_dates,
+        periods)
+
+    codes = {
+        'age': _bucket_codes(_age_at_dates(_to_days(events['birthdate']),
+                                           entry_dates),
+                             _AGE_BUCKET_EDGES),
+        'stay_length': _bucket_codes(_months_between(entry_dates,
+                                                     release_dates),
+                                     _STAY_LENGTH_BUCKET_EDGES),
+    }
+    vocabularies = {
+        'age': _AGE_BUCKETS,
+        'stay_length': _STAY_LENGTH_BUCKETS,
+    }
+    for name in ('race', 'sex', 'release_facility'):
+        codes[name], vocabularies[name] = pd.factorize(events[name])
+
+    event_index, period_index = np.nonzero(relevant)
+    is_recidivism = recidivated[event_index, period_index]
+    counts = window_counts[event_index, period_index]
+
+    # Offender-based: one record per event, 1 if recidivated in the period.
+    # Event-based: one record per reincarceration in the window if
+    # recidivated, otherwise a single record with no recidivism.
+    offender_records = np.ones(len(event_index), dtype=np.int64)
+    offender_recidivism = is_recidivism.astype(np.float64)
+    event_records = np.where(is_recidivism, counts, 1)
+    event_recidivism = np.where(is_recidivism, counts, 0).astype(np.float64)
+
+    names = list(CHARACTERISTICS)
+    base = pd.DataFrame({name: np.tile(codes[name][event_index], 2)
+                         for name in names})
+    base['release_cohort'] = np.tile(
+        events['release_cohort'].values[event_index], 2)
+    base['follow_up_period'] = np.tile(periods[period_index], 2)
+    base['methodology'] = np.repeat(np.arange(len(METHODOLOGIES)),
+                                    len(event_index))
+    base['total_records'] = np.concatenate([offender_records, event_records])
+    base['total_recidivism'] = np.concatenate([offender_recidivism,
+                                               event_recidivism])
+    base = base[base['total_records'] > 0]
+
+    required = ['release_cohort', 'follow_up_period', 'methodology']
+    cells = base.groupby(required + names, sort=False,
+                         as_index=False)[['total_records',
+                                          'total_recidivism']].sum()
+
+    rollups = []
+    for size in range(len(names) + 1):
+        for subset in combinations(names, size):
+            rollup = cells.groupby(required + list(subset), sort=False,
+                                   as_index=False)[['total_records',
+                                                    'total_recidivism']].sum()
+            rollup['characteristics'] = [subset] * len(rollup)
+            rollups.append(rollup)
+
+    metrics = pd.concat(rollups, ignore_index=True, sort=False)
+    for name in names:
+        metrics[name] = _decode(metrics[name], vocabularies[name])
+    metrics['methodology'] = np.asarray(METHODOLOGIES, dtype=object)[
+        metrics['methodology'].values]
+    metrics['recidivism_rate'] = \
+        metrics['total_recidivism'] / metrics['total_records']
+    return metrics
+
+
+def to_recidivism_metrics(metrics):
+    """Converts the output of calculate_metrics into RecidivismMetrics."""
+    result = []
+    for row in metrics.itertuples(index=False):
+        metric = RecidivismMetric(
+            execution_id=EXECUTION_ID,
+            release_cohort=int(row.release_cohort),
+            follow_up_period=int(row.follow_up_period),
+            methodology=row.methodology,
+            characteristics=sum(
+                1 << metric_key.CHARACTERISTICS.index(name)
+                for name in row.characteristics),
+            total_records=int(row.total_records),
+            total_recidivism=float(row.total_recidivism),
+            recidivism_rate=float(row.recidivism_rate))
+        for name, attribute in CHARACTERISTICS.items():
+            setattr(metric, attribute, getattr(row, name))
+        result.append(metric)
+    return result
+
+
+def _to_days(values):
+    return pd.to_datetime(pd.Series(values)).values.astype('datetime64[D]')
+
+
+def _year_month_day(dates):
+    months = dates.astype('datetime64[M]')
+    years = dates.astype('datetime64[Y]').astype(np.int64) + 1970
+    month = months.astype(np.int64) % 12 + 1
+    day = (dates - months.astype('datetime64[D]')).astype(np.int64) + 1
+    return years, month, day
+
+
+def _add_months(dates, months):
+    """Adds months to dates, clamping to the end of the month like
+    relativedelta does, e.g. 2016-02-29 plus 12 months is 2017-02-28."""
+    start_of_month = dates.astype('datetime64[M]')
+    day_offset = dates - start_of_month.astype('datetime64[D]')
+    target = start_of_month + months
+    month_length = ((target + 1).astype('datetime64[D]')
+                    - target.astype('datetime64[D]'))
+    return target.astype('datetime64[D]') + np.minimum(
+        day_offset, month_length - np.timedelta64(1, 'D'))
+
+
+def _months_between(start_dates, end_dates):
+    """Whole months from start to end, as relativedelta counts them.
+
+    Returns a float array with NaN where either date is unknown.
+    """
+    start_years, start_months, _ = _year_month_day(start_dates)
+    end_years, end_months, _ = _year_month_day(end_dates)
+    months = (end_years - start_years) * 12 + (end_months - start_months)
+    months = months - (_add_months(start_dates, months) > end_dates)
+    known = ~(np.isnat(start_dates) | np.isnat(end_dates))
+    return np.where(known, months, np.nan)
+
+
+def _age_at_dates(birthdates, check_dates):
+    birth_years, birth_months, birth_days = _year_month_day(birthdates)
+    years, months, days = _year_month_day(check_dates)
+    before_birthday = (months * 100 + days) < (birth_months * 100 + birth_days)
+    ages = years - birth_years - before_birthday
+    known = ~(np.isnat(birthdates) | np.isnat(check_dates))
+    return np.where(known, ages, np.nan)
+
+
+def _bucket_codes(values, edges):
+    """Index of the bucket each value falls in, upper bound exclusive, or -1
+    where the value is unknown."""
+    codes = np.digitize(np.nan_to_num(values), edges)
+    return np.where(np.isnan(values), -1, codes)
+
+
+def _earliest_recidivated_periods(release_dates, reincarceration_dates):
+    """Vectorized calculator.earliest_recidivated_follow_up_period.
+
+    Returns 0 where there is no reincarceration date.
+    """
+    release_years, release_months, release_days = \
+        _year_month_day(release_dates)
+    years, months, days = _year_month_day(reincarceration_dates)
+    years_apart = years - release_years
+    after_anniversary = ((months * 100 + days)
+                         > (release_months * 100 + release_days))
+    earliest = np.where(years_apart == 0, 1,
+                        years_apart + after_anniversary)
+    return np.where(np.isnat(reincarceration_dates), 0, earliest)
+
+
+def _count_reincarcerations_in_windows(people, release_dates,
+                                       reincarceration_dates, periods):
+    """Vectorized calculator.count_reincarcerations_in_window.
+
+    Returns:
+        An array shaped (events, periods) with the number of the person's
+        reincarceration dates from each event's release date until the end
+        of each follow-up period.
+    """
+    known = ~np.isnat(reincarceration_dates)
+    pairs = pd.merge(
+        pd.DataFrame({'person': people, 'event': np.arange(len(people))}),
+        pd.DataFrame({'person': people[known],
+                      'date': reincarceration_dates[known]}),
+        on='person')
+    event = pairs['event'].values
+    dates = pairs['date'].values.astype('datetime64[D]')
+    starts = release_dates[event]
+
+    counts = np.zeros((len(people), len(periods)), dtype=np.int64)
+    for period_index, period in enumerate(periods):
+        ends = _add_months(starts, 12 * period)
+        in_window = (dates >= starts) & (dates < ends)
+        counts[:, period_index] = np.bincount(event[in_window],
+                                              minlength=len(people))
+    return counts
+
+
+def _decode(codes, vocabulary):
+    """Maps integer codes back to their values, with None for -1 and for
+    characteristics that were rolled up (NaN)."""
+    values = np.asarray(list(vocabulary) + [None], dtype=object)
+    codes = codes.fillna(-1).astype(np.int64).values
+    return values[np.where(codes < 0, len(vocabulary), codes)]
@@ -25,13 +25,7 @@ from flask import Blueprint, request
 import gcsfs
 from recidiviz.utils import metadata
 
-from recidiviz.ingest.aggregate.regions.ca import ca_aggregate_ingest
-from recidiviz.ingest.aggregate.regions.fl import fl_aggregate_ingest
-from recidiviz.ingest.aggregate.regions.ga import ga_aggregate_ingest
-from recidiviz.ingest.aggregate.regions.hi import hi_aggregate_ingest
-from recidiviz.ingest.aggregate.regions.ky import ky_aggregate_ingest
-from recidiviz.ingest.aggregate.regions.ny import ny_aggregate_ingest
-from recidiviz.ingest.aggregate.regions.tx import tx_aggregate_ingest
+from recidiviz.ingest.aggregate import batch_ingest
 from recidiviz.persistence.database import database
 from recidiviz.utils.auth import authenticate_request
 from recidiviz.utils.params import get_value
@@ -51,17 +45,6 @@ HISTORICAL_BUCKET = '{}-processed-state-aggregates'
 def state_aggregate():
     """Calls state aggregates"""
 
-    # Please add new states in alphabetical order
-    state_to_parser = {
-        'california': ca_aggregate_ingest.parse,
-        'florida': fl_aggregate_ingest.parse,
-        'georgia': ga_aggregate_ingest.parse,
-        'hawaii': hi_aggregate_ingest.parse,
-        'kentucky': ky_aggregate_ingest.parse,
-        'new_york': ny_aggregate_ingest.parse,
-        'texas': tx_aggregate_ingest.parse,
-    }
-
     bucket = get_value('bucket', request.args)
     state = get_value('state', request.args)
     filename = get_value('filename', request.args)
@@ -71,23 +54,25 @@ def state_aggregate():
         raise StateAggregateError(
             'All of state, bucket, and filename must be provided')
     path = os.path.join(bucket, state, filename)
-    parser = state_to_parser[state]
+    parser = batch_ingest.STATE_TO_PARSER[state]
     # Don't use the gcsfs cache
     fs = gcsfs.GCSFileSystem(project=project_id, cache_timeout=-1)
     logging.info('The path to download from is %s', path)
-    bucket_path = os.path.join(bucket, state)
-    logging.info('The files in the directory are:')
-    logging.info(fs.ls(bucket_path))
 
     # Providing a stream buffer to tabula reader does not work because it
     # tries to load the file into the local filesystem, since appengine is a
     # read only filesystem (except for the tmpdir) we download the file into
-    # the local tmpdir and pass that in.
-    tmpdir_path = os.path.join(tempfile.gettempdir(), filename)
-    fs.get(path, tmpdir_path)
-    logging.info('Successfully downloaded file from gcs: %s', path)
+    # the local tmpdir and pass that in. Each request downloads into its own
+    # directory so that concurrent requests for the same filename don't
+    # overwrite each other, and the filename is kept since some parsers read
+    # the report date from it.
+    with tempfile.TemporaryDirectory() as tmpdir_path:
+        local_path = os.path.join(tmpdir_path, filename)
+        fs.get(path, local_path)
+        logging.info('Successfully downloaded file from gcs: %s', path)
+
+        result = parser(local_path)
 
-    result = parser(tmpdir_path)
     for table, df in result.items():
         database.write_df(table, df)
 
@@ -19,7 +19,8 @@ import calendar
 import datetime
 import itertools
 import re
-from typing import Dict, Iterable, Any, Optional, Set, Pattern
+from functools import lru_cache
+from typing import Dict, Iterable, Any, Optional, Set, Pattern, Tuple
 
 import pandas as pd
 from more_itertools import one
@@ -62,12 +63,18 @@ def _create_rename_dict_from_regex(
         df: pd.DataFrame, regex_rename_dict: Dict[str, str]) -> Dict[str, str]:
     """Converts a Dict[regex, new_column_name] to a Dict[existing_column_name,
     new_column_name]."""
-    rename_dict = {}
-    for regex in regex_rename_dict:
-        actual_column_name = _get_match(df.columns, re.compile(regex))
-        rename_dict[actual_column_name] = regex_rename_dict[regex]
+    return dict(_match_regex_renames(tuple(df.columns),
+                                     tuple(regex_rename_dict.items())))
 
-    return rename_dict
+
+@lru_cache(maxsize=256)
+def _match_regex_renames(
+        columns: Tuple[str, ...], regex_renames: Tuple[Tuple[str, str], ...]) \
+        -> Tuple[Tuple[str, str], ...]:
+    """Matches each regex to its column once per set of columns, since parsers
+    rename tables with the same headers over and over, e.g. once per page."""
+    return tuple((_get_match(columns, re.compile(regex)), new_column_name)
+                 for regex, new_column_name in regex_renames)
 
 
 def _get_match(iterable: Iterable[str], regex: Pattern) -> str:
@@ -105,18 +112,78 @@ def cast_columns_to_int(
 
     _validate_column_names(df, ignore_columns | nullable_int_columns)
 
-    for column_name in df.columns:
-        if column_name in ignore_columns:
-            continue
-        elif column_name in nullable_int_columns:
-            # Since NaN is a float, we must cast the whole column to floats
-            df[column_name] = df[column_name].astype(float)
-        else:
-            df[column_name] = df[column_name].astype(int)
+    int_columns = [column_name for column_name in df.columns
+                   if column_name not in ignore_columns
+                   and column_name not in nullable_int_columns]
+    float_columns = [column_name for column_name in df.columns
+                     if column_name in nullable_int_columns]
+
+    # Cast all columns of each type at once, rather than column by column
+    if int_columns:
+        df[int_columns] = df[int_columns].astype(int)
+    if float_columns:
+        # Since NaN is a float, we must cast the whole column to floats
+        df[float_columns] = df[float_columns].astype(float)
+
+    return df
+
+
+def cast_columns_to_numeric(
+        df: pd.DataFrame, *,
+        ignore_columns: Optional[Set[str]] = None) -> pd.DataFrame:
+    """Casts every column in |df| to a number with pd.to_numeric, unless it is
+    listed in |ignore_columns|.
+
+    Raises a DataFrameCastError naming every cell that is not a number,
+    rather than only the first one pd.to_numeric fails on.
+    """
+    ignore_columns = ignore_columns or set()
+
+    _validate_column_names(df, ignore_columns)
+
+    numeric_columns = [column_name for column_name in df.columns
+                       if column_name not in ignore_columns]
+    if not numeric_columns:
+        return df
+
+    try:
+        df[numeric_columns] = df[numeric_columns].apply(pd.to_numeric)
+    except (TypeError, ValueError):
+        raise DataFrameCastError(
+            'Failed to cast cells to numbers: {}'.format(
+                _non_numeric_cells(df[numeric_columns])))
 
     return df
 
 
+def _non_numeric_cells(df: pd.DataFrame) -> Dict[Tuple[Any, Any], Any]:
+    """Returns the cells of |df| that can't be cast to a number, by (index,
+    column_name)."""
+    coerced = df.apply(pd.to_numeric, errors='coerce')
+    candidates = df[coerced.isnull() & df.notnull()].stack()
+    return {cell: value for cell, value in candidates.items()
+            if not _is_number(value)}
+
+
+def _is_number(value: Any) -> bool:
+    try:
+        pd.to_numeric([value])
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+def label_blocks(is_block_start: pd.Series) -> pd.Series:
+    """Labels each row with the number of the block it belongs to, where each
+    block starts at a row for which |is_block_start| is True.
+
+    Blocks are numbered from 1, and rows before the first block are labeled 0.
+    Grouping by the labels replaces splitting a DataFrame into a list of small
+    DataFrames, one per block.
+    """
+    return is_block_start.astype(bool).cumsum()
+
+
 def _validate_column_names(df: pd.DataFrame, column_names: Iterable[str]):
     """Verify that all column_names exist as columns in |df|."""
     for column_name in column_names:
@@ -0,0 +1,188 @@
+# Recidiviz - a platform for tracking granular recidivism metrics in real time
+# Copyright (C) 2019 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+
+"""Parses and stores many state aggregate reports at once.
+
+Reports are parsed concurrently in a pool of worker processes, and the tables
+parsed from every report are concatenated so that each table is written with
+a single database.write_df call, rather than one per report.
+
+A report that fails to parse is logged and skipped, and reported back in the
+BatchResult, so that one bad report does not stop a backfill.
+
+Example:
+    result = batch_ingest.ingest([('florida', '/tmp/jails-2018-01.pdf'),
+                                  ('florida', '/tmp/jails-2018-02.pdf')])
+    if result.failed_paths:
+        ...
+"""
+
+import logging
+import multiprocessing
+import multiprocessing.pool
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, \
+    Optional, Tuple
+
+import attr
+import pandas as pd
+from sqlalchemy.ext.declarative import DeclarativeMeta
+
+from recidiviz.ingest.aggregate import parquet_export
+from recidiviz.ingest.aggregate.regions.ca import ca_aggregate_ingest
+from recidiviz.ingest.aggregate.regions.fl import fl_aggregate_ingest
+from recidiviz.ingest.aggregate.regions.ga import ga_aggregate_ingest
+from recidiviz.ingest.aggregate.regions.hi import hi_aggregate_ingest
+from recidiviz.ingest.aggregate.regions.ky import ky_aggregate_ingest
+from recidiviz.ingest.aggregate.regions.ny import ny_aggregate_ingest
+from recidiviz.ingest.aggregate.regions.tx import tx_aggregate_ingest
+from recidiviz.persistence.database import database
+
+# Please add new states in alphabetical order
+STATE_TO_PARSER = {
+    'california': ca_aggregate_ingest.parse,
+    'florida': fl_aggregate_ingest.parse,
+    'georgia': ga_aggregate_ingest.parse,
+    'hawaii': hi_aggregate_ingest.parse,
+    'kentucky': ky_aggregate_ingest.parse,
+    'new_york': ny_aggregate_ingest.parse,
+    'texas': tx_aggregate_ingest.parse,
+}
+
+Tables = Dict[DeclarativeMeta, pd.DataFrame]
+
+
+@attr.s(frozen=True)
+class BatchResult:
+    """The output of parsing a batch of reports."""
+
+    # Every parsed table, concatenated across reports in input order.
+    tables: Tables = attr.ib()
+
+    # The paths of every report, in input order.
+    paths: List[str] = attr.ib()
+
+    # The paths of the reports that failed to parse.
+    failed_paths: List[str] = attr.ib()
+
+
+def parse_files(state_paths: Iterable[Tuple[str, str]],
+                num_workers: Optional[int] = None) -> BatchResult:
+    """Parses each report with the parser for its state.
+
+    Args:
+        state_paths: (state, path) tuples, where state is a key of
+            STATE_TO_PARSER and path is a local path to the report. It is
+            consumed lazily, taking at most twice |num_workers| reports
+            ahead of the earliest one still being parsed, so it can be a
+            generator that is still downloading later reports while earlier
+            ones are parsed.
+        num_workers: the number of worker processes. Defaults to the CPU
+            count. With a single worker everything runs in this process.
+
+    Raises:
+        ValueError: if there is no parser for one of the states.
+    """
+    state_paths = map(_check_state, state_paths)
+
+    num_workers = num_workers or multiprocessing.cpu_count()
+    if num_workers == 1:
+        return _collect(map(_parse_file, state_paths))
+
+    with multiprocessing.Pool(num_workers) as pool:
+        return _collect(_imap_bounded(pool, _parse_file, state_paths,
+                                      2 * num_workers))
+
+
+def write_tables(tables: Tables) -> Dict[DeclarativeMeta, int]:
+    """Writes each table with one database.write_df call.
+
+    Returns:
+        The number of rows inserted into each table.
+    """
+    return {table: database.write_df(table, df)
+            for table, df in tables.items()}
+
+
+def ingest(state_paths: Iterable[Tuple[str, str]],
+           num_workers: Optional[int] = None,
+           export_path: Optional[str] = None) -> BatchResult:
+    """Parses each report (see parse_files) and writes every parsed table.
+
+    If |export_path| is given, every parsed table is also exported as Parquet
+    under it (see parquet_export).
+    """
+    result = parse_files(state_paths, num_workers)
+    for table, inserted in write_tables(result.tables).items():
+        logging.info('Inserted %d of %d parsed rows into %s', inserted,
+                     len(result.tables[table]), table.__tablename__)
+    if export_path:
+        parquet_export.write_tables(result.tables, export_path)
+    return result
+
+
+def _imap_bounded(pool: multiprocessing.pool.Pool, func: Callable,
+                  iterable: Iterable, max_pending: int) -> Iterator:
+    """Like pool.imap, but only takes the next item from |iterable| while
+    fewer than |max_pending| results are outstanding.
+
+    pool.imap takes items as fast as it can, so it would drain a generator
+    that downloads reports before most of them could be parsed. Results are
+    yielded in input order, so tables are concatenated deterministically
+    however the reports are scheduled.
+    """
+    pending: Deque[multiprocessing.pool.AsyncResult] = deque()
+    for item in iterable:
+        if len(pending) >= max_pending:
+            yield pending.popleft().get()
+        pending.append(pool.apply_async(func, (item,)))
+    while pending:
+        yield pending.popleft().get()
+
+
+def _check_state(state_path: Tuple[str, str]) -> Tuple[str, str]:
+    state, _ = state_path
+    if state not in STATE_TO_PARSER:
+        raise ValueError('No aggregate parser for state: {}'.format(state))
+    return state_path
+
+
+def _parse_file(state_path: Tuple[str, str]) \
+        -> Tuple[str, Optional[Tables]]:
+    state, path = state_path
+    try:
+        return path, STATE_TO_PARSER[state](path)
+    except Exception:
+        logging.exception('Failed to parse %s report: %s', state, path)
+        return path, None
+
+
+def _collect(parsed: Iterable[Tuple[str, Optional[Tables]]]) -> BatchResult:
+    dfs_by_table: Dict[DeclarativeMeta, List[pd.DataFrame]] = {}
+    paths = []
+    failed_paths = []
+    for path, tables in parsed:
+        paths.append(path)
+        if tables is None:
+            failed_paths.append(path)
+            continue
+        for table, df in tables.items():
+            dfs_by_table.setdefault(table, []).append(df)
+
+    tables = {table: pd.concat(dfs, ignore_index=True, sort=False)
+              for table, dfs in dfs_by_table.items()}
+    return BatchResult(tables=tables, paths=paths, failed_paths=failed_paths)
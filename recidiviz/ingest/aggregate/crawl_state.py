@@ -0,0 +1,84 @@
+# Recidiviz - a platform for tracking granular recidivism metrics in real time
+# Copyright (C) 2019 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+
+"""Remembers what previous crawls of a state's aggregate site found, so that
+the next crawl only has to look at what is new.
+
+The crawl state of each state is stored as JSON in GCS. It holds the date of
+the last crawl that downloaded every report it found, which scrapers that
+crawl a page per period (e.g. a year) use to skip older periods, and the
+url, POST data and fingerprint of every report downloaded so far.
+"""
+
+import datetime
+import json
+from typing import Any, Dict, Optional
+
+import attr
+import cattr
+import gcsfs
+
+cattr.register_unstructure_hook(datetime.date, datetime.date.isoformat)
+cattr.register_structure_hook(
+    datetime.date,
+    lambda serialized, desired_type: desired_type.fromisoformat(serialized))
+
+
+@attr.s
+class Report:
+    """A report found by a crawl."""
+
+    # The url the report was downloaded from
+    url: str = attr.ib()
+    # The post data sent to download the report, if it is a POST
+    post_data: Optional[Dict[str, Any]] = attr.ib(default=None)
+    # The ETag of the last download of the report, or if the server did not
+    # send one, the SHA-256 of its contents
+    fingerprint: Optional[str] = attr.ib(default=None)
+
+
+@attr.s
+class CrawlState:
+    """The state of every previous crawl of a state's aggregate site."""
+
+    # The date of the last crawl that downloaded every report it found
+    last_crawl_date: Optional[datetime.date] = attr.ib(default=None)
+    # Every report downloaded so far, by the name it was uploaded as
+    reports: Dict[str, Report] = attr.ib(factory=dict)
+
+    def to_serializable(self):
+        return cattr.unstructure(self)
+
+    @classmethod
+    def from_serializable(cls, serializable):
+        return cattr.structure(serializable, cls)
+
+
+def read(fs: gcsfs.GCSFileSystem, path: str) -> CrawlState:
+    """Reads the crawl state at |path|, or returns an empty crawl state if
+    there isn't one yet."""
+    try:
+        return CrawlState.from_serializable(json.loads(fs.cat(path)))
+    except FileNotFoundError:
+        return CrawlState()
+
+
+def write(fs: gcsfs.GCSFileSystem, path: str, crawl_state: CrawlState):
+    with fs.open(path, 'wb') as f:
+        f.write(json.dumps(crawl_state.to_serializable(),
+                           sort_keys=True).encode('utf-8'))
+
@@ -30,7 +30,8 @@ multiple states share the same county names.
 More info: https://en.wikipedia.org/wiki/FIPS_county_code
 """
 import difflib
-from typing import Iterable
+from functools import lru_cache
+from typing import Dict, Iterable
 
 import pandas as pd
 import us
@@ -45,35 +46,78 @@ _FIPS = pd.read_csv(as_filepath('fips.csv', subdir='data_sets'))
 
 
 def add_column_to_df(df: pd.DataFrame, county_names: pd.Series,
-                     state: us.states) -> pd.DataFrame:
+                     state: us.states.State) -> pd.DataFrame:
     """Add a new fips column to |df|.
 
     The provided |county_names| must be the same length as |df| and map each
     |df| row to the county_name that should be used to join against fips.csv.
     """
-    old_index = df.index
-    df.index = county_names.apply(_sanitize_county_name)
+    index = df.index
+    matched_names = _match(county_names, state)
+
+    # Order rows as a join on the matched names would, which groups the rows
+    # of repeated county names together.
+    if not matched_names.is_unique:
+        order = matched_names.argsort(kind='mergesort').values
+        df = df.iloc[order]
+        matched_names = matched_names.iloc[order]
+
+    county_fips = _get_fips_for(_state_code(state))
+    df = df.assign(fips=matched_names.map(county_fips).values)
+    df.index = index
+    return df
 
-    df = _fuzzy_join(df, _get_fips_for(state))
 
-    df.index = old_index
-    return df
+def resolve(county_names: pd.Series, state: us.states.State) -> pd.Series:
+    """Returns the fips of each of the |county_names| in the given |state|,
+    matching the closest known county_name (fuzzy) if there is no exact
+    match."""
+    return _match(county_names, state).map(_get_fips_for(_state_code(state)))
+
 
+def _match(county_names: pd.Series, state: us.states.State) -> pd.Series:
+    """Returns the known (sanitized) county_name matching each of the
+    |county_names| in the given |state|.
+
+    Each distinct name is only matched once, and matches are remembered across
+    calls, since reports for a state repeat the same names in every file.
+    """
+    state_code = _state_code(state)
+    matches = {county_name: _match_county_name(county_name, state_code)
+               for county_name in county_names.unique()}
+    return county_names.map(matches)
 
-def _get_fips_for(state: us.states) -> pd.DataFrame:
-    """Get the [county_name, fips] df, filtering for the given |state|."""
 
-    # Copy _FIPS to allow mutating the view created after filtering by state
-    fips = _FIPS.copy()
+def _state_code(state: us.states.State) -> int:
+    """Returns the FIPS code of |state|."""
+    if state.fips is None:
+        raise FipsMergingError(
+            'No FIPS code for state: {}'.format(state.name))
+    return int(state.fips)
 
-    fips = fips[fips.state_code == int(state.fips)]
+
+@lru_cache(maxsize=None)
+def _get_fips_for(state_code: int) -> Dict[str, int]:
+    """Get the sanitized county_name to fips mapping for the given
+    |state_code|."""
+    fips = _FIPS[_FIPS.state_code == state_code]
     if fips.empty:
         raise FipsMergingError(
-            'Failed to find FIPS codes for state: {}'.format(state))
+            'Failed to find FIPS codes for state: {}'.format(state_code))
+
+    return dict(zip(fips['county_name'].apply(_sanitize_county_name),
+                    fips['fips']))
+
 
-    fips['county_name'] = fips['county_name'].apply(_sanitize_county_name)
-    fips = fips.set_index('county_name')
-    return fips[['fips']]
+@lru_cache(maxsize=None)
+def _match_county_name(county_name: str, state_code: int) -> str:
+    """Returns the known county_name equal to |county_name| once sanitized,
+    or else its closest match (fuzzy)."""
+    known_county_names = _get_fips_for(state_code).keys()
+    sanitized_name = _sanitize_county_name(county_name)
+    if sanitized_name in known_county_names:
+        return sanitized_name
+    return _best_match(sanitized_name, known_county_names)
 
 
 def _sanitize_county_name(county_name: str) -> str:
@@ -81,12 +125,6 @@ def _sanitize_county_name(county_name: str) -> str:
     return county_name.lower().replace(' county', '')
 
 
-def _fuzzy_join(df1: pd.DataFrame, df2: pd.DataFrame):
-    """Merges df1 to df2 by choosing the closest index (fuzzy) to join on."""
-    df1.index = df1.index.map(lambda x: _best_match(x, df2.index))
-    return df1.join(df2)
-
-
 def _best_match(county_name: str, known_county_names: Iterable[str]) -> str:
     """Returns the closest match of |county_name| in |known_county_names|."""
     close_matches = difflib.get_close_matches(county_name, known_county_names,
@@ -95,7 +133,7 @@ def _best_match(county_name: str, known_county_names: Iterable[str]) -> str:
     if not close_matches:
         raise FipsMergingError(
             'Failed to fuzzy match "{}" to known county_names in the state: '
-            '{}'.format(county_name, known_county_names))
+            '{}'.format(county_name, list(known_county_names)))
 
     best_match = close_matches[0]
 
@@ -0,0 +1,161 @@
+# Recidiviz - a platform for tracking granular recidivism metrics in real time
+# Copyright (C) 2019 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+
+"""Exports aggregate tables as Parquet files, partitioned by state and
+report_date, for analytics that scan years of reports.
+
+Each table is written under <path>/<table_name>/, one file per partition:
+
+    <path>/ky_facility_aggregate/state=ky/report_date=2018-08-23/part-0.parquet
+
+where path is a local directory or a gs://bucket/prefix. The state is read
+from the first two digits of the fips, and fips is stored as a dictionary
+encoded (categorical) column, since each state only has a few dozen.
+
+read_df reads a range of report dates back, only opening the files of the
+partitions in range, and optionally only some columns of each.
+
+write_snapshot writes every row of a table in the database under
+<path>/snapshots/<date>/, in the same layout, so that a snapshot can be read
+with read_df too.
+
+Writing and reading Parquet requires pyarrow.
+"""
+
+import datetime
+import os
+from typing import Dict, List, Optional
+
+import pandas as pd
+import us
+from sqlalchemy.ext.declarative import DeclarativeMeta
+
+import recidiviz
+from recidiviz.ingest.aggregate import storage
+
+_PARTITION_COLUMNS = ['state', 'report_date']
+
+_PART_FILENAME = 'part-0.parquet'
+
+
+def write_df(table_name: str, df: pd.DataFrame, path: str) -> None:
+    """Writes |df|, rows of the table |table_name|, under |path|.
+
+    Every partition |df| has rows for is rewritten, so exporting the same
+    report twice replaces its rows rather than duplicating them.
+    """
+    df = df.copy()
+    df['fips'] = df['fips'].astype(str).str.zfill(5)
+    df['state'] = df['fips'].str[:2].map(_state_for_fips_prefix)
+    df['report_date'] = pd.to_datetime(df['report_date']).dt.strftime(
+        '%Y-%m-%d')
+
+    for (state, report_date), partition_df in df.groupby(_PARTITION_COLUMNS):
+        partition_df = partition_df.drop(columns=_PARTITION_COLUMNS)
+        partition_df['fips'] = partition_df['fips'].astype('category')
+
+        partition_path = os.path.join(
+            path, table_name, 'state={}'.format(state),
+            'report_date={}'.format(report_date), _PART_FILENAME)
+        with storage.open_path(partition_path, 'wb') as f:
+            partition_df.to_parquet(f, engine='pyarrow', index=False)
+
+
+def write_tables(tables: Dict[DeclarativeMeta, pd.DataFrame],
+                 path: str) -> None:
+    """Writes each table with write_df."""
+    for table, df in tables.items():
+        write_df(table.__tablename__, df, path)
+
+
+def write_snapshot(table_name: str, path: str,
+                   snapshot_date: Optional[datetime.date] = None) -> str:
+    """Writes every row of the table |table_name| in the database under
+    <path>/snapshots/<snapshot_date>/.
+
+    Returns:
+        The path the snapshot was written to, to pass to read_df.
+    """
+    snapshot_date = snapshot_date or datetime.date.today()
+    df = pd.read_sql_table(table_name, recidiviz.db_engine)
+    result_path = snapshot_path(path, snapshot_date)
+    if not df.empty:
+        write_df(table_name, df, result_path)
+    return result_path
+
+
+def snapshot_path(path: str, snapshot_date: datetime.date) -> str:
+    return os.path.join(path, 'snapshots', snapshot_date.isoformat())
+
+
+def read_df(table_name: str, path: str, start_date: datetime.date,
+            end_date: datetime.date, *, states: Optional[List[str]] = None,
+            columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Reads the rows of |table_name| under |path| with a report_date between
+    |start_date| and |end_date|, inclusive.
+
+    Only the files of partitions in range, and of |states| if given, e.g.
+    ['ky', 'tx'], are read. If |columns| is given only those columns are
+    read, plus state and report_date, which are always returned.
+    """
+    if columns is not None:
+        columns = [column_name for column_name in columns
+                   if column_name not in _PARTITION_COLUMNS]
+
+    dfs = []
+    table_path = os.path.join(path, table_name)
+    for state in _list_partitions(table_path, 'state'):
+        if states is not None and state not in states:
+            continue
+
+        state_path = os.path.join(table_path, 'state={}'.format(state))
+        for report_date in _list_partitions(state_path, 'report_date'):
+            date = datetime.datetime.strptime(report_date, '%Y-%m-%d').date()
+            if not start_date <= date <= end_date:
+                continue
+
+            partition_path = os.path.join(
+                state_path, 'report_date={}'.format(report_date),
+                _PART_FILENAME)
+            with storage.open_path(partition_path, 'rb') as f:
+                df = pd.read_parquet(f, engine='pyarrow', columns=columns)
+            df['state'] = state
+            df['report_date'] = date
+            dfs.append(df)
+
+    if not dfs:
+        return pd.DataFrame(columns=(columns or []) + _PARTITION_COLUMNS)
+
+    result = pd.concat(dfs, ignore_index=True, sort=False)
+    if 'fips' in result:
+        # Concatenating partitions with different categories loses them
+        result['fips'] = result['fips'].astype('category')
+    return result
+
+
+def _state_for_fips_prefix(fips_prefix: str) -> str:
+    state = us.states.lookup(fips_prefix)
+    if not state:
+        raise ValueError('No state for fips: {}'.format(fips_prefix))
+    return state.abbr.lower()
+
+
+def _list_partitions(path: str, key: str) -> List[str]:
+    """Returns the values of the <key>=<value> directories under |path|."""
+    prefix = '{}='.format(key)
+    return sorted(name[len(prefix):] for name in storage.list_dir(path)
+                  if name.startswith(prefix))
@@ -16,8 +16,9 @@
 # =============================================================================
 
 """Scrapes the California aggregate site and finds pdfs to download."""
+import datetime
 import re
-from typing import Dict, Tuple, List
+from typing import Dict, Tuple, List, Optional
 import dateparser
 import requests
 
@@ -62,8 +63,10 @@ def _get_pdf_data(year, month_from, month_to, reporting_range):
     }
 
 
-def get_urls_to_download() -> List[Tuple[str, Dict]]:
-    """Get all of the urls that should be downloaded."""
+def get_urls_to_download(since: Optional[datetime.date] = None) \
+        -> List[Tuple[str, Dict]]:
+    """Get all of the urls that should be downloaded, or if |since| is given,
+    only those of the years from |since| on."""
     page = requests.post(LANDING_PAGE, data=_get_landing_data()).text
 
     # Formatting on the page is extremely weird so its easiest to just take a
@@ -78,8 +81,12 @@ def get_urls_to_download() -> List[Tuple[str, Dict]]:
         date_from = 1
         date_to = 12
 
+    first_year = date_from.year
+    if since:
+        first_year = max(first_year, since.year)
+
     aggregate_urls = []
-    for i in range(date_from.year, date_to.year+1):
+    for i in range(first_year, date_to.year+1):
         month_from = 1
         month_to = 12
         if i == date_from.year:
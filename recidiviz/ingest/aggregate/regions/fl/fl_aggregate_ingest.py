@@ -21,12 +21,12 @@ from typing import Dict, Optional
 
 import dateparser
 import pandas as pd
-import tabula
 import us
 from sqlalchemy.ext.declarative import DeclarativeMeta
 
 import recidiviz.common.constants.enum_canonical_strings as enum_strings
-from recidiviz.ingest.aggregate import aggregate_ingest_utils, fips
+from recidiviz.ingest.aggregate import aggregate_ingest_utils, fips, \
+    tabula_cache
 from recidiviz.persistence.database.schema import FlCountyAggregate, \
     FlFacilityAggregate
 
@@ -59,13 +59,13 @@ def parse(filename: str) -> Dict[DeclarativeMeta, pd.DataFrame]:
 
 def _parse_county_table(filename: str) -> pd.DataFrame:
     """Parses the FL County - Table 1 in the PDF."""
-    part1 = tabula.read_pdf(
+    part1 = tabula_cache.read_pdf(
         filename,
         pages=[3],
         pandas_options={
             'header': [0, 1],
         })
-    part2 = tabula.read_pdf(
+    part2 = tabula_cache.read_pdf(
         filename,
         pages=[4],
         pandas_options={
@@ -100,14 +100,14 @@ def _parse_facility_table(filename: str) -> pd.DataFrame:
         'Number Misdemeanor Pretrial',
         'Total Percent Pretrial']
 
-    part1 = tabula.read_pdf(
+    part1 = tabula_cache.read_pdf(
         filename,
         pages=[5],
         pandas_options={
             'skiprows': [0, 1, 2],
             'names': column_names,
         })
-    part2 = tabula.read_pdf(
+    part2 = tabula_cache.read_pdf(
         filename,
         pages=[6],
         pandas_options={
@@ -22,11 +22,11 @@ import dateparser
 import pandas as pd
 import us
 from PyPDF2 import PdfFileReader
-import tabula
 from sqlalchemy.ext.declarative import DeclarativeMeta
 
 import recidiviz.common.constants.enum_canonical_strings as enum_strings
-from recidiviz.ingest.aggregate import aggregate_ingest_utils, fips
+from recidiviz.ingest.aggregate import aggregate_ingest_utils, fips, \
+    tabula_cache
 from recidiviz.ingest.aggregate.errors import AggregateDateParsingError
 from recidiviz.persistence.database.schema import GaCountyAggregate
 
@@ -91,7 +91,7 @@ def _parse_table(filename: str) -> pd.DataFrame:
     # the right half of the page
     use_lattice = True
 
-    result = tabula.read_pdf(
+    result = tabula_cache.read_pdf(
         filename,
         pages=pages,
         lattice=use_lattice,
@@ -16,24 +16,30 @@
 # =============================================================================
 
 """Scrapes the georgia aggregate site and finds pdfs to download."""
+import datetime
 import re
-from typing import Set
+from typing import Optional, Set
 from lxml import html
 import requests
 
 STATE_AGGREGATE_URL = 'https://www.dca.ga.gov/node/3811/documents/2086'
 BASE_URL = 'https://www.dca.ga.gov{}'
-YEAR_PATTERN = re.compile(r'[0-9]{4} Jail Reports')
+YEAR_PATTERN = re.compile(r'([0-9]{4}) Jail Reports')
 
 
-def get_urls_to_download() -> Set[str]:
+def get_urls_to_download(since: Optional[datetime.date] = None) -> Set[str]:
+    """Scrapes the report pdfs of every year, or if |since| is given, only of
+    the years from |since| on."""
     page = requests.get(STATE_AGGREGATE_URL).text
     html_tree = html.fromstring(page)
     links = html_tree.xpath('//a')
 
     aggregate_report_urls = set()
     for link in links:
-        if YEAR_PATTERN.match(link.text_content()):
+        match = YEAR_PATTERN.match(link.text_content())
+        if match:
+            if since and int(match.group(1)) < since.year:
+                continue
             url = BASE_URL.format(link.attrib['href'])
             # We need to do a separate get request on the actual report page
             page = requests.get(url).text
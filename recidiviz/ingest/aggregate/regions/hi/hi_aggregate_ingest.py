@@ -21,10 +21,10 @@ from typing import Dict, List, Iterable
 import dateparser
 import more_itertools
 import pandas as pd
-import tabula
 from sqlalchemy.ext.declarative import DeclarativeMeta
 
 import recidiviz.common.constants.enum_canonical_strings as enum_strings
+from recidiviz.ingest.aggregate import aggregate_ingest_utils, tabula_cache
 from recidiviz.ingest.aggregate.errors import FipsMergingError, \
     AggregateIngestError
 from recidiviz.persistence.database.schema import HiFacilityAggregate
@@ -115,7 +115,7 @@ def parse_date(filename: str) -> datetime.date:
 
 def _parse_table(filename: str) -> pd.DataFrame:
     """Parse the Head Count Endings and Contracted Facilities Tables."""
-    all_dfs = tabula.read_pdf(
+    all_dfs = tabula_cache.read_pdf(
         filename,
         multiple_tables=True,
         lattice=True,
@@ -138,16 +138,9 @@ def _parse_table(filename: str) -> pd.DataFrame:
         result.facility_name.map(_facility_acronym_to_name)
 
     # Rows that may be NaN need to be cast as a float, otherwise use int
-    string_columns = {'facility_name'}
-    nullable_columns = {'design_bed_capacity', 'operation_bed_capacity'}
-    int_columns = set(result.columns) - string_columns - nullable_columns
-
-    for column_name in int_columns:
-        result[column_name] = result[column_name].astype(int)
-    for column_name in nullable_columns:
-        result[column_name] = result[column_name].astype(float)
-
-    return result
+    return aggregate_ingest_utils.cast_columns_to_int(
+        result, ignore_columns={'facility_name'},
+        nullable_int_columns={'design_bed_capacity', 'operation_bed_capacity'})
 
 
 def _df_matching_substring(dfs: List[pd.DataFrame], strings: Iterable[str]) \
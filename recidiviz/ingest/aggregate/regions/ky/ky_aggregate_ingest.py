@@ -16,17 +16,17 @@
 # =============================================================================
 """Parse the KY Aggregated Statistics PDF."""
 import datetime
-from typing import Dict, List
+from typing import Dict
 
 import dateparser
 import numpy as np
 import pandas as pd
-import tabula
 import us
 from sqlalchemy.ext.declarative import DeclarativeMeta
 
 import recidiviz.common.constants.enum_canonical_strings as enum_strings
-from recidiviz.ingest.aggregate import aggregate_ingest_utils, fips
+from recidiviz.ingest.aggregate import aggregate_ingest_utils, fips, \
+    tabula_cache
 from recidiviz.persistence.database.schema import KyFacilityAggregate
 
 
@@ -47,7 +47,7 @@ def parse(filename: str) -> Dict[DeclarativeMeta, pd.DataFrame]:
 
 def _parse_table(filename: str) -> pd.DataFrame:
     """Parses the table in the KY PDF."""
-    whole_df = tabula.read_pdf(
+    whole_df = tabula_cache.read_pdf(
         filename,
         pages='all',
         lattice=True
@@ -70,30 +70,28 @@ def _parse_table(filename: str) -> pd.DataFrame:
     whole_df.columns = whole_df.columns.str.replace('\r', ' ')
 
     # Each block of county data starts with a filled in 'Total Jail Beds'
-    start_of_county_indices = np.where(whole_df['Total Jail Beds'].notnull())[0]
-    dfs_split_by_county = _split_df(whole_df, start_of_county_indices)
-
-    dfs_grouped_by_gender = []
-    for df in dfs_split_by_county:
-        # Cast everything to int before summing below
-        df = df.fillna(0)
-        df = aggregate_ingest_utils.cast_columns_to_int(
-            df, ignore_columns={'County', 'Facility Security', 'Inmate Cusody'})
-
-        df['Gender'] = None
-        df = _collapse_by_gender_rows(df, 'Male')
-        df = _collapse_by_gender_rows(df, 'Female')
-
-        # The first row contains header data for both Male and Female
-        df['County'] = df['County'][0]
-        df['total_jail_beds'] = df['Total Jail Beds'][0]
-        df['reported_population'] = \
-            df['Reported Population (Total and Male/Female)'][0]
-        df = df[1:]
-
-        dfs_grouped_by_gender.append(df)
-
-    df_by_gender = pd.concat(dfs_grouped_by_gender)
+    is_county_start = whole_df['Total Jail Beds'].notnull()
+    county_blocks = aggregate_ingest_utils.label_blocks(is_county_start)
+    whole_df = whole_df[county_blocks > 0]
+    is_county_start = is_county_start[county_blocks > 0]
+    county_blocks = county_blocks[county_blocks > 0].rename('county_block')
+
+    # Cast everything to int before summing below
+    whole_df = whole_df.fillna(0)
+    whole_df = aggregate_ingest_utils.cast_columns_to_int(
+        whole_df,
+        ignore_columns={'County', 'Facility Security', 'Inmate Cusody'})
+
+    df_by_gender = _collapse_by_gender_rows(whole_df, county_blocks)
+
+    # The first row of each block contains header data for both Male and
+    # Female
+    county_rows = whole_df[is_county_start]
+    county_rows.index = county_blocks[is_county_start]
+    df_by_gender['County'] = county_rows['County']
+    df_by_gender['total_jail_beds'] = county_rows['Total Jail Beds']
+    df_by_gender['reported_population'] = \
+        county_rows['Reported Population (Total and Male/Female)']
 
     # Split into male_df and female_df to independently set column headers
     male_df = df_by_gender[df_by_gender['Gender'] == 'Male']
@@ -146,40 +144,32 @@ def _shift_headers(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def _split_df(df: pd.DataFrame, indices: List[int]) -> List[pd.DataFrame]:
+def _collapse_by_gender_rows(df: pd.DataFrame, county_blocks: pd.Series) \
+        -> pd.DataFrame:
     """
-    Split the fully parsed DataFrame into a new DataFrame based on |indices|.
+    Collapse the rows with Male or Female in the 'County' column of each
+    block in |county_blocks| into one row per gender, labeled in the 'Gender'
+    column. This has the effect of combining both Secure and Non-Secure
+    groups.
     """
-    end = None
-
-    dfs = []
-    for start, end in aggregate_ingest_utils.pairwise(indices):
-        dfs.append(df[start:end].reset_index(drop=True))
-
-    if end:
-        dfs.append(df[end:].reset_index(drop=True))
-
-    return dfs
-
-
-def _collapse_by_gender_rows(df: pd.DataFrame, gender: str) -> pd.DataFrame:
-    """
-    Collapse all rows with |gender_str| in the 'County' column and group them
-    by the 'Gender' column. This has the effect of combining both Secure and
-    Non-Secure groups.
-    """
-    matching_rows = df['County'].str.contains(gender).fillna(False)
+    genders = df['County'].astype(str).str.extract(
+        '(Male|Female)', expand=False).rename('Gender')
+    count_columns = [column_name for column_name in df.columns
+                     if column_name not in {'County', 'Facility Security',
+                                            'Inmate Cusody'}]
 
     # To get counts from the PDF, sum secure/non-secure. For example:
     # male_population = male_population (secure) + male_population (unsecure)
-    collapsed_row = df[matching_rows].sum(axis='rows')
-
-    collapsed_row['Gender'] = gender
+    collapsed = df[count_columns].groupby([county_blocks, genders]).sum()
 
-    df = df[~matching_rows]
-    df = df.append(collapsed_row, ignore_index=True)
+    # Every block has a Male and a Female row, even if it had no rows to sum
+    collapsed = collapsed.reindex(
+        pd.MultiIndex.from_product(
+            [county_blocks.unique(), ['Male', 'Female']],
+            names=collapsed.index.names),
+        fill_value=0)
 
-    return df.reset_index(drop=True)
+    return collapsed.reset_index(level='Gender')
 
 
 def parse_date(filename: str) -> datetime.date:
@@ -24,12 +24,12 @@ import dateutil.parser
 import numpy
 import numpy as np
 import pandas as pd
-import tabula
 import us
 from sqlalchemy.ext.declarative import DeclarativeMeta
 
 import recidiviz.common.constants.enum_canonical_strings as enum_strings
-from recidiviz.ingest.aggregate import aggregate_ingest_utils, fips
+from recidiviz.ingest.aggregate import aggregate_ingest_utils, fips, \
+    tabula_cache
 from recidiviz.persistence.database.schema import NyFacilityAggregate
 
 
@@ -51,7 +51,7 @@ def parse(filename: str) -> Dict[DeclarativeMeta, pd.DataFrame]:
 
 def _parse_table(filename: str) -> pd.DataFrame:
     """Parses all tables in the GA PDF."""
-    all_dfs = tabula.read_pdf(
+    all_dfs = tabula_cache.read_pdf(
         filename,
         pages='all',
         multiple_tables=True,
@@ -28,6 +28,13 @@ from recidiviz.ingest.aggregate import aggregate_ingest_utils, fips
 from recidiviz.persistence.database.schema import PaFacilityPopAggregate, \
     PaCountyPreSentencedAggregate
 
+_SPECIAL_VALUES = {
+    # "N/A" means a value could never be set, so set it explicitly to 0
+    'N/A': 0,
+    # "N/R" means "Not Reported", so write null to the database with NaN
+    'N/R': NaN,
+}
+
 
 def parse(filename: str) -> Dict[DeclarativeMeta, pd.DataFrame]:
     table_1 = _parse_tab_1(filename)
@@ -71,7 +78,10 @@ def _parse_tab_1(filename: str) -> pd.DataFrame:
     # Some cells have extra '*'
     df = df.applymap(lambda e: str(e).rstrip(' *'))
 
-    df = df.apply(_to_numeric)
+    numeric_columns = df.columns.drop('facility_name')
+    df[numeric_columns] = df[numeric_columns].replace(_SPECIAL_VALUES)
+    df = aggregate_ingest_utils.cast_columns_to_numeric(
+        df, ignore_columns={'facility_name'})
 
     df['report_date'] = _report_date_tab_1(filename)
     df = fips.add_column_to_df(df, df['facility_name'], us.states.PA)
@@ -107,23 +117,12 @@ def _parse_tab_2(filename: str):
 
     df['county_name'] = df['county_name'].str.rstrip(' ')
     df['report_date'] = df['report_date'].dt.date
-    df['pre_sentenced_population'] = _to_numeric(df['pre_sentenced_population'])
+    df['pre_sentenced_population'] = \
+        df['pre_sentenced_population'].replace(_SPECIAL_VALUES)
+    df = aggregate_ingest_utils.cast_columns_to_numeric(
+        df, ignore_columns={'county_name', 'report_date'})
 
     df = fips.add_column_to_df(df, df['county_name'], us.states.PA)
     df['report_granularity'] = enum_strings.quarterly_granularity
 
     return df
-
-
-def _to_numeric(column):
-    # Skip columns that shouldn't be numeric
-    if column.name == 'facility_name':
-        return column
-
-    # "N/A" means a value could never be set, so set it explicitly to 0
-    column = column.map(lambda cell: 0 if cell == 'N/A' else cell)
-
-    # "N/R" means "Not Reported", so write null to the database with NaN
-    column = column.map(lambda cell: NaN if cell == 'N/R' else cell)
-
-    return pd.to_numeric(column)
@@ -22,11 +22,11 @@ import dateparser
 
 import pandas as pd
 import us
-import tabula
 from sqlalchemy.ext.declarative import DeclarativeMeta
 
 import recidiviz.common.constants.enum_canonical_strings as enum_strings
-from recidiviz.ingest.aggregate import aggregate_ingest_utils, fips
+from recidiviz.ingest.aggregate import aggregate_ingest_utils, fips, \
+    tabula_cache
 from recidiviz.ingest.aggregate.errors import AggregateDateParsingError
 from recidiviz.persistence.database.schema import TxCountyAggregate
 
@@ -76,7 +76,7 @@ def _parse_table(filename: str, report_date: datetime.date) -> pd.DataFrame:
         # just get all of the tables and consider only the one with numbers on
         # it.  That lets us clean it up by dropping nonsense columns and rows,
         # and then assigning our own columns names to them.
-        df = tabula.read_pdf(
+        df = tabula_cache.read_pdf(
             filename,
             multiple_tables=True,
             pages=page_num,
@@ -121,10 +121,8 @@ def _parse_table(filename: str, report_date: datetime.date) -> pd.DataFrame:
 
     result = pd.concat(pages, ignore_index=True)
 
-    for column_name in set(result.columns) - {'facility_name'}:
-        result[column_name] = result[column_name].astype(int)
-
-    return result
+    return aggregate_ingest_utils.cast_columns_to_int(
+        result, ignore_columns={'facility_name'})
 
 
 def _get_column_names(report_date):
@@ -17,16 +17,20 @@
 
 """Exposes an endpoint to scrape all of the county websites."""
 
+from concurrent import futures
+import datetime
+import hashlib
 from http import HTTPStatus
 import logging
 import os
 import tempfile
-from typing import Optional, Tuple, Dict
+from typing import Optional, Tuple, Dict, Set
 from urllib.parse import urlparse
 import requests
 from flask import Blueprint, request
 import gcsfs
 
+from recidiviz.ingest.aggregate import crawl_state
 from recidiviz.ingest.aggregate.regions.ca import ca_aggregate_site_scraper
 from recidiviz.ingest.aggregate.regions.fl import fl_aggregate_site_scraper
 from recidiviz.ingest.aggregate.regions.ga import ga_aggregate_site_scraper
@@ -51,6 +55,27 @@ class ScrapeAggregateError(Exception):
 HISTORICAL_BUCKET = '{}-processed-state-aggregates'
 UPLOAD_BUCKET = '{}-state-aggregate-reports'
 
+# The crawl state of a state, kept outside of the state directories of the
+# historical bucket so it is never ingested.
+CRAWL_STATE_PATH = os.path.join(HISTORICAL_BUCKET, 'crawl_state', '{}.json')
+
+# Scrapers that crawl a page per period, which can skip the periods before the
+# last crawl.
+_INCREMENTAL_SCRAPERS = {'california', 'georgia'}
+
+# Reports can be posted a while after the period they cover, so the periods
+# this long before the last crawl are crawled again.
+_RECRAWL_WINDOW = datetime.timedelta(days=90)
+
+# The number of reports downloaded at once for a state.
+_DEFAULT_MAX_CONCURRENT_DOWNLOADS = 4
+_MAX_CONCURRENT_DOWNLOADS = {
+    # Every report is a POST to the same form.
+    'california': 1,
+}
+
+_DOWNLOAD_CHUNK_SIZE = 1 << 16
+
 
 @scrape_aggregate_reports_blueprint.route('/scrape_state')
 @authenticate_request
@@ -68,17 +93,34 @@ def scrape_aggregate_reports():
         'texas': tx_aggregate_site_scraper.get_urls_to_download,
     }
     state = get_value('state', request.args)
+    # Ignore what previous crawls found, and crawl every period again.
+    full_recrawl = get_value('full_recrawl', request.args) == 'true'
     # We want to always download the pdf if it is NY because they always have
-    # the same name.
+    # the same name, unless its ETag shows it has not changed since the last
+    # download.
     always_download = (state == 'new_york')
     is_ca = (state == 'california')
-    urls = state_to_scraper[state]()
     gcp_project = metadata.project_id()
     historical_bucket = HISTORICAL_BUCKET.format(gcp_project)
     upload_bucket = UPLOAD_BUCKET.format(gcp_project)
     fs = gcsfs.GCSFileSystem(project=gcp_project, cache_timeout=-1)
+
+    crawl_state_path = CRAWL_STATE_PATH.format(gcp_project, state)
+    crawl = crawl_state.CrawlState() if full_recrawl \
+        else crawl_state.read(fs, crawl_state_path)
+
     logging.info('Scraping all pdfs for %s', state)
+    scraper = state_to_scraper[state]
+    if state in _INCREMENTAL_SCRAPERS and crawl.last_crawl_date:
+        urls = scraper(since=crawl.last_crawl_date - _RECRAWL_WINDOW)
+    else:
+        urls = scraper()
+
+    # List the historical files once, rather than checking for each file.
+    historical_names = _list_names(fs, os.path.join(historical_bucket, state))
+    new_reports: Dict[str, crawl_state.Report] = {}
 
+    downloads = []
     for url in urls:
         post_data = None
         if isinstance(url, Tuple):
@@ -90,39 +132,95 @@ def scrape_aggregate_reports():
                 pdf_name += str(post_data['year'])
         else:
             pdf_name = urlparse(url).path.replace('/', '_').lower()
-        historical_path = os.path.join(historical_bucket, state, pdf_name)
-        file_to_upload = _get_file_to_upload(
-            historical_path, fs, url, pdf_name, always_download, post_data)
-        if file_to_upload:
-            upload_path = os.path.join(upload_bucket, state, pdf_name)
-            fs.put(file_to_upload, upload_path)
-            logging.info('Successfully downloaded %s', url)
+        if always_download or (pdf_name not in historical_names
+                               and pdf_name not in crawl.reports):
+            downloads.append((url, post_data, pdf_name))
         else:
             logging.info(
                 'Skipping %s because the file already exists', url)
 
+    def _upload(url, post_data, pdf_name):
+        report = crawl.reports.get(pdf_name)
+        if always_download and report:
+            etag = _get_etag(url)
+            if etag and report.fingerprint == etag:
+                logging.info('Skipping %s because it has not changed', url)
+                return
+        # Each report is downloaded into a directory of its own, so that
+        # concurrent requests for the same pdf_name don't overwrite each
+        # other's file, and the file is removed once it is uploaded.
+        with tempfile.TemporaryDirectory() as tmpdir_path:
+            file_to_upload, fingerprint = _download(
+                url, pdf_name, post_data, tmpdir_path)
+            if report and report.fingerprint == fingerprint:
+                logging.info('Skipping %s because it has not changed', url)
+                return
+            upload_path = os.path.join(upload_bucket, state, pdf_name)
+            fs.put(file_to_upload, upload_path)
+        new_reports[pdf_name] = crawl_state.Report(
+            url=url, post_data=post_data, fingerprint=fingerprint)
+        logging.info('Successfully downloaded %s', url)
+
+    max_workers = _MAX_CONCURRENT_DOWNLOADS.get(
+        state, _DEFAULT_MAX_CONCURRENT_DOWNLOADS)
+    with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        uploads = [executor.submit(_upload, *download)
+                   for download in downloads]
+
+    # Remember the reports that were uploaded even if others failed, but only
+    # skip periods before this crawl once every report was uploaded.
+    crawl.reports.update(new_reports)
+    if not any(upload.exception() for upload in uploads):
+        crawl.last_crawl_date = datetime.date.today()
+    crawl_state.write(fs, crawl_state_path, crawl)
+
+    # Raise the first error only once every other download has finished.
+    for upload in uploads:
+        upload.result()
+
     return '', HTTPStatus.OK
 
 
-def _get_file_to_upload(
-        path: str, fs: gcsfs.GCSFileSystem, url: str, pdf_name: str,
-        always_download: bool, post_data: Dict) \
-        -> Optional[str]:
-    """This function checks first whether it needs to download, and then
-    returns the locally downloaded pdf"""
-    # First check if the path doesn't exist at all
-    path_to_download = None
-    if always_download or not fs.exists(path):
-        if post_data:
-            response = requests.post(url, data=post_data)
-        else:
-            response = requests.get(url)
-        if response.status_code == 200:
-            path_to_download = os.path.join(tempfile.gettempdir(), pdf_name)
-            with open(path_to_download, 'wb') as f:
-                # Need to use content since PDF needs to write raw bytes.
-                f.write(response.content)
-        else:
+def _list_names(fs: gcsfs.GCSFileSystem, path: str) -> Set[str]:
+    """Returns the names of the files in the |path| directory."""
+    try:
+        return {os.path.basename(file_path) for file_path in fs.ls(path)}
+    except FileNotFoundError:
+        return set()
+
+
+def _get_etag(url: str) -> Optional[str]:
+    """Returns the ETag the server has for |url|, if any."""
+    response = requests.head(url, allow_redirects=True)
+    if response.status_code != 200:
+        return None
+    return response.headers.get('ETag')
+
+
+def _download(url: str, pdf_name: str, post_data: Optional[Dict],
+              download_dir: str) -> Tuple[str, str]:
+    """Downloads the pdf at |url| into |download_dir| and returns the local
+    path it was written to, and its fingerprint: its ETag, or the SHA-256 of
+    its contents if the server didn't send one. The response is streamed to
+    the file rather than read into memory."""
+    if post_data:
+        response = requests.post(url, data=post_data, stream=True)
+    else:
+        response = requests.get(url, stream=True)
+    try:
+        if response.status_code != 200:
             raise ScrapeAggregateError(
                 'Could not download file {}'.format(pdf_name))
-    return path_to_download
+        path_to_download = os.path.join(download_dir, pdf_name)
+        content_hash = hashlib.sha256()
+        with open(path_to_download, 'wb') as f:
+            # Need to write raw bytes since these are PDFs.
+            for chunk in response.iter_content(
+                    chunk_size=_DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+                content_hash.update(chunk)
+        fingerprint = response.headers.get('ETag') or \
+            'sha256:{}'.format(content_hash.hexdigest())
+    finally:
+        response.close()
+    return path_to_download, fingerprint
@@ -0,0 +1,57 @@
+# Recidiviz - a platform for tracking granular recidivism metrics in real time
+# Copyright (C) 2019 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+
+"""Opens and lists files under either a local directory or a
+gs://bucket/prefix, for the caches and exports of aggregate reports that can
+be kept in either.
+"""
+
+import os
+from typing import IO, List
+
+import gcsfs
+
+GCS_PREFIX = 'gs://'
+
+
+def open_path(path: str, mode: str) -> IO:
+    """Opens the local or gs:// file at |path|. Writing to a local file
+    creates its directory first."""
+    if path.startswith(GCS_PREFIX):
+        # Don't use the gcsfs cache
+        fs = gcsfs.GCSFileSystem(cache_timeout=-1)
+        return fs.open(path[len(GCS_PREFIX):], mode)
+
+    if 'w' in mode:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    return open(path, mode)
+
+
+def list_dir(path: str) -> List[str]:
+    """Returns the names of the files and directories in the local or gs://
+    directory at |path|, or an empty list if there is no such directory."""
+    if path.startswith(GCS_PREFIX):
+        fs = gcsfs.GCSFileSystem(cache_timeout=-1)
+        try:
+            return [os.path.basename(child.rstrip('/'))
+                    for child in fs.ls(path[len(GCS_PREFIX):])]
+        except FileNotFoundError:
+            return []
+
+    if not os.path.isdir(path):
+        return []
+    return os.listdir(path)
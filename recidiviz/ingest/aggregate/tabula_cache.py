@@ -0,0 +1,148 @@
+# Recidiviz - a platform for tracking granular recidivism metrics in real time
+# Copyright (C) 2019 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+
+"""Caches the tables tabula extracts from aggregate report PDFs.
+
+Extracting tables with tabula is by far the most expensive part of parsing a
+report. read_pdf is a drop-in replacement for tabula.read_pdf which stores
+each result under the SHA-256 of the PDF's contents and of the tabula
+options, so re-parsing a report after fixing a parser, or re-running a
+backfill, only runs tabula for PDFs and options it has not seen before.
+
+Caching is off unless a local directory to cache in is set, with
+set_cache_path or the TABULA_CACHE_PATH environment variable.
+
+Results are stored as pickles, rather than e.g. Parquet, because parsers
+depend on exactly what tabula returns: lists of DataFrames, MultiIndex
+headers and mixed-type object columns. Loading a pickle can run arbitrary
+code, so the cache directory must only be writable by whoever runs the
+ingest. For the same reason a gs:// cache path is refused: anyone who can
+write to the bucket could run code in the ingest.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import types
+from typing import Any, Optional
+
+import tabula
+
+from recidiviz.ingest.aggregate import storage
+
+CACHE_PATH_ENV = 'TABULA_CACHE_PATH'
+
+_cache_path: Optional[str] = os.environ.get(CACHE_PATH_ENV)
+
+
+def set_cache_path(path: Optional[str]) -> None:
+    """Sets the local directory to cache results in, or turns caching off if
+    |path| is None.
+
+    Raises:
+        ValueError: if |path| is not a local directory path.
+    """
+    if path:
+        _check_local(path)
+    global _cache_path
+    _cache_path = path
+
+
+def read_pdf(filename: str, **kwargs) -> Any:
+    """Returns tabula.read_pdf(filename, **kwargs), from the cache if the same
+    PDF was read with the same options before."""
+    if not _cache_path:
+        return tabula.read_pdf(filename, **kwargs)
+    _check_local(_cache_path)
+
+    path = os.path.join(_cache_path, cache_key(filename, **kwargs))
+    try:
+        with storage.open_path(path, 'rb') as cached:
+            return pickle.load(cached)
+    except FileNotFoundError:
+        pass
+    except Exception:
+        logging.exception('Ignoring unreadable cached tables: %s', path)
+
+    result = tabula.read_pdf(filename, **kwargs)
+    try:
+        with storage.open_path(path, 'wb') as cached:
+            pickle.dump(result, cached, pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        logging.exception('Failed to cache tables: %s', path)
+    return result
+
+
+def _check_local(path: str) -> None:
+    if path.startswith(storage.GCS_PREFIX):
+        raise ValueError(
+            'The tabula cache must be a local directory, got: {}'.format(path))
+
+
+def cache_key(filename: str, **kwargs) -> str:
+    """Returns the name results are cached under, which changes with the
+    contents of the PDF, the tabula options and the tabula version."""
+    pdf_hash = hashlib.sha256()
+    with open(filename, 'rb') as pdf:
+        for block in iter(lambda: pdf.read(1 << 20), b''):
+            pdf_hash.update(block)
+
+    options = json.dumps(
+        [getattr(tabula, '__version__', None), kwargs], sort_keys=True,
+        default=_describe_option)
+    options_hash = hashlib.sha256(options.encode('utf-8'))
+
+    return '{}-{}.pkl'.format(pdf_hash.hexdigest(),
+                              options_hash.hexdigest()[:16])
+
+
+def _describe_option(option: Any) -> str:
+    """Describes options json can't serialize, e.g. a skiprows function.
+
+    A function is described by its name and a hash of what it computes: its
+    bytecode, the constants and names the bytecode uses, its default
+    arguments and the values it closes over. Changing any of them, e.g. a
+    row number in a skiprows lambda, changes the cache key.
+    """
+    code = getattr(option, '__code__', None)
+    if code is None:
+        return repr(option)
+
+    function_hash = hashlib.sha256()
+    _hash_code(function_hash, code)
+    for value in option.__defaults__ or ():
+        function_hash.update(_describe_option(value).encode('utf-8'))
+    for cell in option.__closure__ or ():
+        function_hash.update(
+            _describe_option(cell.cell_contents).encode('utf-8'))
+    return '{}.{}:{}'.format(option.__module__, option.__qualname__,
+                             function_hash.hexdigest())
+
+
+def _hash_code(code_hash, code: types.CodeType) -> None:
+    """Adds |code| and the code of any functions defined in it to
+    |code_hash|."""
+    code_hash.update(code.co_code)
+    code_hash.update(repr(code.co_names).encode('utf-8'))
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _hash_code(code_hash, const)
+        else:
+            code_hash.update('{}:{!r}'.format(
+                type(const).__name__, const).encode('utf-8'))
@@ -23,6 +23,7 @@ model and returned.
 import abc
 from typing import Union, List, Optional, Sequence, Dict, Set
 
+import attr
 import yaml
 from lxml.html import HtmlElement
 
@@ -30,6 +31,24 @@ from recidiviz.ingest.models.ingest_info import HIERARCHY_MAP, PLURALS, \
     IngestInfo, IngestObject
 
 
+@attr.s(frozen=True)
+class _SetterPlan:
+    """Everything needed to write a value for a single lookup key, resolved
+    once per key instead of once per extracted value."""
+
+    # The ingest class the field lives on, i.e. 'person'.
+    class_to_set: str = attr.ib()
+
+    # The field to set on that class, i.e. 'surname'.
+    ingest_key: str = attr.ib()
+
+    # The classes that must be walked to reach the parent of |class_to_set|.
+    hierarchy: Sequence[str] = attr.ib()
+
+    # Whether |class_to_set| appears in the manifest's multi_key_mapping.
+    is_multi_key: bool = attr.ib()
+
+
 class DataExtractor(metaclass=abc.ABCMeta):
     """Base class for automatically extracting data from a file."""
 
@@ -40,6 +59,10 @@ class DataExtractor(metaclass=abc.ABCMeta):
             key_mapping_file: a yaml file defining the mappings that the
                 data extractor uses to find relevant keys.
         """
+        # Lazily populated cache of lookup key -> _SetterPlan. Subclasses add
+        # to |self.keys| after this init runs, so plans can't be built here.
+        self._setter_plans: Dict[str, _SetterPlan] = {}
+
         if key_mapping_file:
             with open(key_mapping_file, 'r') as ymlfile:
                 self.manifest = yaml.load(ymlfile)
@@ -84,13 +107,12 @@ class DataExtractor(metaclass=abc.ABCMeta):
         lookup_keys = lookup_keys if isinstance(lookup_keys, list) \
             else [lookup_keys]
         for lookup_key in lookup_keys:
-            class_to_set, ingest_key = lookup_key.split('.')
-            is_multi_key = class_to_set in self.multi_key_classes
+            plan = self._get_setter_plan(lookup_key)
+            class_to_set = plan.class_to_set
+            ingest_key = plan.ingest_key
             for i, value in enumerate(values):
-                parent = self._get_parent(ingest_info, class_to_set, i,
-                                          is_multi_key)
-                object_to_set = self._get_object_to_set(class_to_set, parent,
-                                                        i, is_multi_key)
+                parent = self._get_parent(ingest_info, plan, i)
+                object_to_set = self._get_object_to_set(plan, parent, i)
                 # If the object we are trying to operate on is None, or it has
                 # already set the ingest_key then we know we need to create a
                 # new one.
@@ -101,15 +123,29 @@ class DataExtractor(metaclass=abc.ABCMeta):
                 setattr(object_to_set, ingest_key, value)
                 seen_map[id(object_to_set)].add(ingest_key)
 
+    def _get_setter_plan(self, lookup_key: str) -> _SetterPlan:
+        """Returns the cached _SetterPlan for |lookup_key|, building it on
+        first use."""
+        plan = self._setter_plans.get(lookup_key)
+        if plan is None:
+            class_to_set, ingest_key = lookup_key.split('.')
+            plan = _SetterPlan(
+                class_to_set=class_to_set, ingest_key=ingest_key,
+                hierarchy=HIERARCHY_MAP[class_to_set],
+                is_multi_key=class_to_set in self.multi_key_classes)
+            self._setter_plans[lookup_key] = plan
+        return plan
+
     def _get_parent(
-            self, ingest_info: IngestInfo, class_to_set: str, index: int,
-            is_multi_key: bool) -> IngestObject:
+            self, ingest_info: IngestInfo, plan: _SetterPlan,
+            index: int) -> IngestObject:
         """Finds or creates the parent of the object we are going to set, which
         may need to have its own parent created if it is a hold or charge in a
         multi-key column."""
+        class_to_set = plan.class_to_set
         # Multi-keys may need to be indexed by their parent, i.e. a bond at
         # index 3 has the parent charge at index 3.
-        if is_multi_key and class_to_set != 'person':
+        if plan.is_multi_key and class_to_set != 'person':
             parent_cls_to_set = HIERARCHY_MAP[class_to_set][-1]
             grandparent_cls_to_set = HIERARCHY_MAP[parent_cls_to_set][-1] if \
                 HIERARCHY_MAP[parent_cls_to_set] else None
@@ -136,15 +172,16 @@ class DataExtractor(metaclass=abc.ABCMeta):
                     parent_cls_to_set in self.multi_key_classes:
                 return _create(grandparent, parent_cls_to_set)
 
-        return self._find_parent_ingest_info(ingest_info,
-                                             HIERARCHY_MAP[class_to_set], index)
+        return self._find_parent_ingest_info(ingest_info, plan.hierarchy,
+                                             index)
 
     def _get_object_to_set(
-            self, class_to_set: str, parent: IngestObject, index: int,
-            is_multi_key: bool) -> IngestObject:
+            self, plan: _SetterPlan, parent: IngestObject,
+            index: int) -> IngestObject:
         """Finds or creates the object we are going to set, which may already
         exist in the multi-key case."""
-        if is_multi_key and class_to_set in PLURALS:
+        class_to_set = plan.class_to_set
+        if plan.is_multi_key and class_to_set in PLURALS:
             list_of_class_to_set = getattr(parent, PLURALS[class_to_set])
             if list_of_class_to_set is not None \
                     and isinstance(list_of_class_to_set, list) \
@@ -182,10 +219,17 @@ class DataExtractor(metaclass=abc.ABCMeta):
         return parent
 
 
+# Method names are precomputed so the per-value hot path doesn't build strings.
+_GET_RECENT_METHODS = {class_name: 'get_recent_' + class_name
+                       for class_name in HIERARCHY_MAP}
+_CREATE_METHODS = {class_name: 'create_' + class_name
+                   for class_name in HIERARCHY_MAP}
+
+
 def _get_recent(
         parent: IngestObject, class_name: str):
-    return getattr(parent, 'get_recent_' + class_name)()
+    return getattr(parent, _GET_RECENT_METHODS[class_name])()
 
 
 def _create(parent: IngestObject, class_name: str):
-    return getattr(parent, 'create_' + class_name)()
+    return getattr(parent, _CREATE_METHODS[class_name])()
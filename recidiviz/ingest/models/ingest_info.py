@@ -16,8 +16,8 @@
 # =============================================================================
 
 """Represents data scraped for a single individual."""
-from abc import abstractmethod
-from typing import List, Optional, Dict, Sequence
+from operator import attrgetter
+from typing import Any, Callable, List, Optional, Dict, Sequence, Tuple
 
 HIERARCHY_MAP: Dict[str, Sequence[str]] = {
     'person': (),
@@ -34,12 +34,28 @@ PLURALS = {'person': 'people', 'booking': 'bookings', 'charge': 'charges',
 
 
 class IngestObject:
-    """Abstract base class for all the objects contained by IngestInfo"""
+    """Abstract base class for all the objects contained by IngestInfo.
+
+    Subclasses declare their fields in __slots__, in the order they should be
+    printed. Slots keep large, long-lived IngestInfo graphs compact and make
+    assigning to an unknown field an AttributeError.
+    """
+
+    __slots__: Tuple[str, ...] = ()
+    _field_getter: Callable[['IngestObject'], Any]
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Reads every field in one C-level call, used by __eq__ and friends.
+        cls._field_getter = attrgetter(*cls.__slots__)
 
     def __eq__(self, other):
-        if other is None:
+        if other is None or type(self) is not type(other):
             return False
-        return self.__dict__ == other.__dict__
+        return field_values(self) == field_values(other)
+
+    # Objects are mutable and compared by value, so they are not hashable.
+    __hash__ = None  # type: ignore
 
     def __bool__(self):
         return to_bool(self)
@@ -50,20 +66,23 @@ class IngestObject:
     def __repr__(self):
         return to_repr(self)
 
-    @abstractmethod
-    def __setattr__(self, key, value):
-        """Implement using restricted_setattr"""
+    def __setattr__(self, name, value):
+        restricted_setattr(self, name, value)
+
+    def prune(self):
+        """Removes empty children, in place. Objects without children have
+        nothing to prune."""
+        return self
 
 
 class IngestInfo(IngestObject):
     """Class for information about multiple people."""
 
+    __slots__ = ('people',)
+
     def __init__(self, people=None):
         self.people: List[Person] = people or []
 
-    def __setattr__(self, name, value):
-        restricted_setattr(self, 'people', name, value)
-
     def create_person(self, **kwargs) -> 'Person':
         person = Person(**kwargs)
         self.people.append(person)
@@ -75,7 +94,7 @@ class IngestInfo(IngestObject):
         return None
 
     def prune(self) -> 'IngestInfo':
-        self.people = [person.prune() for person in self.people if person]
+        prune_list(self.people)
         return self
 
     def get_all_people(self, predicate=lambda _: True) -> List['Person']:
@@ -111,6 +130,11 @@ class Person(IngestObject):
     Referenced from IngestInfo.
     """
 
+    __slots__ = (
+        'person_id', 'surname', 'given_names', 'middle_names', 'full_name',
+        'birthdate', 'gender', 'age', 'race', 'ethnicity',
+        'place_of_residence', 'bookings')
+
     def __init__(
             self, person_id=None, full_name=None, surname=None,
             given_names=None, middle_names=None, birthdate=None,
@@ -131,9 +155,6 @@ class Person(IngestObject):
 
         self.bookings: List[Booking] = bookings or []
 
-    def __setattr__(self, name, value):
-        restricted_setattr(self, 'bookings', name, value)
-
     def create_booking(self, **kwargs) -> 'Booking':
         booking = Booking(**kwargs)
         self.bookings.append(booking)
@@ -145,8 +166,7 @@ class Person(IngestObject):
         return None
 
     def prune(self) -> 'Person':
-        self.bookings = [booking.prune() \
-                         for booking in self.bookings if booking]
+        prune_list(self.bookings)
         return self
 
 
@@ -155,6 +175,12 @@ class Booking(IngestObject):
     Referenced from Person.
     """
 
+    __slots__ = (
+        'booking_id', 'admission_date', 'admission_reason',
+        'projected_release_date', 'release_date', 'release_reason',
+        'custody_status', 'facility', 'classification', 'total_bond_amount',
+        'arrest', 'charges', 'holds')
+
     def __init__(
             self, booking_id=None, admission_date=None,
             admission_reason=None, projected_release_date=None,
@@ -176,9 +202,6 @@ class Booking(IngestObject):
         self.charges: List[Charge] = charges or []
         self.holds: List[Hold] = holds or []
 
-    def __setattr__(self, name, value):
-        restricted_setattr(self, 'holds', name, value)
-
     def create_arrest(self, **kwargs) -> 'Arrest':
         self.arrest = Arrest(**kwargs)
         return self.arrest
@@ -207,9 +230,9 @@ class Booking(IngestObject):
         return self.arrest
 
     def prune(self) -> 'Booking':
-        self.charges = [charge.prune() for charge in self.charges if charge]
-        self.holds = [hold for hold in self.holds if hold]
-        if not self.arrest:
+        prune_list(self.charges)
+        prune_list(self.holds)
+        if self.arrest is not None and not is_pruned_nonempty(self.arrest):
             self.arrest = None
         return self
 
@@ -219,6 +242,10 @@ class Arrest(IngestObject):
     Referenced from Booking.
     """
 
+    __slots__ = (
+        'arrest_id', 'arrest_date', 'location', 'officer_name', 'officer_id',
+        'agency')
+
     def __init__(
             self, arrest_id=None, arrest_date=None, location=None,
             officer_name=None, officer_id=None, agency=None):
@@ -229,15 +256,18 @@ class Arrest(IngestObject):
         self.officer_id: Optional[str] = officer_id
         self.agency: Optional[str] = agency
 
-    def __setattr__(self, name, value):
-        restricted_setattr(self, 'agency', name, value)
-
 
 class Charge(IngestObject):
     """Class for information about a charge.
     Referenced from Booking.
     """
 
+    __slots__ = (
+        'charge_id', 'offense_date', 'statute', 'name', 'attempted', 'degree',
+        'charge_class', 'level', 'fee_dollars', 'charging_entity', 'status',
+        'number_of_counts', 'court_type', 'case_number', 'next_court_date',
+        'judge_name', 'charge_notes', 'bond', 'sentence')
+
     def __init__(
             self, charge_id=None, offense_date=None, statute=None,
             name=None, attempted=None, degree=None,
@@ -267,9 +297,6 @@ class Charge(IngestObject):
         self.bond: Optional[Bond] = bond
         self.sentence: Optional[Sentence] = sentence
 
-    def __setattr__(self, name, value):
-        restricted_setattr(self, 'sentence', name, value)
-
     def create_bond(self, **kwargs) -> 'Bond':
         self.bond = Bond(**kwargs)
         return self.bond
@@ -285,9 +312,10 @@ class Charge(IngestObject):
         return self.sentence
 
     def prune(self) -> 'Charge':
-        if not self.bond:
+        if self.bond is not None and not is_pruned_nonempty(self.bond):
             self.bond = None
-        if not self.sentence:
+        if self.sentence is not None and \
+                not is_pruned_nonempty(self.sentence):
             self.sentence = None
         return self
 
@@ -297,20 +325,22 @@ class Hold(IngestObject):
     Referenced from Booking.
     """
 
+    __slots__ = ('hold_id', 'jurisdiction_name', 'status')
+
     def __init__(self, hold_id=None, jurisdiction_name=None, status=None):
         self.hold_id: Optional[str] = hold_id
         self.jurisdiction_name: Optional[str] = jurisdiction_name
         self.status: Optional[str] = status
 
-    def __setattr__(self, name, value):
-        restricted_setattr(self, 'status', name, value)
-
 
 class Bond(IngestObject):
     """Class for information about a bond.
     Referenced from Charge.
     """
 
+    __slots__ = (
+        'bond_id', 'amount', 'bond_type', 'bond_agent', 'status')
+
     def __init__(
             self, bond_id=None, amount=None, bond_type=None, status=None,
             bond_agent=None):
@@ -320,15 +350,17 @@ class Bond(IngestObject):
         self.bond_agent: Optional[str] = bond_agent
         self.status: Optional[str] = status
 
-    def __setattr__(self, name, value):
-        restricted_setattr(self, 'status', name, value)
-
 
 class Sentence(IngestObject):
     """Class for information about a sentence.
     Referenced from Charge.
     """
 
+    __slots__ = (
+        'sentence_id', 'status', 'sentencing_region', 'min_length',
+        'max_length', 'is_life', 'is_probation', 'is_suspended',
+        'fine_dollars', 'parole_possible', 'post_release_supervision_length')
+
     def __init__(
             self, sentence_id=None, status=None,
             sentencing_region=None, min_length=None, max_length=None,
@@ -349,18 +381,54 @@ class Sentence(IngestObject):
         self.post_release_supervision_length: Optional[str] = \
             post_release_supervision_length
 
-    def __setattr__(self, name, value):
-        restricted_setattr(self, 'post_release_supervision_length', name, value)
+
+def field_values(obj) -> Tuple:
+    """Returns the values of all fields on |obj|, in __slots__ order."""
+    # pylint: disable=protected-access
+    values = obj._field_getter(obj)
+    return values if len(obj.__slots__) > 1 else (values,)
+
+
+def field_items(obj):
+    """Returns (field name, value) pairs for |obj|, in __slots__ order."""
+    return zip(obj.__slots__, field_values(obj))
+
+
+def prune_list(objs: List) -> None:
+    """Prunes every object in |objs| and removes the ones left empty.
+
+    Objects are compacted in place, so the list is never reallocated and is
+    left untouched when nothing is removed.
+    """
+    kept = 0
+    for obj in objs:
+        if is_pruned_nonempty(obj):
+            objs[kept] = obj
+            kept += 1
+    del objs[kept:]
+
+
+def is_pruned_nonempty(obj) -> bool:
+    """Prunes |obj| and returns whether it still holds any data.
+
+    This is equivalent to to_bool after pruning, but because pruned children
+    are never empty it doesn't need to recurse into them again.
+    """
+    obj.prune()
+    for v in field_values(obj):
+        if isinstance(v, IngestObject) or v:
+            return True
+    return False
 
 
 def to_bool(obj):
     return any(any(v) if isinstance(v, list) else v
-               for v in obj.__dict__.values())
+               for v in field_values(obj))
 
 
 def to_string(obj):
     out = [obj.__class__.__name__ + ":"]
-    for key, val in vars(obj).items():
+    for key, val in field_items(obj):
         if isinstance(val, list):
             for index, elem in enumerate(val):
                 out += '{}[{}]: {}'.format(key, index, elem).split('\n')
@@ -371,17 +439,18 @@ def to_string(obj):
 
 def to_repr(obj):
     args = []
-    for key, val in vars(obj).items():
+    for key, val in field_items(obj):
         if val:
             args.append('{}={}'.format(key, repr(val)))
 
     return '{}({})'.format(obj.__class__.__name__, ', '.join(args))
 
 
-def restricted_setattr(self, last_field, name, value):
+def restricted_setattr(self, name, value):
     if isinstance(value, str) and (value == '' or value.isspace()):
         value = None
-    if hasattr(self, last_field) and not hasattr(self, name):
+    try:
+        object.__setattr__(self, name, value)
+    except AttributeError:
         raise AttributeError('No field {} in object {}'.format(name,
                                                                type(self)))
-    self.__dict__[name] = value
@@ -14,36 +14,91 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # =============================================================================
-"""Human-readable diffs for IngestInfo."""
+"""Human-readable diffs for IngestInfo.
 
-from deepdiff import DeepDiff
+Rather than diffing arbitrary objects, this walks the known IngestInfo
+hierarchy (people -> bookings -> charges -> bonds/sentences). Children are
+aligned by their id when one is set and by position otherwise, so reordered
+or inserted children don't cascade into spurious field changes.
+"""
 
+from collections import defaultdict, deque
+from typing import Deque, Dict, Iterator, List, Optional
 
-def diff_ingest_infos(expected, actual):
+from recidiviz.ingest.models.ingest_info import IngestObject
+
+
+def diff_ingest_infos(expected, actual) -> List[str]:
     """Returns a list of formatted strings describing the differences between
     two IngestInfo objects."""
-    ddiff = DeepDiff(expected, actual)
-    differences = []
-
-    for diff_type, diffs in ddiff.items():
-        if diff_type in ('values_changed', 'type_changes'):
-            # DeepDiff's equality is stricter than ours, so ignore differences
-            # where the values are ==.
-            differences.extend(_format_change(location,
-                                              repr(change['old_value']),
-                                              repr(change['new_value']))
-                               for location, change in diffs.items() if
-                               change['old_value'] != change['new_value'])
-        elif diff_type == 'iterable_item_removed':
-            differences.extend(_format_remove(location, item)
-                               for location, item in diffs.items())
-        elif diff_type == 'iterable_item_added':
-            differences.extend(_format_add(location, item)
-                               for location, item in diffs.items())
+    return list(_diff_objects('root', expected, actual))
+
+
+def ingest_infos_differ(expected, actual) -> bool:
+    """Returns whether two IngestInfo objects differ, stopping at the first
+    difference found. Suitable for change detection between scrapes."""
+    return any(True for _ in _diff_objects('root', expected, actual))
+
+
+def _diff_objects(location: str, expected, actual) -> Iterator[str]:
+    if expected is actual:
+        return
+    if not isinstance(expected, IngestObject) \
+            or type(expected) is not type(actual):
+        if expected != actual:
+            yield _format_change(location, repr(expected), repr(actual))
+        return
+
+    for field in expected.__slots__:
+        field_location = '{}.{}'.format(location, field)
+        old = getattr(expected, field)
+        new = getattr(actual, field)
+        if isinstance(old, list) and isinstance(new, list):
+            yield from _diff_lists(field_location, old, new)
+        elif isinstance(old, IngestObject):
+            yield from _diff_objects(field_location, old, new)
+        elif old != new:
+            yield _format_change(field_location, repr(old), repr(new))
+
+
+def _diff_lists(location: str, expected: List, actual: List) -> Iterator[str]:
+    """Pairs up children with the same id, in order when several share an id,
+    then the remaining children without ids in order, and diffs each pair."""
+    actual_by_id: Dict[str, Deque[int]] = defaultdict(deque)
+    actual_without_ids: Deque[int] = deque()
+    for j, obj in enumerate(actual):
+        obj_id = _get_id(obj)
+        if obj_id is not None:
+            actual_by_id[obj_id].append(j)
         else:
-            raise ValueError('Unexpected diff value: {}'.format(diff_type))
+            actual_without_ids.append(j)
+
+    removed = []
+    for i, old in enumerate(expected):
+        obj_id = _get_id(old)
+        indices = actual_by_id[obj_id] if obj_id is not None \
+            else actual_without_ids
+        if not indices:
+            removed.append(i)
+            continue
+        yield from _diff_objects('{}[{}]'.format(location, i), old,
+                                 actual[indices.popleft()])
+
+    for i in removed:
+        yield _format_remove('{}[{}]'.format(location, i), expected[i])
+    added = list(actual_without_ids)
+    for indices in actual_by_id.values():
+        added.extend(indices)
+    for j in sorted(added):
+        yield _format_add('{}[{}]'.format(location, j), actual[j])
+
 
-    return differences
+def _get_id(obj) -> Optional[str]:
+    """Returns the <class>_id field of |obj|, e.g. booking_id for a Booking,
+    if it has one."""
+    if not isinstance(obj, IngestObject):
+        return None
+    return getattr(obj, type(obj).__name__.lower() + '_id', None)
 
 
 def _format_change(location, old, new):
@@ -47,7 +47,7 @@ from lxml.etree import XMLSyntaxError  # pylint:disable=no-name-in-module
 
 from recidiviz.common.constants.enum_overrides import EnumOverrides
 from recidiviz.common.ingest_metadata import IngestMetadata
-from recidiviz.ingest.scrape import constants, ingest_utils
+from recidiviz.ingest.scrape import constants
 from recidiviz.ingest.models.ingest_info import IngestInfo
 from recidiviz.ingest.scrape.scraper import Scraper
 from recidiviz.ingest.scrape.task_params import QueueRequest, ScrapedData, Task
@@ -233,9 +233,7 @@ class BaseScraper(Scraper):
             metadata = IngestMetadata(self.region.region_code,
                                       request.scraper_start_time,
                                       self.get_enum_overrides())
-            persistence.write(
-                ingest_utils.convert_ingest_info_to_proto(
-                    scraped_data.ingest_info), metadata)
+            persistence.write(scraped_data.ingest_info, metadata)
         return None
 
     def is_initial_task(self, task_type):
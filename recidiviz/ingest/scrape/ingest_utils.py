@@ -19,7 +19,7 @@
 
 import logging
 from datetime import tzinfo
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional
 
 from google.protobuf import json_format
 import pytz
@@ -29,6 +29,18 @@ from recidiviz.ingest.models import ingest_info, ingest_info_pb2
 from recidiviz.ingest.scrape import constants
 from recidiviz.utils import environment, regions
 
+_PERSON = ingest_info_pb2.Person.DESCRIPTOR
+_BOOKING = ingest_info_pb2.Booking.DESCRIPTOR
+_ARREST = ingest_info_pb2.Arrest.DESCRIPTOR
+_CHARGE = ingest_info_pb2.Charge.DESCRIPTOR
+_HOLD = ingest_info_pb2.Hold.DESCRIPTOR
+_BOND = ingest_info_pb2.Bond.DESCRIPTOR
+_SENTENCE = ingest_info_pb2.Sentence.DESCRIPTOR
+
+# Descriptor full name -> names of the fields copied between protos and
+# python objects. Built once per message type instead of once per object.
+_COPY_PLANS: Dict[str, FrozenSet[str]] = {}
+
 
 def lookup_timezone(timezone: Optional[str]) -> Optional[tzinfo]:
     return pytz.timezone(timezone) if timezone else None
@@ -105,36 +117,37 @@ def convert_ingest_info_to_proto(
         ingest_info_py: ingest_info.IngestInfo) -> ingest_info_pb2.IngestInfo:
     """Converts an ingest_info python object to an ingest info proto.
 
+    The object graph is first flattened into the fields of each proto to
+    create, and the protos of each type are then created together.
+
     Args:
         ingest_info: An IngestInfo python object
     Returns:
         An IngestInfo proto.
     """
-    proto = ingest_info_pb2.IngestInfo()
-
-    person_map: Dict[str, ingest_info.Person] = {}
-    booking_map: Dict[str, ingest_info.Booking] = {}
-    charge_map: Dict[str, ingest_info.Charge] = {}
-    hold_map: Dict[str, ingest_info.Hold] = {}
-    arrest_map: Dict[str, ingest_info.Arrest] = {}
-    bond_map: Dict[str, ingest_info.Bond] = {}
-    sentence_map: Dict[str, ingest_info.Sentence] = {}
-
-    def _populate_proto(proto_name, ingest_info_source, id_name, proto_map):
-        """Populates all of the proto fields from an IngestInfo object.
+    person_map: Dict[str, Dict[str, Any]] = {}
+    booking_map: Dict[str, Dict[str, Any]] = {}
+    charge_map: Dict[str, Dict[str, Any]] = {}
+    hold_map: Dict[str, Dict[str, Any]] = {}
+    arrest_map: Dict[str, Dict[str, Any]] = {}
+    bond_map: Dict[str, Dict[str, Any]] = {}
+    sentence_map: Dict[str, Dict[str, Any]] = {}
+
+    def _proto_fields(ingest_info_source, descriptor, id_name, proto_map):
+        """Returns the id and the fields of the proto to create for an
+        IngestInfo object.
 
         Args:
-            proto_name: The name of the proto we are populating, like 'people',
-                'arrests', etc...
             ingest_info_source: The source object we are copying from
+            descriptor: The descriptor of the proto we will create.
             id_name: The name of the id, is 'person_id', 'arrest_id', etc...
                 This is used to decide whether or not to generate a new proto,
                 use the given id, or generate a new one
-            proto_map: A map of protos we have already created to know whether
-                we need to go ahead creating one or if we can just return
-                the already created one.
+            proto_map: A map of proto fields we have already collected to know
+                whether we need to go ahead collecting them or if we can just
+                return the already collected ones.
         Returns:
-            A populated proto
+            A tuple of the object id and a dict of proto field values
         """
         obj_id = getattr(ingest_info_source, id_name)
         if not obj_id:
@@ -145,51 +158,51 @@ def convert_ingest_info_to_proto(
         # simpler for external people to read it.  If we decide that no one
         # but us will ever read the proto then we can remove this logic here
         # and use the built in proto map.
-        if obj_id in proto_map:
-            return proto_map[obj_id]
-
-        proto_to_populate = getattr(proto, proto_name).add()
-        setattr(proto_to_populate, id_name, obj_id)
-        _copy_fields(ingest_info_source, proto_to_populate,
-                     proto_to_populate.DESCRIPTOR)
-
-        proto_map[obj_id] = proto_to_populate
-        return proto_to_populate
+        if obj_id not in proto_map:
+            fields = _py_fields(ingest_info_source, descriptor)
+            fields[id_name] = obj_id
+            proto_map[obj_id] = fields
+        return obj_id, proto_map[obj_id]
 
     for person in ingest_info_py.people:
-        proto_person = _populate_proto(
-            'people', person, 'person_id', person_map)
+        _, proto_person = _proto_fields(
+            person, _PERSON, 'person_id', person_map)
         for booking in person.bookings:
-            proto_booking = _populate_proto(
-                'bookings', booking, 'booking_id', booking_map)
+            booking_id, proto_booking = _proto_fields(
+                booking, _BOOKING, 'booking_id', booking_map)
             # Can safely append the ids now since they should be unique.
-            proto_person.booking_ids.append(proto_booking.booking_id)
+            proto_person.setdefault('booking_ids', []).append(booking_id)
 
             if booking.arrest:
-                proto_arrest = _populate_proto(
-                    'arrests', booking.arrest, 'arrest_id', arrest_map)
-                proto_booking.arrest_id = proto_arrest.arrest_id
+                proto_booking['arrest_id'], _ = _proto_fields(
+                    booking.arrest, _ARREST, 'arrest_id', arrest_map)
 
             for hold in booking.holds:
-                proto_hold = _populate_proto('holds', hold, 'hold_id', hold_map)
-                proto_booking.hold_ids.append(proto_hold.hold_id)
+                hold_id, _ = _proto_fields(hold, _HOLD, 'hold_id', hold_map)
+                proto_booking.setdefault('hold_ids', []).append(hold_id)
 
             for charge in booking.charges:
-                proto_charge = _populate_proto(
-                    'charges', charge, 'charge_id', charge_map)
-                proto_booking.charge_ids.append(proto_charge.charge_id)
+                charge_id, proto_charge = _proto_fields(
+                    charge, _CHARGE, 'charge_id', charge_map)
+                proto_booking.setdefault('charge_ids', []).append(charge_id)
 
                 if charge.bond:
-                    proto_bond = _populate_proto(
-                        'bonds', charge.bond, 'bond_id', bond_map)
-                    proto_charge.bond_id = proto_bond.bond_id
+                    proto_charge['bond_id'], _ = _proto_fields(
+                        charge.bond, _BOND, 'bond_id', bond_map)
 
                 if charge.sentence:
-                    proto_sentence = _populate_proto(
-                        'sentences', charge.sentence,
-                        'sentence_id', sentence_map)
-                    proto_charge.sentence_id = proto_sentence.sentence_id
+                    proto_charge['sentence_id'], _ = _proto_fields(
+                        charge.sentence, _SENTENCE, 'sentence_id',
+                        sentence_map)
 
+    proto = ingest_info_pb2.IngestInfo()
+    _add_protos(proto.people, person_map.values())
+    _add_protos(proto.bookings, booking_map.values())
+    _add_protos(proto.arrests, arrest_map.values())
+    _add_protos(proto.charges, charge_map.values())
+    _add_protos(proto.holds, hold_map.values())
+    _add_protos(proto.bonds, bond_map.values())
+    _add_protos(proto.sentences, sentence_map.values())
     return proto
 
 
@@ -197,27 +210,20 @@ def convert_proto_to_ingest_info(
         proto: ingest_info_pb2.IngestInfo) -> ingest_info.IngestInfo:
     """Populates an `IngestInfo` python object from the given proto """
 
-    person_map: Dict[str, ingest_info.Person] = \
-        dict(_proto_to_py(person, ingest_info.Person, 'person_id')
-             for person in proto.people)
-    booking_map: Dict[str, ingest_info.Booking] = \
-        dict(_proto_to_py(booking, ingest_info.Booking, 'booking_id')
-             for booking in proto.bookings)
-    charge_map: Dict[str, ingest_info.Charge] = \
-        dict(_proto_to_py(charge, ingest_info.Charge, 'charge_id')
-             for charge in proto.charges)
-    hold_map: Dict[str, ingest_info.Hold] = \
-        dict(_proto_to_py(hold, ingest_info.Hold, 'hold_id')
-             for hold in proto.holds)
-    arrest_map: Dict[str, ingest_info.Arrest] = \
-        dict(_proto_to_py(arrest, ingest_info.Arrest, 'arrest_id')
-             for arrest in proto.arrests)
-    bond_map: Dict[str, ingest_info.Bond] = \
-        dict(_proto_to_py(bond, ingest_info.Bond, 'bond_id')
-             for bond in proto.bonds)
-    sentence_map: Dict[str, ingest_info.Sentence] = \
-        dict(_proto_to_py(sentence, ingest_info.Sentence, 'sentence_id')
-             for sentence in proto.sentences)
+    person_map: Dict[str, ingest_info.Person] = _protos_to_py(
+        proto.people, _PERSON, ingest_info.Person, 'person_id')
+    booking_map: Dict[str, ingest_info.Booking] = _protos_to_py(
+        proto.bookings, _BOOKING, ingest_info.Booking, 'booking_id')
+    charge_map: Dict[str, ingest_info.Charge] = _protos_to_py(
+        proto.charges, _CHARGE, ingest_info.Charge, 'charge_id')
+    hold_map: Dict[str, ingest_info.Hold] = _protos_to_py(
+        proto.holds, _HOLD, ingest_info.Hold, 'hold_id')
+    arrest_map: Dict[str, ingest_info.Arrest] = _protos_to_py(
+        proto.arrests, _ARREST, ingest_info.Arrest, 'arrest_id')
+    bond_map: Dict[str, ingest_info.Bond] = _protos_to_py(
+        proto.bonds, _BOND, ingest_info.Bond, 'bond_id')
+    sentence_map: Dict[str, ingest_info.Sentence] = _protos_to_py(
+        proto.sentences, _SENTENCE, ingest_info.Sentence, 'sentence_id')
 
     # Wire bonds and sentences to respective charges
     for proto_charge in proto.charges:
@@ -248,32 +254,52 @@ def convert_proto_to_ingest_info(
     ii.people.extend(person_map.values())
     return ii
 
-def _proto_to_py(proto, py_type, id_name):
-    py_obj = py_type()
-    _copy_fields(proto, py_obj, proto.DESCRIPTOR)
 
-    obj_id = getattr(proto, id_name)
-    if not common_utils.is_generated_id(obj_id):
-        setattr(py_obj, id_name, obj_id)
+def _get_copy_plan(descriptor) -> FrozenSet[str]:
+    """Returns the names of all fields except ids on |descriptor|."""
+    plan = _COPY_PLANS.get(descriptor.full_name)
+    if plan is None:
+        plan = frozenset(
+            field.name for field in descriptor.fields
+            if not (field.name.endswith('id') or field.name.endswith('ids')))
+        _COPY_PLANS[descriptor.full_name] = plan
+    return plan
 
-    return obj_id, py_obj
 
-
-def _copy_fields(source, dest, descriptor):
-    """Copies all fields except ids from the source to the destination
-
-    Since we expect all of the fields to exist in both the destination
-    and the source, we can just run through all of the fields in the proto
-    and use python magic to retrieve the value from the source and set
-    them on the destination.
-    """
-    field_names = [i.name for i in descriptor.fields]
-    for field in field_names:
-        if field.endswith('id') or field.endswith('ids'):
-            continue
+def _py_fields(source: ingest_info.IngestObject,
+               descriptor) -> Dict[str, Any]:
+    """Returns all set fields except ids of |source| as a dict, keyed by the
+    field names of |descriptor|."""
+    fields = {}
+    for field in _get_copy_plan(descriptor):
         val = getattr(source, field, None)
         if val is not None:
-            setattr(dest, field, val)
+            fields[field] = val
+    return fields
+
+
+def _add_protos(repeated_field, all_fields: Iterable[Dict[str, Any]]) -> None:
+    """Appends one proto to |repeated_field| for each dict of field values."""
+    for fields in all_fields:
+        repeated_field.add(**fields)
+
+
+def _protos_to_py(protos, descriptor, py_type, id_name) -> Dict[str, Any]:
+    """Converts all |protos| of one type to |py_type| objects, keyed by the
+    proto id."""
+    plan = _get_copy_plan(descriptor)
+    py_objs = {}
+    for proto in protos:
+        py_obj = py_type(**{field.name: value
+                            for field, value in proto.ListFields()
+                            if field.name in plan})
+
+        obj_id = getattr(proto, id_name)
+        if not common_utils.is_generated_id(obj_id):
+            setattr(py_obj, id_name, obj_id)
+
+        py_objs[obj_id] = py_obj
+    return py_objs
 
 
 def ingest_info_to_serializable(ii: ingest_info.IngestInfo) -> Dict[Any, Any]:
@@ -15,59 +15,96 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # ============================================================================
 """Converts scraped IngestInfo data to the persistence layer entity."""
+import abc
+from collections import defaultdict
 from copy import deepcopy
-from typing import List
+from typing import Dict, List, Optional
 
 import more_itertools
 
 from recidiviz.common.constants.charge import ChargeStatus
+from recidiviz.ingest.models import ingest_info as ingest_info_py
 from recidiviz.ingest.models import ingest_info_pb2
 from recidiviz.persistence import entities
 from recidiviz.persistence.converter import arrest, sentence, \
     charge, bond, booking, person, hold
-from recidiviz.persistence.converter.converter_utils import fn, \
+from recidiviz.persistence.converter.converter_utils import fn, has_field, \
     parse_bond_amount_and_check_for_type_and_status_info, parse_int
 
 
 def convert(ingest_info, metadata):
-    """Convert an IngestInfo proto into a persistence layer entity.
+    """Convert an IngestInfo proto or python object into a persistence layer
+    entity.
+
+    Python IngestInfo objects are converted directly, without first being
+    copied into a proto.
 
     Returns:
         A list of entities.Person
     """
-    return _Converter(ingest_info, metadata).convert()
+    if isinstance(ingest_info, ingest_info_py.IngestInfo):
+        return _IngestInfoConverter(ingest_info, metadata).convert()
+    return _ProtoConverter(ingest_info, metadata).convert()
+
 
+class _Converter(metaclass=abc.ABCMeta):
+    """Converts between ingest_info objects and persistence layer entity.
 
-class _Converter:
-    """Converts between ingest_info objects and persistence layer entity."""
+    Subclasses provide access to the children of each ingest_info object.
+    """
 
     def __init__(self, ingest_info, metadata):
         self.ingest_info = ingest_info
         self.metadata = metadata
 
-        self.bookings = {b.booking_id: b for b in ingest_info.bookings}
-        self.arrests = {a.arrest_id: a for a in ingest_info.arrests}
-        self.charges = {c.charge_id: c for c in ingest_info.charges}
-        self.holds = {h.hold_id: h for h in ingest_info.holds}
-        self.bonds = {b.bond_id: b for b in ingest_info.bonds}
-        self.sentences = {s.sentence_id: s for s in ingest_info.sentences}
-
     def convert(self):
-        return [self._convert_person(p) for p in self.ingest_info.people]
+        return [self._convert_person(p) for p in self._get_people()]
+
+    @abc.abstractmethod
+    def _get_people(self):
+        """Returns the ingest_info Person objects to convert."""
+
+    @abc.abstractmethod
+    def _get_bookings(self, ingest_person):
+        """Returns the ingest_info Bookings of |ingest_person|."""
+
+    @abc.abstractmethod
+    def _get_arrest(self, ingest_booking):
+        """Returns the ingest_info Arrest of |ingest_booking|, if any."""
+
+    @abc.abstractmethod
+    def _get_holds(self, ingest_booking):
+        """Returns the ingest_info Holds of |ingest_booking|."""
+
+    @abc.abstractmethod
+    def _get_charges(self, ingest_booking):
+        """Returns the ingest_info Charges of |ingest_booking|."""
+
+    @abc.abstractmethod
+    def _get_bond(self, ingest_charge):
+        """Returns the ingest_info Bond of |ingest_charge|, if any."""
+
+    @abc.abstractmethod
+    def _get_sentence(self, ingest_charge):
+        """Returns the ingest_info Sentence of |ingest_charge|, if any."""
+
+    @abc.abstractmethod
+    def _new_booking(self):
+        """Returns an empty ingest_info Booking to house inferred data."""
 
     def _convert_person(self, ingest_person):
-        """Converts an ingest_info proto Person to a persistence entity."""
+        """Converts an ingest_info Person to a persistence entity."""
         person_builder = entities.Person.builder()
 
         person.copy_fields_to_builder(
             person_builder, ingest_person, self.metadata)
 
-        converted_bookings = [self._convert_booking(self.bookings[booking_id])
-                              for booking_id in ingest_person.booking_ids]
+        converted_bookings = [self._convert_booking(b)
+                              for b in self._get_bookings(ingest_person)]
 
         # If no bookings were ingested, create booking to house inferred data.
         if not converted_bookings:
-            inferred_booking = self._convert_booking(ingest_info_pb2.Booking())
+            inferred_booking = self._convert_booking(self._new_booking())
             converted_bookings = [inferred_booking]
 
         person_builder.bookings = converted_bookings
@@ -75,23 +112,23 @@ class _Converter:
         return person_builder.build()
 
     def _convert_booking(self, ingest_booking):
-        """Converts an ingest_info proto Booking to a persistence entity."""
+        """Converts an ingest_info Booking to a persistence entity."""
         booking_builder = entities.Booking.builder()
 
         booking.copy_fields_to_builder(booking_builder, ingest_booking,
                                        self.metadata)
 
+        ingest_arrest = self._get_arrest(ingest_booking)
         booking_builder.arrest = \
-            fn(lambda i: arrest.convert(self.arrests[i]),
-               'arrest_id', ingest_booking)
+            arrest.convert(ingest_arrest) if ingest_arrest is not None else None
 
         converted_holds = [
-            hold.convert(self.holds[hold_id], self.metadata) for hold_id in
-            ingest_booking.hold_ids]
+            hold.convert(ingest_hold, self.metadata) for ingest_hold in
+            self._get_holds(ingest_booking)]
         booking_builder.holds = list(
             more_itertools.unique_everseen(converted_holds))
 
-        ingest_charges = [self.charges[c] for c in ingest_booking.charge_ids]
+        ingest_charges = self._get_charges(ingest_booking)
         charges = self._convert_charges(ingest_charges)
         booking_builder.charges = charges
 
@@ -108,7 +145,7 @@ class _Converter:
         return booking_builder.build()
 
     def _convert_charges(self, ingest_charges) -> List[entities.Charge]:
-        """Converts all ingest_info proto Charges to persistence entity Charges.
+        """Converts all ingest_info Charges to persistence entity Charges.
 
         When charges.number_of_counts is set, create duplicate charges for the
         persistence entity.
@@ -117,29 +154,169 @@ class _Converter:
         for ingest_charge in ingest_charges:
             new_charge = self._convert_charge(ingest_charge)
             number_of_counts = parse_int(ingest_charge.number_of_counts) if \
-                ingest_charge.HasField('number_of_counts') else 1
+                has_field(ingest_charge, 'number_of_counts') else 1
             charges.extend(number_of_counts * [new_charge])
 
         return charges
 
     def _convert_charge(self, ingest_charge):
-        """Converts an ingest_info proto Charge to a persistence entity."""
+        """Converts an ingest_info Charge to a persistence entity."""
         charge_builder = entities.Charge.builder()
 
         charge.copy_fields_to_builder(charge_builder, ingest_charge,
                                       self.metadata)
 
-        charge_builder.bond = \
-            fn(lambda i: bond.convert(self.bonds[i], self.metadata),
-               'bond_id',
-               ingest_charge)
+        ingest_bond = self._get_bond(ingest_charge)
+        charge_builder.bond = bond.convert(ingest_bond, self.metadata) \
+            if ingest_bond is not None else None
+        ingest_sentence = self._get_sentence(ingest_charge)
         charge_builder.sentence = \
-            fn(lambda i: sentence.convert(self.sentences[i], self.metadata),
-               'sentence_id', ingest_charge)
+            sentence.convert(ingest_sentence, self.metadata) \
+            if ingest_sentence is not None else None
 
         return charge_builder.build()
 
 
+class _ProtoConverter(_Converter):
+    """Converts an IngestInfo proto to persistence layer entities."""
+
+    def __init__(self, ingest_info, metadata):
+        super().__init__(ingest_info, metadata)
+
+        self.bookings = {b.booking_id: b for b in ingest_info.bookings}
+        self.arrests = {a.arrest_id: a for a in ingest_info.arrests}
+        self.charges = {c.charge_id: c for c in ingest_info.charges}
+        self.holds = {h.hold_id: h for h in ingest_info.holds}
+        self.bonds = {b.bond_id: b for b in ingest_info.bonds}
+        self.sentences = {s.sentence_id: s for s in ingest_info.sentences}
+
+    def _get_people(self):
+        return self.ingest_info.people
+
+    def _get_bookings(self, ingest_person):
+        return [self.bookings[booking_id]
+                for booking_id in ingest_person.booking_ids]
+
+    def _get_arrest(self, ingest_booking):
+        return fn(lambda i: self.arrests[i], 'arrest_id', ingest_booking)
+
+    def _get_holds(self, ingest_booking):
+        return [self.holds[hold_id] for hold_id in ingest_booking.hold_ids]
+
+    def _get_charges(self, ingest_booking):
+        return [self.charges[c] for c in ingest_booking.charge_ids]
+
+    def _get_bond(self, ingest_charge):
+        return fn(lambda i: self.bonds[i], 'bond_id', ingest_charge)
+
+    def _get_sentence(self, ingest_charge):
+        return fn(lambda i: self.sentences[i], 'sentence_id', ingest_charge)
+
+    def _new_booking(self):
+        return ingest_info_pb2.Booking()
+
+
+class _IngestInfoConverter(_Converter):
+    """Converts a python IngestInfo object to persistence layer entities
+    without the intermediate copy into an IngestInfo proto.
+
+    Objects that share an id are merged exactly as
+    ingest_utils.convert_ingest_info_to_proto merges them: the fields of the
+    first object seen with an id are used, and the children of every object
+    with that id are attached to it.
+    """
+
+    def __init__(self, ingest_info, metadata):
+        super().__init__(ingest_info, metadata)
+
+        self.people: List[ingest_info_py.Person] = []
+        self.child_bookings: Dict[int, List[ingest_info_py.Booking]] = \
+            defaultdict(list)
+        self.child_arrest: Dict[int, ingest_info_py.Arrest] = {}
+        self.child_holds: Dict[int, List[ingest_info_py.Hold]] = \
+            defaultdict(list)
+        self.child_charges: Dict[int, List[ingest_info_py.Charge]] = \
+            defaultdict(list)
+        self.child_bond: Dict[int, ingest_info_py.Bond] = {}
+        self.child_sentence: Dict[int, ingest_info_py.Sentence] = {}
+
+        self._index(ingest_info)
+
+    def _index(self, ingest_info):
+        """Resolves every object in |ingest_info| to the first object sharing
+        its id, and records the children of each resolved object."""
+        seen_people: Dict = {}
+        seen_bookings: Dict = {}
+        seen_arrests: Dict = {}
+        seen_holds: Dict = {}
+        seen_charges: Dict = {}
+        seen_bonds: Dict = {}
+        seen_sentences: Dict = {}
+
+        for ingest_person in ingest_info.people:
+            new_person = _first_with_id(ingest_person, 'person_id',
+                                        seen_people)
+            if new_person is ingest_person:
+                self.people.append(new_person)
+            for ingest_booking in ingest_person.bookings:
+                new_booking = _first_with_id(ingest_booking, 'booking_id',
+                                             seen_bookings)
+                self.child_bookings[id(new_person)].append(new_booking)
+
+                if ingest_booking.arrest:
+                    self.child_arrest[id(new_booking)] = _first_with_id(
+                        ingest_booking.arrest, 'arrest_id', seen_arrests)
+
+                for ingest_hold in ingest_booking.holds:
+                    self.child_holds[id(new_booking)].append(
+                        _first_with_id(ingest_hold, 'hold_id', seen_holds))
+
+                for ingest_charge in ingest_booking.charges:
+                    new_charge = _first_with_id(ingest_charge, 'charge_id',
+                                                seen_charges)
+                    self.child_charges[id(new_booking)].append(new_charge)
+
+                    if ingest_charge.bond:
+                        self.child_bond[id(new_charge)] = _first_with_id(
+                            ingest_charge.bond, 'bond_id', seen_bonds)
+                    if ingest_charge.sentence:
+                        self.child_sentence[id(new_charge)] = _first_with_id(
+                            ingest_charge.sentence, 'sentence_id',
+                            seen_sentences)
+
+    def _get_people(self):
+        return self.people
+
+    def _get_bookings(self, ingest_person):
+        return self.child_bookings.get(id(ingest_person), [])
+
+    def _get_arrest(self, ingest_booking):
+        return self.child_arrest.get(id(ingest_booking))
+
+    def _get_holds(self, ingest_booking):
+        return self.child_holds.get(id(ingest_booking), [])
+
+    def _get_charges(self, ingest_booking):
+        return self.child_charges.get(id(ingest_booking), [])
+
+    def _get_bond(self, ingest_charge):
+        return self.child_bond.get(id(ingest_charge))
+
+    def _get_sentence(self, ingest_charge):
+        return self.child_sentence.get(id(ingest_charge))
+
+    def _new_booking(self):
+        return ingest_info_py.Booking()
+
+
+def _first_with_id(ingest_object, id_name: str, seen: Dict):
+    """Returns the first object in |seen| with the same id as |ingest_object|,
+    adding |ingest_object| if there is none. Objects without an id are never
+    merged."""
+    obj_id: Optional[str] = getattr(ingest_object, id_name)
+    return seen.setdefault(obj_id or id(ingest_object), ingest_object)
+
+
 def _charges_pointing_to_total_bond(
         bond_amount, bond_type, bond_status, charges):
     """Infers a bond from the total_bond field and creates a copy of all charges
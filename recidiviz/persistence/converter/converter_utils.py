@@ -27,17 +27,26 @@ from recidiviz.common.common_utils import normalize
 from recidiviz.common.constants.bond import \
     BondStatus, BondType, BOND_TYPE_MAP, BOND_STATUS_MAP
 from recidiviz.common.constants.person import Ethnicity, Race
+from recidiviz.ingest.models.ingest_info import IngestObject
 
 locale.setlocale(locale.LC_ALL, 'en_US.UTF-8')
 
 
+def has_field(proto, field_name) -> bool:
+    """Returns whether |field_name| is set on |proto|, which may be either an
+    ingest_info proto or an ingest_info python object."""
+    if isinstance(proto, IngestObject):
+        return getattr(proto, field_name) is not None
+    return proto.HasField(field_name)
+
+
 def fn(func, field_name, proto, *additional_func_args, default=None):
     """Return the result of applying the given function to the field on the
     proto, returning |default| if the proto field is unset or the function
     returns None.
     """
     value = None
-    if proto.HasField(field_name):
+    if has_field(proto, field_name):
         value = func(getattr(proto, field_name), *additional_func_args)
     return value if value is not None else default
 
@@ -51,9 +60,9 @@ def parse_external_id(id_str):
 
 
 def race_is_actually_ethnicity(ingest_person, enum_overrides):
-    if ingest_person.HasField('ethnicity'):
+    if has_field(ingest_person, 'ethnicity'):
         return False
-    if not ingest_person.HasField('race'):
+    if not has_field(ingest_person, 'race'):
         return False
 
     return Ethnicity.can_parse(ingest_person.race, enum_overrides) and \
@@ -21,6 +21,8 @@ from typing import List
 from more_itertools import one
 
 import pandas as pd
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Engine
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.declarative import DeclarativeMeta
 from sqlalchemy.orm import Session
@@ -32,11 +34,25 @@ from recidiviz.common.constants.entity_enum import EntityEnum
 from recidiviz.common.ingest_metadata import IngestMetadata
 from recidiviz.persistence import entities
 from recidiviz.persistence.database import database_utils
-from recidiviz.persistence.database.schema import Person, Booking
+from recidiviz.persistence.database.schema import Person, Booking, \
+    BookingHistory, PersonHistory
 
 
 _DUMMY_BOOKING_ID = -1
 
+# Dialect names to functions returning an INSERT into a table that skips rows
+# conflicting with one of its unique constraints. SQLite's OR IGNORE also
+# skips rows violating e.g. NOT NULL, which write_df would skip anyway.
+_CONFLICT_AWARE_INSERTS = {
+    'postgresql':
+        lambda table: postgresql.insert(table).on_conflict_do_nothing(),
+    'sqlite': lambda table: table.insert().prefix_with('OR IGNORE'),
+}
+
+# SQLite's default limit on the number of parameters in one statement, which
+# is well under Postgres' limit.
+_MAX_STATEMENT_PARAMETERS = 999
+
 
 def read_people(session, full_name=None, birthdate=None):
     """
@@ -129,6 +145,26 @@ def read_people_with_open_bookings_scraped_before_time(session, region, time):
     return [database_utils.convert(person) for person, _ in query.all()]
 
 
+def read_person_ids_changed_since(session, time):
+    """
+    Reads the ids of all people whose person or booking rows have changed
+    since the provided datetime, according to their historical snapshots.
+
+    Args:
+        session: The transaction to read from
+        time: The datetime exclusive lower bound on valid_from to match
+            against
+    Returns:
+        Set of person_ids with a snapshot that became valid after |time|
+    """
+    changed_people = session.query(PersonHistory.person_id) \
+        .filter(PersonHistory.valid_from > time)
+    changed_bookings = session.query(BookingHistory.person_id) \
+        .filter(BookingHistory.valid_from > time)
+    return {person_id for person_id,
+            in changed_people.union(changed_bookings).all()}
+
+
 def _query_people_and_open_bookings(session, region):
     """
     Returns a list of tuples of (person, booking) for all open bookings.
@@ -225,33 +261,91 @@ def _overwrite_dummy_booking_ids(root_people: List[Person]) -> None:
                     charge.sentence.booking_id = booking.booking_id
 
 
-def write_df(table: DeclarativeMeta, df: pd.DataFrame) -> None:
+def write_df(table: DeclarativeMeta, df: pd.DataFrame) -> int:
     """
     Writes the |df| to the |table|.
 
     The column headers on |df| must match the column names in |table|. All rows
     in |df| will be appended to |table|. If a row in |df| already exists in
-    |table|, then that row will be skipped.
+    |table|, i.e. it conflicts with one of the table's unique constraints, then
+    that row will be skipped.
+
+    Rows are written with INSERT ... ON CONFLICT DO NOTHING statements in a
+    single transaction, so skipping existing rows does not cost a transaction
+    per row. Returns the number of rows that were inserted.
     """
+    engine = recidiviz.db_engine
+    if engine is None:
+        raise ValueError('write_df called before the database was set up')
+
+    if engine.dialect.name not in _CONFLICT_AWARE_INSERTS:
+        return _write_df_to_sql(engine, table, df)
+
+    try:
+        inserted = _insert_df_ignoring_conflicts(engine, table, df)
+    except IntegrityError:
+        # Rows can still violate other constraints, e.g. NOT NULL.
+        return _write_df_only_successful_rows(engine, table, df)
+
+    logging.info("Wrote %d rows to %s table, skipped %d existing rows.",
+                 inserted, table.__tablename__, len(df) - inserted)
+    return inserted
+
+
+def _insert_df_ignoring_conflicts(
+        engine: Engine, table: DeclarativeMeta, df: pd.DataFrame) -> int:
+    insert = _CONFLICT_AWARE_INSERTS[engine.dialect.name]
+    rows = _df_to_rows(df)
+    rows_per_statement = max(
+        1, _MAX_STATEMENT_PARAMETERS // max(1, len(df.columns)))
+
+    inserted = 0
+    with engine.begin() as connection:
+        for start in range(0, len(rows), rows_per_statement):
+            statement = insert(table.__table__) \
+                .values(rows[start:start + rows_per_statement])
+            inserted += connection.execute(statement).rowcount
+    return inserted
+
+
+def _df_to_rows(df: pd.DataFrame) -> List[dict]:
+    """Converts |df| into a list of column name to value dictionaries, with
+    missing values as None and numpy and pandas values as builtin types."""
+    columns = {}
+    for name, column in df.items():
+        if pd.api.types.is_datetime64_any_dtype(column):
+            values = list(column.dt.to_pydatetime())
+        else:
+            values = column.astype(object).tolist()
+        columns[name] = [None if pd.isnull(value) else value
+                         for value in values]
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+
+def _write_df_to_sql(
+        engine: Engine, table: DeclarativeMeta, df: pd.DataFrame) -> int:
     try:
-        df.to_sql(table.__tablename__, recidiviz.db_engine, if_exists='append',
-                  index=False)
+        df.to_sql(table.__tablename__, engine, if_exists='append', index=False)
     except IntegrityError:
-        _write_df_only_successful_rows(table, df)
+        return _write_df_only_successful_rows(engine, table, df)
+    return len(df)
 
 
 def _write_df_only_successful_rows(
-        table: DeclarativeMeta, df: pd.DataFrame) -> None:
-    """If the dataframe can't be written all at once (eg. some rows already
-    exist in the database) then we write only the rows that we can."""
+        engine: Engine, table: DeclarativeMeta, df: pd.DataFrame) -> int:
+    """If the dataframe can't be written all at once (eg. some rows violate a
+    constraint) then we write only the rows that we can."""
+    inserted = 0
     for i in range(len(df)):
         row = df.iloc[i:i + 1]
         try:
-            row.to_sql(table.__tablename__, recidiviz.db_engine,
-                       if_exists='append', index=False)
+            row.to_sql(table.__tablename__, engine, if_exists='append',
+                       index=False)
+            inserted += 1
         except IntegrityError:
             # Skip rows that can't be written
             logging.info("Skipping write_df to %s table: %s.", table, row)
+    return inserted
 
 
 def _convert_enums_to_strings(dictionary):
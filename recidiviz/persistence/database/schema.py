@@ -29,8 +29,8 @@ pointing to a historical table does NOT have a foreign key constraint. As a
 result of this difference in constraints, foreign key columns cannot be shared
 between tables in the "SharedColumn" mixins.
 """
-from sqlalchemy import Boolean, Column, Date, DateTime, Enum, ForeignKey, \
-    Integer, String, Text, UniqueConstraint
+from sqlalchemy import Boolean, Column, Date, DateTime, Enum, Float, \
+    ForeignKey, Integer, String, Text, UniqueConstraint
 from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.ext.declarative import declarative_base, DeclarativeMeta
 from sqlalchemy.orm import relationship
@@ -942,3 +942,53 @@ class PaCountyPreSentencedAggregate(Base, _AggregateTableMixin):
 
     county_name = Column(Integer)
     pre_sentenced_population = Column(Integer)
+
+
+# ==================== Calculation Tables ====================
+# Output of the calculation pipelines in recidiviz/calculator. Each run writes
+# its metrics under its own execution_id, and readers only see the metrics of
+# the execution currently marked as current (see recidivism/sink.py).
+
+class RecidivismMetricExecution(Base):
+    """A run of the recidivism calculation pipeline."""
+    __tablename__ = 'recidivism_metric_execution'
+
+    execution_id = Column(String(255), primary_key=True)
+    started_on = Column(DateTime, nullable=False)
+    completed_on = Column(DateTime)
+
+    # At most one completed execution is current at a time.
+    is_current = Column(Boolean, nullable=False, default=False, index=True)
+
+
+class RecidivismMetricRow(Base):
+    """A single recidivism metric produced by a calculation execution."""
+    __tablename__ = 'recidivism_metric'
+    __table_args__ = (
+        UniqueConstraint('execution_id', 'metric_key'),
+    )
+
+    record_id = Column(Integer, primary_key=True)
+    execution_id = Column(
+        String(255), ForeignKey('recidivism_metric_execution.execution_id'),
+        nullable=False)
+
+    # The serialized MetricKey. The dimension columns below can be NULL, both
+    # for metrics not sliced by a characteristic and for unknown values, so
+    # uniqueness is enforced over this instead.
+    metric_key = Column(Text, nullable=False)
+
+    release_cohort = Column(Integer, nullable=False)
+    follow_up_period = Column(Integer, nullable=False)
+    methodology = Column(String(255), nullable=False)
+    characteristics = Column(Integer, nullable=False)
+    age_bucket = Column(String(255))
+    stay_length_bucket = Column(String(255))
+    race = Column(String(255))
+    sex = Column(String(255))
+    release_facility = Column(String(255))
+
+    total_records = Column(Integer, nullable=False)
+    total_recidivism = Column(Float, nullable=False)
+    recidivism_rate = Column(Float, nullable=False)
+    created_on = Column(DateTime, nullable=False)
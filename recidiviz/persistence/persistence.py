@@ -154,6 +154,9 @@ def write(ingest_info, metadata):
     then update that person.
 
     Otherwise, simply log the given ingest_infos for debugging
+
+    |ingest_info| may be either an IngestInfo proto or an IngestInfo python
+    object, which is converted directly without an intermediate proto.
     """
     mtags = {monitoring.TagKey.REGION: metadata.region,
              monitoring.TagKey.SHOULD_PERSIST: _should_persist()}
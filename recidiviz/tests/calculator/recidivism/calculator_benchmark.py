@@ -0,0 +1,198 @@
+# Recidiviz - a platform for tracking granular recidivism metrics in real time
+# Copyright (C) 2019 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+
+"""Measures the throughput and peak memory of each recidivism calculation
+phase over a synthetic population.
+
+Each phase is timed on its own, over the output of the phase before it:
+find_recidivism, map_recidivism_combinations, the shuffle that groups values
+by metric key, and the reduce into RecidivismMetrics. Peak memory is measured
+in a second pass with tracemalloc, which would otherwise skew the timings.
+
+Benchmarks are not collected by pytest. Run directly:
+python -m recidiviz.tests.calculator.recidivism.calculator_benchmark \
+    --num_people 10000
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from recidiviz.calculator.recidivism import pipeline
+from recidiviz.calculator.recidivism.calculator import \
+    map_recidivism_combinations
+from recidiviz.calculator.recidivism.identifier import find_recidivism
+from recidiviz.calculator.recidivism.reader import (
+    CalculationPerson, CalculationRecord, CalculationSnapshot)
+
+# The date metrics are calculated as of, fixed so that runs are comparable.
+AS_OF = date(2019, 1, 1)
+
+_RACES = ['AMERICAN_INDIAN_ALASKAN_NATIVE', 'ASIAN', 'BLACK',
+          'NATIVE_HAWAIIAN_PACIFIC_ISLANDER', 'WHITE', None]
+_RACE_WEIGHTS = [2, 5, 40, 1, 45, 7]
+_SEXES = ['MALE', 'FEMALE', None]
+_SEX_WEIGHTS = [85, 13, 2]
+
+
+def build_population(num_people, seed=0, recidivism_rate=0.4,
+                     first_cohort=2000, num_cohorts=15, num_facilities=20):
+    """Builds a deterministic population of people, records and snapshots.
+
+    Each person is first released in a cohort year within the span, and after
+    each release returns to prison with the given probability, until a return
+    would fall after AS_OF. Their last record is still open one time in ten.
+    Each record has one to three snapshots, as for people who are moved
+    between facilities during a stay.
+
+    Args:
+        num_people: the number of people to build.
+        seed: the seed of the random number generator. The same arguments
+            always build the same population.
+        recidivism_rate: the probability of returning to prison after each
+            release.
+        first_cohort: the earliest release cohort year.
+        num_cohorts: the number of release cohort years people are first
+            released in.
+        num_facilities: the number of distinct facilities.
+
+    Returns:
+        A list of (person, records, snapshots) tuples, with records ordered
+        by custody date and snapshots ordered descending by creation date.
+    """
+    rng = random.Random(seed)
+    facilities = ['Facility {}'.format(i) for i in range(num_facilities)]
+
+    population = []
+    for person_id in range(num_people):
+        release_date = date(first_cohort + rng.randrange(num_cohorts), 1, 1) \
+            + timedelta(days=rng.randrange(365))
+        custody_date = release_date - timedelta(days=rng.randint(30, 3650))
+        person = CalculationPerson(
+            key=person_id,
+            birthdate=custody_date - timedelta(days=rng.randint(18, 60) * 365),
+            race=rng.choices(_RACES, _RACE_WEIGHTS)[0],
+            sex=rng.choices(_SEXES, _SEX_WEIGHTS)[0])
+
+        records = []
+        snapshots = []
+        while True:
+            key = len(records)
+            is_released = release_date < AS_OF and rng.random() >= 0.1
+            records.append(CalculationRecord(
+                key=key, custody_date=custody_date, is_released=is_released,
+                latest_release_date=release_date if is_released else None))
+            stay_days = (release_date - custody_date).days
+            for _ in range(rng.randint(1, 3)):
+                created_on = custody_date + timedelta(
+                    days=rng.randrange(stay_days))
+                snapshots.append(CalculationSnapshot(
+                    parent=key,
+                    created_on=datetime.combine(created_on,
+                                                datetime.min.time()),
+                    latest_facility=rng.choice(facilities)))
+
+            if not is_released or rng.random() >= recidivism_rate:
+                break
+            custody_date = release_date + timedelta(
+                days=rng.randint(30, 3650))
+            if custody_date >= AS_OF:
+                break
+            release_date = custody_date + timedelta(
+                days=rng.randint(30, 3650))
+
+        snapshots.sort(key=lambda snapshot: snapshot.created_on, reverse=True)
+        population.append((person, records, snapshots))
+    return population
+
+
+def find_events(population):
+    return [(person, find_recidivism(records, snapshots))
+            for person, records, snapshots in population]
+
+
+def map_events(people_events):
+    return [combination for person, events in people_events
+            for combination in map_recidivism_combinations(person, events,
+                                                           AS_OF)]
+
+
+def shuffle(combinations):
+    grouped = defaultdict(list)
+    for key, value in combinations:
+        grouped[key].append(value)
+    return grouped
+
+
+def reduce_values(grouped):
+    return [metric for key, values in grouped.items()
+            for metric in pipeline.reduce_recidivism_events(key, values)]
+
+
+_PHASES = [
+    ('find_recidivism', find_events),
+    ('map', map_events),
+    ('shuffle', shuffle),
+    ('reduce', reduce_values),
+]
+
+
+def main(num_people, seed, recidivism_rate, num_cohorts, num_facilities):
+    population = build_population(num_people, seed, recidivism_rate,
+                                  num_cohorts=num_cohorts,
+                                  num_facilities=num_facilities)
+
+    timings = []
+    output = population
+    for name, phase in _PHASES:
+        start = time.perf_counter()
+        output = phase(output)
+        timings.append((name, time.perf_counter() - start, len(output)))
+
+    peaks = []
+    output = population
+    for _, phase in _PHASES:
+        tracemalloc.start()
+        output = phase(output)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    print('people:  {}'.format(num_people))
+    print('records: {}'.format(sum(len(records)
+                                   for _, records, _ in population)))
+    for (name, elapsed, outputs), peak in zip(timings, peaks):
+        print('{:<16} {:8.2f}s {:10.0f} people/s {:10} outputs '
+              '{:8.1f} MiB peak'.format(name, elapsed, num_people / elapsed,
+                                        outputs, peak / 2 ** 20))
+    total = sum(elapsed for _, elapsed, _ in timings)
+    print('{:<16} {:8.2f}s {:10.0f} people/s'.format(
+        'total', total, num_people / total))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--num_people', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--recidivism_rate', type=float, default=0.4)
+    parser.add_argument('--num_cohorts', type=int, default=15)
+    parser.add_argument('--num_facilities', type=int, default=20)
+    args = parser.parse_args()
+    main(args.num_people, args.seed, args.recidivism_rate, args.num_cohorts,
+         args.num_facilities)
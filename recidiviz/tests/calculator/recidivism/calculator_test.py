@@ -107,6 +107,50 @@ def test_count_releases_in_window_all_late():
     assert reincarcerations == 0
 
 
+def test_count_releases_in_windows():
+    all_reincarceration_dates = [date(2012, 4, 30), date(2016, 5, 13),
+                                 date(2020, 11, 20), date(2021, 5, 13),
+                                 date(2022, 5, 13)]
+    anniversaries = calculator.release_anniversaries(
+        date(2016, 5, 13), calculator.FOLLOW_UP_PERIODS)
+
+    reincarcerations = calculator.count_reincarcerations_in_windows(
+        anniversaries, calculator.FOLLOW_UP_PERIODS,
+        all_reincarceration_dates)
+
+    assert reincarcerations == {
+        period: calculator.count_reincarcerations_in_window(
+            date(2016, 5, 13), period, all_reincarceration_dates)
+        for period in calculator.FOLLOW_UP_PERIODS}
+    assert reincarcerations[5] == 2
+    assert reincarcerations[6] == 3
+
+
+def test_release_anniversaries_leap_day():
+    anniversaries = calculator.release_anniversaries(date(2016, 2, 29),
+                                                     range(1, 5))
+
+    assert anniversaries == (date(2016, 2, 29), date(2017, 2, 28),
+                             date(2018, 2, 28), date(2019, 2, 28),
+                             date(2020, 2, 29))
+
+
+def test_next_period_start():
+    events = {
+        2010: recidivism_event.RecidivismEvent.recidivism_event(
+            date(2008, 1, 1), date(2010, 6, 1), "Sing Sing",
+            date(2012, 3, 1), "Sing Sing", False),
+        2015: recidivism_event.RecidivismEvent.non_recidivism_event(
+            date(2012, 3, 1), date(2015, 2, 3), "Sing Sing"),
+    }
+
+    assert calculator.next_period_start(events, date(2018, 1, 1)) == \
+        date(2018, 2, 3)
+    assert calculator.next_period_start(events, date(2018, 2, 3)) == \
+        date(2018, 6, 1)
+    assert calculator.next_period_start(events, date(2030, 1, 1)) is None
+
+
 def test_earliest_recidivated_follow_up_period_later_month_in_year():
     release_date = date(2012, 4, 20)
     reincarceration_date = date(2016, 5, 13)
@@ -238,6 +282,9 @@ def test_age_bucket():
     assert calculator.age_bucket(30) == "30-34"
     assert calculator.age_bucket(39) == "35-39"
     assert calculator.age_bucket(40) == "40<"
+    assert calculator.age_bucket(87) == "40<"
+    assert calculator.age_bucket(-1) == "<25"
+    assert calculator.age_bucket(None) is None
 
 
 def test_stay_length_from_event_earlier_month_and_date():
@@ -285,6 +332,15 @@ def test_stay_length_from_event_later_month():
     assert calculator.stay_length_from_event(event) == 13
 
 
+def test_stay_length_from_event_end_of_month():
+    original_entry_date = date(2015, 1, 31)
+    release_date = date(2015, 2, 28)
+    event = recidivism_event.RecidivismEvent(
+        False, original_entry_date, release_date, "Sing Sing")
+
+    assert calculator.stay_length_from_event(event) == 1
+
+
 def test_stay_length_from_event_original_entry_date_unknown():
     release_date = date(2014, 7, 11)
     event = recidivism_event.RecidivismEvent(
@@ -327,6 +383,7 @@ def test_stay_length_bucket():
     assert calculator.stay_length_bucket(110) == "108-120"
     assert calculator.stay_length_bucket(120) == "120<"
     assert calculator.stay_length_bucket(130) == "120<"
+    assert calculator.stay_length_bucket(-2) == "<12"
 
 
 def test_for_characteristics():
@@ -351,15 +408,15 @@ def test_for_characteristics_one_characteristic():
 
 
 def test_augment_combination():
-    combo = {'age': '<25', 'race': 'black', 'sex': 'female'}
+    combo = (2008, 0b00111, ('<25', 'black', 'female', None, None))
     augmented = calculator.augment_combination(combo, 'EVENT', 8)
 
-    assert augmented == {'age': '<25',
-                         'follow_up_period': 8,
-                         'methodology': 'EVENT',
-                         'race': 'black',
-                         'sex': 'female'}
-    assert augmented != combo
+    assert augmented.to_combination() == {'age': '<25',
+                                          'follow_up_period': 8,
+                                          'methodology': 'EVENT',
+                                          'race': 'black',
+                                          'release_cohort': 2008,
+                                          'sex': 'female'}
 
 
 class TestMapRecidivismCombinations:
@@ -385,7 +442,7 @@ class TestMapRecidivismCombinations:
         assert len(recidivism_combinations) == 640
 
         for combination, value in recidivism_combinations:
-            if combination['follow_up_period'] <= 5:
+            if combination.follow_up_period <= 5:
                 assert value == 0
             else:
                 assert value == 1
@@ -421,7 +478,7 @@ class TestMapRecidivismCombinations:
         assert len(recidivism_combinations) == 320 + 480 + 640
 
         for combination, value in recidivism_combinations:
-            if combination['follow_up_period'] < 2:
+            if combination.follow_up_period < 2:
                 assert value == 0
             else:
                 assert value == 1
@@ -0,0 +1,90 @@
+# Recidiviz - a platform for tracking granular recidivism metrics in real time
+# Copyright (C) 2019 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+
+"""Tests for recidivism/cube.py."""
+
+from collections import defaultdict
+from datetime import date
+from itertools import product
+
+import pytest
+
+from recidiviz.calculator.recidivism import calculator, cube
+from recidiviz.calculator.recidivism.metric_key import (
+    ALL_CHARACTERISTICS, CHARACTERISTIC_SUBSETS, MetricKey, project)
+from recidiviz.calculator.recidivism.recidivism_event import RecidivismEvent
+from recidiviz.tests.calculator.recidivism.pipeline_test import FakePerson
+
+
+def _cells():
+    cells = {}
+    values = product(['<25', '40<'], ['black', None], ['male'],
+                     ['<12', '12-24'], ['Sing Sing', 'Upstate'])
+    for index, characteristics in enumerate(values):
+        for methodology in ('EVENT', 'OFFENDER'):
+            key = MetricKey(2010, 1 + index % 3, methodology,
+                            ALL_CHARACTERISTICS, *characteristics)
+            cells[key] = (index + 1, index / 2)
+    return cells
+
+
+def test_rollup_matches_projecting_every_cell():
+    cells = _cells()
+
+    expected = defaultdict(lambda: (0, 0))
+    for key, (records, recidivism) in cells.items():
+        for characteristics in CHARACTERISTIC_SUBSETS:
+            projected = project(key, characteristics)
+            total_records, total_recidivism = expected[projected]
+            expected[projected] = (total_records + records,
+                                   total_recidivism + recidivism)
+
+    assert cube.rollup(cells) == dict(expected)
+
+
+def test_rollup_matches_map_recidivism_combinations():
+    person = FakePerson(birthdate=date(1987, 2, 24), race='black', sex='male')
+    events = {
+        2010: RecidivismEvent.recidivism_event(
+            date(2008, 11, 20), date(2010, 12, 4), 'Sing Sing',
+            date(2011, 4, 5), 'Upstate', False),
+        2014: RecidivismEvent.non_recidivism_event(
+            date(2011, 4, 5), date(2014, 4, 14), None),
+    }
+
+    cells = defaultdict(lambda: (0, 0))
+    for key, value in calculator.map_recidivism_cells(person, events):
+        records, recidivism = cells[key]
+        cells[key] = (records + 1, recidivism + value)
+
+    expected = defaultdict(lambda: (0, 0))
+    for key, value in calculator.map_recidivism_combinations(person, events):
+        records, recidivism = expected[key]
+        expected[key] = (records + 1, recidivism + value)
+
+    assert cube.rollup(cells) == dict(expected)
+
+
+def test_rollup_rejects_coarse_keys():
+    key = MetricKey.for_characteristics(2010, 1, 'EVENT', {'sex': 'male'})
+
+    with pytest.raises(ValueError):
+        cube.rollup({key: (1, 0)})
+
+
+def test_rollup_empty():
+    assert cube.rollup({}) == {}
@@ -0,0 +1,144 @@
+# Recidiviz - a platform for tracking granular recidivism metrics in real time
+# Copyright (C) 2019 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+
+"""Tests for recidivism/incremental.py."""
+
+import pickle
+from datetime import date
+
+import pytest
+
+from recidiviz.calculator.recidivism.incremental import IncrementalCalculator
+from recidiviz.tests.calculator.recidivism.pipeline_test import fake_person
+
+
+class _People:
+    """A fake table of people, loadable by key."""
+
+    def __init__(self, count):
+        self.bundles = {i: fake_person(i) for i in range(count)}
+
+    def load(self, person_keys):
+        return [(key,) + self.bundles[key] for key in person_keys
+                if key in self.bundles]
+
+
+def _metrics(calculator):
+    return sorted((tuple(sorted(metric.__dict__.items()))
+                   for metric in calculator.metrics()), key=repr)
+
+
+def _full(people, as_of):
+    calculator = IncrementalCalculator()
+    calculator.refresh(people.bundles.keys(), people.load, as_of)
+    return _metrics(calculator)
+
+
+class TestIncrementalCalculator:
+    """Tests for IncrementalCalculator."""
+
+    def test_refresh_changed_people_matches_full_calculation(self):
+        people = _People(20)
+        calculator = IncrementalCalculator()
+        calculator.refresh(people.bundles.keys(), people.load,
+                           date(2018, 1, 1))
+
+        people.bundles[3] = fake_person(3, release_year=2010)
+        del people.bundles[5]
+        people.bundles[20] = fake_person(20)
+        updated = calculator.refresh({3, 5, 20}, people.load,
+                                     date(2018, 1, 1))
+
+        assert updated == 3
+        assert _metrics(calculator) == _full(people, date(2018, 1, 1))
+
+    def test_refresh_later_maps_people_with_new_periods(self):
+        people = _People(12)
+        calculator = IncrementalCalculator()
+        calculator.refresh(people.bundles.keys(), people.load,
+                           date(2018, 1, 1))
+
+        as_of = date(2018, 3, 1)
+        due = calculator.people_to_update(set(), as_of)
+        calculator.refresh(set(), people.load, as_of)
+
+        assert due
+        assert len(due) < len(people.bundles)
+        assert _metrics(calculator) == _full(people, as_of)
+
+    def test_refresh_without_changes_maps_nobody(self):
+        people = _People(5)
+        calculator = IncrementalCalculator()
+        calculator.refresh(people.bundles.keys(), people.load,
+                           date(2018, 1, 1))
+
+        assert calculator.refresh(set(), people.load, date(2018, 1, 2)) == 0
+
+    def test_refresh_earlier_raises(self):
+        people = _People(1)
+        calculator = IncrementalCalculator()
+        calculator.refresh(people.bundles.keys(), people.load,
+                           date(2018, 1, 1))
+
+        with pytest.raises(ValueError):
+            calculator.refresh(set(), people.load, date(2017, 1, 1))
+
+    def test_pickle_round_trip(self):
+        people = _People(5)
+        calculator = IncrementalCalculator()
+        calculator.refresh(people.bundles.keys(), people.load,
+                           date(2018, 1, 1))
+
+        restored = pickle.loads(pickle.dumps(calculator))
+
+        assert _metrics(restored) == _metrics(calculator)
+
+    def test_refresh_after_load_matches_full_calculation(self, tmpdir):
+        people = _People(20)
+        calculator = IncrementalCalculator()
+        calculator.refresh(people.bundles.keys(), people.load,
+                           date(2018, 1, 1))
+        path = str(tmpdir.join('calculator.json'))
+        calculator.save(path)
+
+        restored = IncrementalCalculator.load(path)
+        people.bundles[3] = fake_person(3, release_year=2010)
+        del people.bundles[5]
+        as_of = date(2018, 3, 1)
+        due = restored.people_to_update({3, 5}, as_of)
+        updated = restored.refresh({3, 5}, people.load, as_of)
+
+        assert restored.as_of == as_of
+        assert due == calculator.people_to_update({3, 5}, as_of)
+        assert updated == len(due) < len(people.bundles)
+        assert _metrics(restored) == _full(people, as_of)
+
+    def test_deserialize_invalid_raises(self):
+        with pytest.raises(ValueError):
+            IncrementalCalculator.deserialize('{"as_of": null}')
+
+    def test_remove_everyone(self):
+        people = _People(5)
+        calculator = IncrementalCalculator()
+        calculator.refresh(people.bundles.keys(), people.load,
+                           date(2018, 1, 1))
+
+        keys = set(people.bundles)
+        people.bundles.clear()
+        calculator.refresh(keys, people.load, date(2018, 1, 1))
+
+        assert calculator.metrics() == []
@@ -0,0 +1,92 @@
+# Recidiviz - a platform for tracking granular recidivism metrics in real time
+# Copyright (C) 2019 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+
+"""Tests for recidivism/metric_key.py."""
+
+import pytest
+
+from recidiviz.calculator.recidivism import calculator, metric_key
+from recidiviz.calculator.recidivism.metric_key import MetricKey
+
+
+def test_for_characteristics():
+    key = MetricKey.for_characteristics(
+        2008, 5, 'EVENT', {'race': 'black', 'sex': 'female'})
+
+    assert key.race == 'black'
+    assert key.sex == 'female'
+    assert key.age is None
+    assert key.has_characteristic('race')
+    assert not key.has_characteristic('age')
+
+
+def test_unknown_characteristic_is_distinct_from_absent():
+    unknown_race = MetricKey.for_characteristics(2008, 5, 'EVENT',
+                                                 {'race': None})
+    all_races = MetricKey.for_characteristics(2008, 5, 'EVENT', {})
+
+    assert unknown_race != all_races
+    assert unknown_race.to_combination() == {'release_cohort': 2008,
+                                             'follow_up_period': 5,
+                                             'methodology': 'EVENT',
+                                             'race': None}
+
+
+def test_combination_round_trip():
+    combination = {'release_cohort': 2010, 'follow_up_period': 4,
+                   'methodology': 'OFFENDER', 'age': '<25',
+                   'stay_length': '12-24', 'release_facility': 'Adirondack'}
+
+    key = MetricKey.from_combination(combination)
+
+    assert key.to_combination() == combination
+
+
+def test_serialize_round_trip():
+    key = MetricKey.for_characteristics(
+        2010, 4, 'OFFENDER', {'age': '<25', 'race': None,
+                              'release_facility': 'Adirondack'})
+
+    assert metric_key.deserialize(metric_key.serialize(key)) == key
+
+
+def test_deserialize_rejects_other_values():
+    with pytest.raises(ValueError):
+        metric_key.deserialize('{"release_cohort": 2010}')
+
+
+def test_project():
+    key = MetricKey.for_characteristics(
+        2010, 4, 'EVENT', {'age': '<25', 'race': 'black', 'sex': 'male'})
+
+    projected = metric_key.project(key, 0b00101)
+
+    assert projected == MetricKey.for_characteristics(
+        2010, 4, 'EVENT', {'age': '<25', 'sex': 'male'})
+
+
+def test_project_subsets_match_for_characteristics():
+    values = ('<25', 'black', 'female', '12-24', 'Sing Sing')
+    key = MetricKey(2008, 1, 'EVENT', metric_key.ALL_CHARACTERISTICS, *values)
+
+    projected = [metric_key.project(key, characteristics)
+                 for characteristics in metric_key.CHARACTERISTIC_SUBSETS]
+
+    expected = calculator.for_characteristics(
+        dict(zip(metric_key.CHARACTERISTICS, values)))
+    assert projected == [MetricKey.for_characteristics(2008, 1, 'EVENT', combo)
+                         for combo in expected]
@@ -31,6 +31,8 @@ from recidiviz.tests.context import calculator
 from recidiviz.calculator.recidivism import (calculator,  # type: ignore
                                              metrics, pipeline,
                                              recidivism_event)
+from recidiviz.calculator.recidivism.metric_key import (
+    ALL_CHARACTERISTICS, MetricKey, serialize)
 
 
 class TestMapReduceMethods:
@@ -85,15 +87,15 @@ class TestMapReduceMethods:
 
             # The value is always 1, because recidivism occurred
             # within the first year of release.
-            if combination['release_cohort'] == 2010:
+            if combination.release_cohort == 2010:
                 total_combinations_2010 += 1
                 assert value == 1
 
             # This is the last instance of recidivism
             # and it occurs at the 3 year mark.
-            elif combination['release_cohort'] == 2014:
+            elif combination.release_cohort == 2014:
                 total_combinations_2014 += 1
-                if combination['follow_up_period'] < 3:
+                if combination.follow_up_period < 3:
                     assert value == 0
                 else:
                     assert value == 1
@@ -136,14 +138,10 @@ class TestMapReduceMethods:
 
     def test_reduce_recidivism_events(self):
         """Tests the reduce_recidivism_events function happy path."""
-        metric_key_offender = "{'follow_up_period': 4, " \
-                              "'age': '<25', " \
-                              "'stay_length': '12-24', " \
-                              "'sex': u'male', " \
-                              "'methodology': 'OFFENDER', " \
-                              "'race': u'black', " \
-                              "'release_facility': u'Adirondack', " \
-                              "'release_cohort': 2010}"
+        metric_key_offender = MetricKey.for_characteristics(
+            2010, 4, 'OFFENDER',
+            {'age': '<25', 'stay_length': '12-24', 'sex': 'male',
+             'race': 'black', 'release_facility': 'Adirondack'})
 
         offender_result_generator = pipeline.reduce_recidivism_events(
             metric_key_offender, [0.5, 0.0, 0.5, 1.0])
@@ -152,19 +150,16 @@ class TestMapReduceMethods:
             expected = metrics.RecidivismMetric(
                 release_cohort=2010, follow_up_period=4, age_bucket='<25',
                 stay_length_bucket='12-24', sex='male', race='black',
-                release_facility='Adirondack', methodology='OFFENDER',
+                release_facility='Adirondack',
+                characteristics=ALL_CHARACTERISTICS, methodology='OFFENDER',
                 execution_id=pipeline.EXECUTION_ID, total_records=4,
                 total_recidivism=2.0, recidivism_rate=0.5)
             assert result.__dict__ == expected.__dict__
 
-        metric_key_event = "{'follow_up_period': 4, " \
-                           "'age': '<25', " \
-                           "'stay_length': '12-24', " \
-                           "'sex': u'male', " \
-                           "'methodology': 'EVENT', " \
-                           "'race': u'black', " \
-                           "'release_facility': u'Adirondack', " \
-                           "'release_cohort': 2010}"
+        metric_key_event = MetricKey.for_characteristics(
+            2010, 4, 'EVENT',
+            {'age': '<25', 'stay_length': '12-24', 'sex': 'male',
+             'race': 'black', 'release_facility': 'Adirondack'})
 
         event_result_generator = pipeline.reduce_recidivism_events(
             metric_key_event, [1, 1, 0, 0, 0, 1, 1, 0, 0, 0])
@@ -173,11 +168,28 @@ class TestMapReduceMethods:
             expected = metrics.RecidivismMetric(
                 release_cohort=2010, follow_up_period=4, age_bucket='<25',
                 stay_length_bucket='12-24', sex='male', race='black',
-                release_facility='Adirondack', methodology='EVENT',
+                release_facility='Adirondack',
+                characteristics=ALL_CHARACTERISTICS, methodology='EVENT',
                 execution_id=pipeline.EXECUTION_ID, total_records=10,
                 total_recidivism=4, recidivism_rate=0.4)
             assert result.__dict__ == expected.__dict__
 
+    def test_reduce_recidivism_events_serialized_key(self):
+        """Tests the reduce_recidivism_events function with a metric key that
+        was serialized to a string, as the MapReduce framework requires."""
+        metric_key = MetricKey.for_characteristics(
+            2010, 4, 'EVENT', {'sex': 'male', 'race': None})
+
+        result = next(pipeline.reduce_recidivism_events(
+            serialize(metric_key), [1, 0]))
+
+        expected = metrics.RecidivismMetric(
+            release_cohort=2010, follow_up_period=4, sex='male',
+            characteristics=metric_key.characteristics, methodology='EVENT',
+            execution_id=pipeline.EXECUTION_ID, total_records=2,
+            total_recidivism=1, recidivism_rate=0.5)
+        assert result.__dict__ == expected.__dict__
+
     def test_reduce_recidivism_events_no_values(self):
         """Tests the reduce_recidivism_events function when there are no
         values provided alongside the metric key.
@@ -185,14 +197,10 @@ class TestMapReduceMethods:
         This should not happen in
         the GAE MapReduce framework, but we test against it anyway.
         """
-        metric_key_offender = "{'follow_up_period': 4, " \
-                              "'age': '<25', " \
-                              "'stay_length': '12-24', " \
-                              "'sex': u'male', " \
-                              "'methodology': 'OFFENDER', " \
-                              "'race': u'black', " \
-                              "'release_facility': u'Adirondack', " \
-                              "'release_cohort': 2010}"
+        metric_key_offender = MetricKey.for_characteristics(
+            2010, 4, 'OFFENDER',
+            {'age': '<25', 'stay_length': '12-24', 'sex': 'male',
+             'race': 'black', 'release_facility': 'Adirondack'})
 
         offender_result_generator = pipeline.reduce_recidivism_events(
             metric_key_offender, [])
@@ -229,3 +237,26 @@ class FakeSnapshot:
         self.parent = parent_key
         self.created_on = created_on
         self.latest_facility = latest_facility
+
+
+def fake_person(i, release_year=2009):
+    """Returns the i-th of a synthetic population, as a (person, records,
+    snapshots) tuple for pipeline.map_person. People vary by birthdate, race,
+    sex, dates and facilities with i, and the first release is in
+    |release_year| or up to two years after."""
+    person = FakePerson(key=i, birthdate=date(1970 + i % 20, 1 + i % 12, 1),
+                        race=['black', 'white', 'asian'][i % 3],
+                        sex=['male', 'female'][i % 2])
+    first = FakeRecord(key='first-{}'.format(i), is_released=True,
+                       custody_date=date(2004 + i % 5, 3, 1),
+                       latest_release_date=date(release_year + i % 3, 6, 1))
+    second = FakeRecord(key='second-{}'.format(i), is_released=bool(i % 2),
+                        custody_date=date(2013, 1 + i % 12, 2),
+                        latest_release_date=date(2015, 2, 3))
+    records = [first, second] if i % 4 else [first]
+    snapshots = [
+        FakeSnapshot(second.key, datetime(2014, 1, 1),
+                     ['Upstate', 'Downstate'][i % 2]),
+        FakeSnapshot(first.key, datetime(2008, 1, 1), 'Sing Sing'),
+    ]
+    return person, records, snapshots
@@ -0,0 +1,135 @@
+# Recidiviz - a platform for tracking granular recidivism metrics in real time
+# Copyright (C) 2019 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+
+"""Tests for recidivism/reader.py."""
+
+from datetime import date, datetime
+
+import pytest
+
+from recidiviz import Session
+from recidiviz.calculator.recidivism import reader
+from recidiviz.calculator.recidivism.identifier import find_recidivism
+from recidiviz.calculator.recidivism.reader import (
+    CalculationPerson, CalculationRecord, CalculationSnapshot)
+from recidiviz.common.constants.booking import CustodyStatus
+from recidiviz.common.constants.person import Gender, Race
+from recidiviz.persistence.database.schema import (
+    Booking, BookingHistory, Person)
+from recidiviz.tests.utils import fakes
+
+_REGION = 'region'
+_LAST_SEEN_TIME = datetime(2018, 1, 1)
+
+
+def _booking(booking_id, person_id, admission_date, release_date=None,
+             custody_status=CustodyStatus.IN_CUSTODY):
+    return Booking(booking_id=booking_id, person_id=person_id,
+                   admission_date=admission_date, release_date=release_date,
+                   custody_status=custody_status.value,
+                   last_seen_time=_LAST_SEEN_TIME)
+
+
+def _snapshot(booking_id, person_id, valid_from, facility):
+    return BookingHistory(booking_id=booking_id, person_id=person_id,
+                          valid_from=valid_from, facility=facility,
+                          custody_status=CustodyStatus.IN_CUSTODY.value)
+
+
+class TestReadPeople:
+    """Tests for read_people."""
+
+    def setup_method(self, _test_method):
+        fakes.use_in_memory_sqlite_database()
+
+    def test_read_people(self):
+        session = Session()
+        session.add(Person(person_id=1, region=_REGION,
+                           birthdate=date(1980, 5, 1),
+                           race=Race.BLACK.value, gender=Gender.MALE.value))
+        session.add(Person(person_id=2, region=_REGION))
+        session.commit()
+        session.add(_booking(12, 1, date(2012, 3, 4)))
+        session.add(_booking(11, 1, date(2008, 1, 2), date(2010, 6, 7),
+                             CustodyStatus.RELEASED))
+        session.add(_booking(13, 1, None))
+        session.commit()
+        session.add(_snapshot(11, 1, datetime(2008, 1, 2), 'Sing Sing'))
+        session.add(_snapshot(11, 1, datetime(2009, 1, 2), 'Upstate'))
+        session.add(_snapshot(12, 1, datetime(2012, 3, 4), 'Downstate'))
+        session.commit()
+
+        people = list(reader.read_people(session))
+
+        assert people == [
+            (CalculationPerson(1, date(1980, 5, 1), Race.BLACK.value,
+                               Gender.MALE.value),
+             [CalculationRecord(11, date(2008, 1, 2), True,
+                                date(2010, 6, 7)),
+              CalculationRecord(12, date(2012, 3, 4), False, None)],
+             [CalculationSnapshot(12, datetime(2012, 3, 4), 'Downstate'),
+              CalculationSnapshot(11, datetime(2009, 1, 2), 'Upstate'),
+              CalculationSnapshot(11, datetime(2008, 1, 2), 'Sing Sing')]),
+            (CalculationPerson(2, None, None, None), [], []),
+        ]
+
+        _, records, snapshots = people[0]
+        event = find_recidivism(records, snapshots)[2010]
+        assert event.recidivated
+        assert event.original_entry_date == date(2008, 1, 2)
+        assert event.release_facility == 'Upstate'
+        assert event.reincarceration_date == date(2012, 3, 4)
+
+    def test_read_people_in_chunks(self):
+        session = Session()
+        for person_id in range(1, 8):
+            session.add(Person(person_id=person_id, region=_REGION))
+        session.commit()
+        for person_id in range(1, 8):
+            session.add(_booking(person_id, person_id, date(2010, 1, 1)))
+        session.commit()
+
+        people = list(reader.read_people(session, chunk_size=3))
+
+        assert [person.key for person, _, _ in people] == list(range(1, 8))
+        assert all(len(records) == 1 for _, records, _ in people)
+
+    def test_read_people_in_region(self):
+        session = Session()
+        session.add(Person(person_id=1, region=_REGION))
+        session.add(Person(person_id=2, region='another region'))
+        session.commit()
+
+        people = list(reader.read_people(session, region=_REGION))
+
+        assert [person.key for person, _, _ in people] == [1]
+
+    def test_read_people_released_without_release_date(self):
+        session = Session()
+        session.add(Person(person_id=1, region=_REGION))
+        session.commit()
+        session.add(_booking(1, 1, date(2010, 1, 1),
+                             custody_status=CustodyStatus.INFERRED_RELEASE))
+        session.commit()
+
+        [(_, records, _)] = reader.read_people(session)
+
+        assert records == [CalculationRecord(1, date(2010, 1, 1), True, None)]
+
+    def test_read_people_invalid_chunk_size(self):
+        with pytest.raises(ValueError):
+            list(reader.read_people(Session(), chunk_size=0))
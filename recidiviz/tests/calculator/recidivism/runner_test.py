@@ -0,0 +1,114 @@
+# Recidiviz - a platform for tracking granular recidivism metrics in real time
+# Copyright (C) 2019 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+
+"""Tests for recidivism/runner.py."""
+
+from collections import Counter, defaultdict
+from datetime import date
+
+from recidiviz.calculator.recidivism import pipeline, runner
+from recidiviz.calculator.recidivism.metric_key import (
+    CHARACTERISTIC_SUBSETS, MetricKey)
+from recidiviz.tests.calculator.recidivism.pipeline_test import fake_person
+
+
+def _people(count):
+    return [fake_person(i) for i in range(count)]
+
+
+def _reference(people, as_of=None):
+    """Runs map, shuffle and reduce the way the MapReduce framework did."""
+    counters = Counter()
+    grouped = defaultdict(list)
+    for person, records, snapshots in people:
+        for key, value in pipeline.map_person(
+                person, records, snapshots, counters, as_of):
+            grouped[key].append(value)
+
+    metrics = []
+    for key, values in grouped.items():
+        metrics.extend(
+            pipeline.reduce_recidivism_events(key, values, counters))
+
+    # The runner maps finest-grain cells, each standing for one combination
+    # per characteristic subset.
+    counters['total_metric_cells_mapped'] = \
+        counters['total_metric_combinations_mapped'] \
+        // len(CHARACTERISTIC_SUBSETS)
+    return metrics, counters
+
+
+def _by_key(metrics):
+    return {(m.release_cohort, m.follow_up_period, m.methodology,
+             m.age_bucket, m.race, m.sex, m.release_facility,
+             m.stay_length_bucket): m.__dict__ for m in metrics}
+
+
+class TestRun:
+    """Tests for the local pipeline runner."""
+
+    def test_run_matches_reference(self):
+        people = _people(30)
+        expected_metrics, expected_counters = _reference(people)
+
+        result = runner.run(people, num_workers=2, num_partitions=3,
+                            chunk_size=7)
+
+        assert _by_key(result.metrics) == _by_key(expected_metrics)
+        assert result.counters == expected_counters
+
+    def test_run_serially_matches_reference(self):
+        people = _people(10)
+        expected_metrics, expected_counters = _reference(people)
+
+        result = runner.run(iter(people), num_workers=1, num_partitions=4,
+                            chunk_size=3)
+
+        assert _by_key(result.metrics) == _by_key(expected_metrics)
+        assert result.counters == expected_counters
+
+    def test_run_as_of(self):
+        people = _people(10)
+        expected_metrics, expected_counters = _reference(people,
+                                                         date(2012, 1, 1))
+
+        result = runner.run(people, num_workers=1, as_of=date(2012, 1, 1))
+
+        assert _by_key(result.metrics) == _by_key(expected_metrics)
+        assert result.counters == expected_counters
+        assert max(metric.release_cohort for metric in result.metrics) == 2011
+
+    def test_run_does_not_touch_global_counters(self):
+        before = Counter(pipeline.COUNTERS)
+
+        runner.run(_people(3), num_workers=1)
+
+        assert pipeline.COUNTERS == before
+
+    def test_run_no_people(self):
+        result = runner.run([], num_workers=2)
+
+        assert result.metrics == []
+        assert not +result.counters
+
+    def test_partition_for_ignores_characteristics(self):
+        key = MetricKey.for_characteristics(2008, 1, 'EVENT', {'sex': 'male'})
+        rolled_up = MetricKey.for_characteristics(2008, 1, 'EVENT', {})
+
+        assert runner.partition_for(key, 8) == \
+            runner.partition_for(rolled_up, 8)
+        assert 0 <= runner.partition_for(key, 8) < 8
@@ -0,0 +1,139 @@
+# Recidiviz - a platform for tracking granular recidivism metrics in real time
+# Copyright (C) 2019 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+
+"""Tests for recidivism/sink.py."""
+
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from recidiviz import Session
+from recidiviz.calculator.recidivism import pipeline, sink
+from recidiviz.calculator.recidivism.metric_key import MetricKey
+from recidiviz.persistence.database.schema import RecidivismMetricRow
+from recidiviz.tests.utils import fakes
+
+_CREATED_ON = datetime(2019, 3, 1)
+
+
+def _metric(characteristics, total_records=4, total_recidivism=1):
+    key = MetricKey.for_characteristics(2010, 4, 'EVENT', characteristics)
+    metric = pipeline.to_metric(key, total_records, total_recidivism)
+    metric.created_on = _CREATED_ON
+    return metric
+
+
+def _dicts(metrics, execution_id):
+    result = []
+    for metric in metrics:
+        expected = dict(metric.__dict__)
+        expected.update(execution_id=execution_id, updated_on=None)
+        result.append(expected)
+    return sorted(result, key=repr)
+
+
+class TestSink:
+    """Tests for writing metrics with sink.py."""
+
+    def setup_method(self, _test_method):
+        fakes.use_in_memory_sqlite_database()
+
+    def test_write_and_read_current_metrics(self):
+        metrics = [_metric({}), _metric({'race': 'black'}),
+                   _metric({'race': None}), _metric({'sex': 'male'})]
+
+        session = Session()
+        sink.start_execution(session, 1)
+        written = sink.write_metrics(session, 1, iter(metrics),
+                                     batch_size=3, created_on=_CREATED_ON)
+
+        assert written == 4
+        assert sink.read_current_metrics(session) == []
+
+        sink.complete_execution(session, 1)
+        session.commit()
+
+        assert _dicts(sink.read_current_metrics(Session()), '1') \
+            == _dicts(metrics, '1')
+
+    def test_write_metrics_replaces_existing_keys(self):
+        session = Session()
+        sink.start_execution(session, 'execution')
+        sink.write_metrics(session, 'execution',
+                           [_metric({'race': 'black'}), _metric({})],
+                           created_on=_CREATED_ON)
+
+        replacement = _metric({'race': 'black'}, 10, 5)
+        sink.write_metrics(session, 'execution', [replacement],
+                           created_on=_CREATED_ON)
+        sink.complete_execution(session, 'execution')
+        session.commit()
+
+        assert _dicts(sink.read_current_metrics(session), 'execution') \
+            == _dicts([replacement, _metric({})], 'execution')
+
+    def test_complete_execution_swaps_current(self):
+        session = Session()
+        sink.start_execution(session, 'old')
+        sink.write_metrics(session, 'old', [_metric({})])
+        sink.complete_execution(session, 'old')
+        session.commit()
+
+        new_metrics = [_metric({}, 8, 2), _metric({'sex': 'female'}, 8, 2)]
+        sink.start_execution(session, 'new')
+        sink.write_metrics(session, 'new', new_metrics,
+                           created_on=_CREATED_ON)
+        assert len(sink.read_current_metrics(session)) == 1
+
+        sink.complete_execution(session, 'new', delete_previous=True)
+        session.commit()
+
+        assert _dicts(sink.read_current_metrics(session), 'new') \
+            == _dicts(new_metrics, 'new')
+        assert session.query(RecidivismMetricRow).count() == 2
+
+    def test_complete_unknown_execution(self):
+        with pytest.raises(ValueError):
+            sink.complete_execution(Session(), 'unknown')
+
+    def test_write_metrics_without_characteristics(self):
+        metric = _metric({'race': 'black'})
+        metric.characteristics = None
+
+        session = Session()
+        sink.start_execution(session, 1)
+        sink.write_metrics(session, 1, [metric], created_on=_CREATED_ON)
+
+        row = session.query(RecidivismMetricRow).one()
+        assert row.characteristics == _metric({'race': 'black'}) \
+            .characteristics
+
+    def test_export_metrics_csv(self, tmpdir):
+        metrics = [_metric({}), _metric({'race': None})]
+        path = str(tmpdir.join('metrics.csv'))
+
+        sink.export_metrics(metrics, path)
+
+        df = pd.read_csv(path)
+        assert len(df) == 2
+        assert df['metric_key'].nunique() == 2
+        assert list(df['total_records']) == [4, 4]
+
+    def test_export_metrics_unknown_extension(self, tmpdir):
+        with pytest.raises(ValueError):
+            sink.export_metrics([], str(tmpdir.join('metrics.txt')))
@@ -0,0 +1,126 @@
+# Recidiviz - a platform for tracking granular recidivism metrics in real time
+# Copyright (C) 2019 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+
+"""Tests for recidivism/vectorized.py."""
+
+from collections import defaultdict
+from datetime import date
+
+import pytest
+
+from recidiviz.calculator.recidivism import calculator, vectorized
+from recidiviz.calculator.recidivism.recidivism_event import RecidivismEvent
+from recidiviz.tests.calculator.recidivism.pipeline_test import FakePerson
+
+
+def _people_events():
+    """People with a mix of recidivism histories, including leap days, month
+    ends and unknown characteristics."""
+    people_events = []
+    for i in range(24):
+        person = FakePerson(key='person-{}'.format(i),
+                            birthdate=date(1972 + i, 2 if i % 5 else 3,
+                                           29 if i % 4 == 0 else 1 + i),
+                            race=[None, 'black', 'white'][i % 3],
+                            sex=['male', 'female'][i % 2])
+        entry = date(2003 + i % 4, 1 + i % 12, 31 if i % 6 == 0 else 15)
+        release = date(2008 + i % 6, 2, 29 if i % 6 == 0 else 28 - i)
+        if i % 3:
+            reincarceration = date(release.year + i % 4, 1 + i % 12, 1 + i)
+            second_release = date(reincarceration.year + 1, 5, 5)
+            events = {
+                release.year: RecidivismEvent.recidivism_event(
+                    entry, release, 'Sing Sing', reincarceration, 'Upstate',
+                    False),
+                second_release.year: RecidivismEvent.non_recidivism_event(
+                    reincarceration, second_release,
+                    [None, 'Upstate'][i % 2]),
+            }
+        else:
+            events = {release.year: RecidivismEvent.non_recidivism_event(
+                entry, release, 'Adirondack')}
+        people_events.append((person, events))
+    return people_events
+
+
+def _reference_cells(people_events):
+    totals = defaultdict(lambda: [0, 0.0])
+    for person, events in people_events:
+        for metric_key, value in calculator.map_recidivism_combinations(
+                person, events):
+            combination = metric_key.to_combination()
+            key = (combination.pop('release_cohort'),
+                   combination.pop('follow_up_period'),
+                   combination.pop('methodology'),
+                   tuple(sorted(combination.items())))
+            totals[key][0] += 1
+            totals[key][1] += value
+    return {key: tuple(value) for key, value in totals.items()}
+
+
+def _vectorized_cells(metrics):
+    cells = {}
+    for row in metrics.itertuples(index=False):
+        key = (row.release_cohort, row.follow_up_period, row.methodology,
+               tuple(sorted((name, getattr(row, name))
+                            for name in row.characteristics)))
+        assert key not in cells
+        cells[key] = (row.total_records, row.total_recidivism)
+    return cells
+
+
+class TestCalculateMetrics:
+    """Tests for vectorized.calculate_metrics."""
+
+    def test_matches_reference(self):
+        people_events = _people_events()
+
+        metrics = vectorized.calculate_metrics(
+            vectorized.events_frame(people_events))
+
+        expected = _reference_cells(people_events)
+        actual = _vectorized_cells(metrics)
+        assert actual.keys() == expected.keys()
+        for key, (records, recidivism) in expected.items():
+            assert actual[key][0] == records
+            assert actual[key][1] == pytest.approx(recidivism)
+
+    def test_rates(self):
+        metrics = vectorized.calculate_metrics(
+            vectorized.events_frame(_people_events()))
+
+        for metric in vectorized.to_recidivism_metrics(metrics):
+            assert metric.recidivism_rate == pytest.approx(
+                metric.total_recidivism / metric.total_records)
+
+    def test_current_date_limits_periods(self):
+        person = FakePerson(birthdate=date(1980, 1, 1), race='black',
+                            sex='male')
+        event = RecidivismEvent.non_recidivism_event(
+            date(2010, 1, 1), date(2012, 6, 1), 'Sing Sing')
+
+        metrics = vectorized.calculate_metrics(
+            vectorized.events_frame([(person, {2012: event})]),
+            current_date=date(2014, 6, 1))
+
+        assert sorted(set(metrics['follow_up_period'])) == [1, 2, 3]
+        assert (metrics['total_recidivism'] == 0).all()
+
+    def test_no_events(self):
+        metrics = vectorized.calculate_metrics(vectorized.events_frame([]))
+
+        assert vectorized.to_recidivism_metrics(metrics) == []
@@ -0,0 +1,84 @@
+# Recidiviz - a platform for tracking granular recidivism metrics in real time
+# Copyright (C) 2019 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+
+"""Measures the aggregate_ingest_utils helpers the aggregate parsers use to
+clean the tables tabula returns, on a synthetic table the size of a large
+report. See aggregate_parsers_benchmark for timing the parsers themselves.
+
+Benchmarks are not collected by pytest. Run directly:
+python -m recidiviz.tests.ingest.aggregate.aggregate_ingest_utils_benchmark \
+    --repeat 5
+"""
+
+import argparse
+import time
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from recidiviz.ingest.aggregate import aggregate_ingest_utils
+
+
+def _time(fn: Callable[[], object], repeat: int) -> float:
+    """Returns the fastest of |repeat| runs of |fn|, in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark_utils(num_rows: int, repeat: int):
+    """Times the helpers on a table of string counts, as tabula returns."""
+    columns = ['facility_name'] + ['count_{}'.format(i) for i in range(20)]
+    counts = np.random.randint(0, 1000, size=(num_rows, len(columns) - 1))
+    df = pd.DataFrame(counts, columns=columns[1:]).astype(str)
+    df.insert(0, 'facility_name', 'County Jail')
+
+    def _cast_column_by_column():
+        result = df.copy()
+        for column_name in columns[1:]:
+            result[column_name] = result[column_name].astype(int)
+
+    print('{:<50} {:.4f}s'.format(
+        'astype(int), column by column', _time(_cast_column_by_column, repeat)))
+    print('{:<50} {:.4f}s'.format(
+        'cast_columns_to_int', _time(
+            lambda: aggregate_ingest_utils.cast_columns_to_int(
+                df.copy(), ignore_columns={'facility_name'}), repeat)))
+    print('{:<50} {:.4f}s'.format(
+        'cast_columns_to_numeric', _time(
+            lambda: aggregate_ingest_utils.cast_columns_to_numeric(
+                df.copy(), ignore_columns={'facility_name'}), repeat)))
+
+    rename_dict = {r'.*{}$'.format(column_name): column_name.upper()
+                   for column_name in columns}
+    print('{:<50} {:.4f}s'.format(
+        'rename_columns_and_select(use_regex) x 100', _time(
+            lambda: [aggregate_ingest_utils.rename_columns_and_select(
+                df, rename_dict, use_regex=True) for _ in range(100)],
+            repeat)))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--num_rows', type=int, default=10000)
+    args = parser.parse_args()
+    benchmark_utils(args.num_rows, args.repeat)
@@ -79,3 +79,96 @@ class TestAggregateIngestUtils(TestCase):
         })
 
         assert_frame_equal(result, expected_result)
+
+    def testRenameWithRegex_ReusesMatchesForSameColumns(self):
+        # Arrange
+        pages = [pd.DataFrame({'County': ['Anderson'], 'PRETRIAL': [90]}),
+                 pd.DataFrame({'County': ['Andrews'], 'PRETRIAL': [20]})]
+
+        rename_dict = {
+            r'.*Cou.*': 'facility_name',
+            r'PRETRIAL': 'pretrial_adp',
+        }
+
+        # Act
+        results = [aggregate_ingest_utils.rename_columns_and_select(
+            page, rename_dict, use_regex=True) for page in pages]
+
+        # Assert
+        assert_frame_equal(results[1], pd.DataFrame({
+            'facility_name': ['Andrews'],
+            'pretrial_adp': [20],
+        }))
+
+    def testCastColumnsToInt(self):
+        # Arrange
+        subject = pd.DataFrame({
+            'facility_name': ['Anderson', 'Andrews'],
+            'pretrial_adp': ['90', '20'],
+            'capacity': [100, None],
+        })
+
+        # Act
+        result = aggregate_ingest_utils.cast_columns_to_int(
+            subject, ignore_columns={'facility_name'},
+            nullable_int_columns={'capacity'})
+
+        # Assert
+        expected_result = pd.DataFrame({
+            'facility_name': ['Anderson', 'Andrews'],
+            'pretrial_adp': [90, 20],
+            'capacity': [100.0, None],
+        })
+
+        assert_frame_equal(result, expected_result)
+
+    def testCastColumnsToNumeric(self):
+        # Arrange
+        subject = pd.DataFrame({
+            'facility_name': ['Anderson', 'Andrews'],
+            'pretrial_adp': ['90', '20'],
+            'capacity': ['100.5', None],
+        })
+
+        # Act
+        result = aggregate_ingest_utils.cast_columns_to_numeric(
+            subject, ignore_columns={'facility_name'})
+
+        # Assert
+        expected_result = pd.DataFrame({
+            'facility_name': ['Anderson', 'Andrews'],
+            'pretrial_adp': [90, 20],
+            'capacity': [100.5, None],
+        })
+
+        assert_frame_equal(result, expected_result)
+
+    def testCastColumnsToNumeric_RaisesErrorNamingEveryBadCell(self):
+        # Arrange
+        subject = pd.DataFrame({
+            'facility_name': ['Anderson', 'Andrews'],
+            'pretrial_adp': ['90', 'N/R'],
+            'capacity': ['1,000', None],
+        })
+
+        # Act
+        with self.assertRaises(
+                aggregate_ingest_utils.DataFrameCastError) as context:
+            aggregate_ingest_utils.cast_columns_to_numeric(
+                subject, ignore_columns={'facility_name'})
+
+        # Assert
+        message = str(context.exception)
+        self.assertIn("(1, 'pretrial_adp'): 'N/R'", message)
+        self.assertIn("(0, 'capacity'): '1,000'", message)
+        self.assertNotIn('None', message)
+
+    def testLabelBlocks(self):
+        # Arrange
+        is_block_start = pd.Series([False, True, False, True, True])
+
+        # Act
+        result = aggregate_ingest_utils.label_blocks(is_block_start)
+
+        # Assert
+        self.assertEqual(result.tolist(), [0, 1, 1, 2, 3])
@@ -0,0 +1,271 @@
+# Recidiviz - a platform for tracking granular recidivism metrics in real time
+# Copyright (C) 2019 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+
+"""Measures where each state's aggregate parser spends its time, and checks
+that its output has not changed.
+
+Every fixture report under regions/*/fixtures is parsed, plus every report
+under each --path directory, laid out as <path>/<state>/<filename> like the
+reports read by ingest_aggregate_reports. For each report the time spent in
+tabula, in matching county names to fips and in the rest of parse (the pandas
+post-processing) is recorded, along with the number of rows and a checksum of
+each table parse returned. These are compared against the golden values in
+aggregate_parsers_golden.json, keyed by <state>/<filename>, and everything is
+written as a JSON report. A report without golden values counts as a failure,
+like one whose tables changed.
+
+tabula is not cached, so its time is that of a first ingest of the report.
+With --trace_memory the peak memory allocated by Python during each parse is
+recorded too; tracing slows pandas down, so the times are less accurate. The
+JVM tabula runs in is not included.
+
+The checksums depend on the tabula and pandas versions, so run against the
+locked dependencies. After intentionally changing a parser's output, update
+the golden values with --update_golden, which also adds golden values for new
+reports. Changes are still reported, but only reports that fail to parse then
+make the exit status non-zero.
+
+Benchmarks are not collected by pytest. Run directly:
+python -m recidiviz.tests.ingest.aggregate.aggregate_parsers_benchmark \
+    --output /tmp/aggregate_parsers.json
+"""
+
+import argparse
+import functools
+import glob
+import hashlib
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+import us
+from mock import patch
+
+from recidiviz.ingest.aggregate import batch_ingest, fips, tabula_cache
+from recidiviz.ingest.aggregate.regions.pa import pa_aggregate_ingest
+
+_REGIONS_DIR = os.path.join(os.path.dirname(__file__), 'regions')
+
+_GOLDEN_PATH = os.path.join(os.path.dirname(__file__),
+                            'aggregate_parsers_golden.json')
+
+# Pennsylvania is not ingested by the cloud function but has a parser
+_STATE_TO_PARSER = dict(batch_ingest.STATE_TO_PARSER,
+                        pennsylvania=pa_aggregate_ingest.parse)
+
+_REPORT_EXTENSIONS = ('.pdf', '.xls', '.xlsx')
+
+_MIB = 1024 * 1024
+
+
+class _Timer:
+    """Accumulates the time spent in the functions it wraps."""
+
+    def __init__(self):
+        self.seconds = 0.0
+
+    def wrap(self, fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def _timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.seconds += time.perf_counter() - start
+        return _timed
+
+
+def list_reports(paths: List[str]) -> List[Tuple[str, str]]:
+    """Returns a (state, path) tuple for each fixture report and each report
+    under |paths|, where state is a key of _STATE_TO_PARSER."""
+    state_paths = [
+        (_state_for_dir(os.path.basename(os.path.dirname(fixtures_path))),
+         report_path)
+        for fixtures_path in sorted(
+            glob.glob(os.path.join(_REGIONS_DIR, '*', 'fixtures')))
+        for report_path in _list_report_paths(fixtures_path)]
+
+    for path in paths:
+        for state_dir in sorted(os.listdir(path)):
+            state_path = os.path.join(path, state_dir)
+            if os.path.isdir(state_path):
+                state_paths.extend(
+                    (_state_for_dir(state_dir), report_path)
+                    for report_path in _list_report_paths(state_path))
+
+    return state_paths
+
+
+def _list_report_paths(path: str) -> List[str]:
+    return [os.path.join(path, filename)
+            for filename in sorted(os.listdir(path))
+            if filename.lower().endswith(_REPORT_EXTENSIONS)]
+
+
+def _state_for_dir(dir_name: str) -> str:
+    """Returns the state of a directory named after a region code, e.g. 'ky',
+    or a state, e.g. 'new_york'."""
+    state = us.states.lookup(dir_name.replace('_', ' '))
+    if not state:
+        raise ValueError('No state for directory: {}'.format(dir_name))
+    return state.name.lower().replace(' ', '_')
+
+
+def benchmark_report(state: str, path: str, trace_memory: bool,
+                     golden: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Parses the report at |path| and returns its entry in the JSON report.
+
+    The entry's status is 'ok', 'failed' if parse raised, 'missing' if there is
+    no |golden| or 'changed' if the tables do not match |golden|.
+    """
+    result: Dict[str, Any] = {'state': state, 'path': path}
+    tabula_timer = _Timer()
+    fips_timer = _Timer()
+
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        with patch.object(tabula_cache, 'read_pdf',
+                          tabula_timer.wrap(tabula_cache.read_pdf)), \
+                patch.object(fips, 'add_column_to_df',
+                             fips_timer.wrap(fips.add_column_to_df)):
+            start = time.perf_counter()
+            tables = _STATE_TO_PARSER[state](path)
+            total = time.perf_counter() - start
+    except Exception as e:
+        result['status'] = 'failed'
+        result['error'] = repr(e)
+        return result
+    finally:
+        if trace_memory:
+            result['peak_memory_mib'] = \
+                tracemalloc.get_traced_memory()[1] / _MIB
+            tracemalloc.stop()
+
+    result['seconds'] = {
+        'total': total,
+        'tabula': tabula_timer.seconds,
+        'fips': fips_timer.seconds,
+        'pandas': total - tabula_timer.seconds - fips_timer.seconds,
+    }
+    result['tables'] = {
+        table.__tablename__: {'rows': len(df), 'checksum': _checksum(df)}
+        for table, df in tables.items()}
+
+    if golden is None:
+        result['status'] = 'missing'
+    elif result['tables'] != golden:
+        result['status'] = 'changed'
+        result['golden'] = golden
+    else:
+        result['status'] = 'ok'
+        result['golden'] = 'matched'
+    return result
+
+
+def _checksum(df: pd.DataFrame) -> str:
+    """Returns a checksum of the values, column names and dtypes of |df|,
+    ignoring the order of its columns."""
+    df = df.reindex(columns=sorted(df.columns))
+    digest = hashlib.sha256()
+    digest.update(repr(list(df.dtypes.astype(str).items())).encode('utf-8'))
+    digest.update(df.to_csv(index=False, float_format='%.6g').encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def _golden_key(state: str, path: str) -> str:
+    return '{}/{}'.format(state, os.path.basename(path))
+
+
+def run(paths: List[str], trace_memory: bool, update_golden: bool,
+        golden_path: str) -> Dict[str, Any]:
+    """Benchmarks every report and returns the JSON report."""
+    goldens: Dict[str, Any] = {}
+    if os.path.exists(golden_path):
+        with open(golden_path) as f:
+            goldens = json.load(f)
+
+    results = []
+    for state, path in list_reports(paths):
+        key = _golden_key(state, path)
+        result = benchmark_report(state, path, trace_memory,
+                                  goldens.get(key))
+        print('{:<60} {:>7}  {}'.format(
+            key, result['status'],
+            '{total:6.2f}s  tabula: {tabula:6.2f}s  fips: {fips:6.3f}s  '
+            'pandas: {pandas:6.3f}s'.format(**result['seconds'])
+            if 'seconds' in result else result['error']))
+        if update_golden and 'tables' in result:
+            goldens[key] = result['tables']
+        results.append(result)
+
+    if update_golden:
+        with open(golden_path, 'w') as f:
+            json.dump(goldens, f, indent=2, sort_keys=True)
+            f.write('\n')
+
+    return {
+        'reports': results,
+        'seconds': {
+            name: sum(result['seconds'][name] for result in results
+                      if 'seconds' in result)
+            for name in ('total', 'tabula', 'fips', 'pandas')},
+        'failed': [result['path'] for result in results
+                   if result['status'] == 'failed'],
+        'changed': [result['path'] for result in results
+                    if result['status'] == 'changed'],
+        'missing': [result['path'] for result in results
+                    if result['status'] == 'missing'],
+    }
+
+
+def main(args) -> int:
+    report = run(args.path, args.trace_memory, args.update_golden,
+                 args.golden_path)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    for name, seconds in sorted(report['seconds'].items()):
+        print('{:<10} {:8.2f}s'.format(name, seconds))
+    print('{} failed, {} changed, {} missing golden values'.format(
+        len(report['failed']), len(report['changed']),
+        len(report['missing'])))
+    if args.update_golden:
+        return 1 if report['failed'] else 0
+    return 1 if report['failed'] or report['changed'] or report['missing'] \
+        else 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--path', action='append', default=[],
+                        help='A directory of reports laid out as '
+                             '<path>/<state>/<filename>, to parse as well as '
+                             'the fixtures. Can be repeated.')
+    parser.add_argument('--output',
+                        help='The file to write the JSON report to.')
+    parser.add_argument('--golden_path', default=_GOLDEN_PATH)
+    parser.add_argument('--update_golden', action='store_true',
+                        help='Write the row counts and checksums of every '
+                             'report parsed as the new golden values.')
+    parser.add_argument('--trace_memory', action='store_true')
+    sys.exit(main(parser.parse_args()))
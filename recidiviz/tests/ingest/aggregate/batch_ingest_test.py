@@ -0,0 +1,183 @@
+# Recidiviz - a platform for tracking granular recidivism metrics in real time
+# Copyright (C) 2019 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Tests for batch_ingest."""
+from unittest import TestCase
+
+import pandas as pd
+from mock import patch
+from pandas.util.testing import assert_frame_equal
+
+from recidiviz.ingest.aggregate import batch_ingest
+from recidiviz.persistence.database.schema import FlCountyAggregate, \
+    FlFacilityAggregate
+
+
+class _DeferredPool:
+    """A stand-in for multiprocessing.Pool that runs each task when its
+    result is fetched, recording the order of submissions and fetches."""
+
+    def __init__(self, _num_workers):
+        self.events = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        pass
+
+    def apply_async(self, func, args):
+        (_, path), = args
+        self.events.append(('submit', path))
+        return _DeferredResult(self, func, args)
+
+
+class _DeferredResult:
+    """The result of a task submitted to a _DeferredPool."""
+
+    def __init__(self, pool, func, args):
+        self.pool = pool
+        self.func = func
+        self.args = args
+
+    def get(self):
+        (_, path), = self.args
+        self.pool.events.append(('get', path))
+        return self.func(*self.args)
+
+
+def _fake_parse(filename):
+    if 'corrupt' in filename:
+        raise ValueError('Failed to read {}'.format(filename))
+
+    return {
+        FlCountyAggregate: pd.DataFrame({'county_name': [filename]}),
+        FlFacilityAggregate: pd.DataFrame({'facility_name': [filename] * 2}),
+    }
+
+
+@patch.dict(batch_ingest.STATE_TO_PARSER, {'florida': _fake_parse})
+class TestBatchIngest(TestCase):
+    """Tests for batch_ingest."""
+
+    def testParseFiles_ConcatenatesTablesInOrder(self):
+        # Act
+        result = batch_ingest.parse_files(
+            [('florida', 'a.pdf'), ('florida', 'b.pdf')], num_workers=1)
+
+        # Assert
+        assert_frame_equal(result.tables[FlCountyAggregate],
+                           pd.DataFrame({'county_name': ['a.pdf', 'b.pdf']}))
+        assert_frame_equal(
+            result.tables[FlFacilityAggregate],
+            pd.DataFrame({'facility_name': ['a.pdf', 'a.pdf',
+                                            'b.pdf', 'b.pdf']}))
+        self.assertEqual(result.failed_paths, [])
+
+    def testParseFilesInWorkers_ConcatenatesTablesInOrder(self):
+        # Arrange
+        paths = ['{}.pdf'.format(i) for i in range(10)]
+
+        # Act
+        result = batch_ingest.parse_files(
+            [('florida', path) for path in paths], num_workers=3)
+
+        # Assert
+        assert_frame_equal(result.tables[FlCountyAggregate],
+                           pd.DataFrame({'county_name': paths}))
+
+    def testParseFiles_SkipsFailedFiles(self):
+        # Act
+        result = batch_ingest.parse_files(
+            [('florida', 'a.pdf'), ('florida', 'corrupt.pdf'),
+             ('florida', 'b.pdf')], num_workers=1)
+
+        # Assert
+        assert_frame_equal(result.tables[FlCountyAggregate],
+                           pd.DataFrame({'county_name': ['a.pdf', 'b.pdf']}))
+        self.assertEqual(result.paths, ['a.pdf', 'corrupt.pdf', 'b.pdf'])
+        self.assertEqual(result.failed_paths, ['corrupt.pdf'])
+
+    def testParseFilesForUnknownState_RaisesValueError(self):
+        with self.assertRaises(ValueError):
+            batch_ingest.parse_files([('atlantis', 'a.pdf')], num_workers=1)
+
+    def testParseFilesInWorkersForUnknownState_RaisesValueError(self):
+        with self.assertRaises(ValueError):
+            batch_ingest.parse_files(
+                [('florida', 'a.pdf'), ('atlantis', 'b.pdf')], num_workers=2)
+
+    @patch('recidiviz.persistence.database.database.write_df')
+    def testIngest_WritesEachTableOnce(self, mock_write_df):
+        # Arrange
+        mock_write_df.return_value = 0
+
+        # Act
+        result = batch_ingest.ingest(
+            [('florida', 'a.pdf'), ('florida', 'b.pdf')], num_workers=1)
+
+        # Assert
+        self.assertEqual(mock_write_df.call_count, 2)
+        for (table, df), _ in mock_write_df.call_args_list:
+            assert_frame_equal(df, result.tables[table])
+
+    def testParseFilesFromGenerator_ConcatenatesTablesInOrder(self):
+        # Arrange
+        paths = ['{}.pdf'.format(i) for i in range(4)]
+
+        # Act
+        result = batch_ingest.parse_files(
+            (('florida', path) for path in paths), num_workers=2)
+
+        # Assert
+        assert_frame_equal(result.tables[FlCountyAggregate],
+                           pd.DataFrame({'county_name': paths}))
+
+    def testParseFilesInWorkers_BoundsLookAhead(self):
+        # Arrange
+        paths = ['{}.pdf'.format(i) for i in range(10)]
+        pools = []
+
+        def _pool(num_workers):
+            pools.append(_DeferredPool(num_workers))
+            return pools[-1]
+
+        # Act
+        with patch('multiprocessing.Pool', _pool):
+            result = batch_ingest.parse_files(
+                (('florida', path) for path in paths), num_workers=2)
+
+        # Assert
+        events = pools[0].events
+        for i, path in enumerate(paths[4:], start=4):
+            self.assertLess(events.index(('get', paths[i - 4])),
+                            events.index(('submit', path)))
+        self.assertEqual(result.paths, paths)
+
+    @patch('recidiviz.ingest.aggregate.parquet_export.write_tables')
+    @patch('recidiviz.persistence.database.database.write_df')
+    def testIngestWithExportPath_ExportsTables(
+            self, mock_write_df, mock_write_tables):
+        # Arrange
+        mock_write_df.return_value = 0
+
+        # Act
+        result = batch_ingest.ingest([('florida', 'a.pdf')], num_workers=1,
+                                     export_path='gs://bucket/parquet')
+
+        # Assert
+        mock_write_tables.assert_called_once_with(result.tables,
+                                                  'gs://bucket/parquet')
@@ -18,7 +18,7 @@
 from unittest import TestCase
 
 import pandas as pd
-from pandas.util.testing import assert_frame_equal
+from pandas.util.testing import assert_frame_equal, assert_series_equal
 import us
 
 from recidiviz.ingest.aggregate import fips
@@ -78,3 +78,43 @@ class TestFips(TestCase):
         # Act/Assert
         with self.assertRaises(FipsMergingError):
             fips.add_column_to_df(subject, subject.county, FakeState)
+
+    def testRepeatedCountyNames_GroupsRowsByCounty(self):
+        # Arrange
+        subject = pd.DataFrame({
+            'county': ['Jo Daviess', 'DuPage', 'Jo Daviess County', 'DuPage'],
+            'report': [1, 1, 2, 2]
+        })
+
+        # Act
+        result = fips.add_column_to_df(subject, subject.county, us.states.IL)
+
+        # Assert
+        expected_result = pd.DataFrame({
+            'county': ['DuPage', 'DuPage', 'Jo Daviess', 'Jo Daviess County'],
+            'report': [1, 2, 1, 2],
+            'fips': [
+                _DUPAGE_COUNTY_FIPS,
+                _DUPAGE_COUNTY_FIPS,
+                _JO_DAVIESS_COUNTY_FIPS,
+                _JO_DAVIESS_COUNTY_FIPS
+            ]
+        })
+
+        assert_frame_equal(result, expected_result)
+
+    def testResolve_ReturnsFipsOfEachCountyName(self):
+        # Arrange
+        county_names = pd.Series(['Efingham County', 'DuPage', 'Efingham'])
+
+        # Act
+        result = fips.resolve(county_names, us.states.IL)
+
+        # Assert
+        expected_result = pd.Series([
+            _EFFINGHAM_COUNTY_FIPS,
+            _DUPAGE_COUNTY_FIPS,
+            _EFFINGHAM_COUNTY_FIPS
+        ])
+
+        assert_series_equal(result, expected_result)
@@ -0,0 +1,151 @@
+# Recidiviz - a platform for tracking granular recidivism metrics in real time
+# Copyright (C) 2019 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Tests for parquet_export."""
+import datetime
+import os
+import tempfile
+from unittest import TestCase
+
+import pandas as pd
+from pandas.util.testing import assert_frame_equal
+
+from recidiviz.ingest.aggregate import parquet_export
+from recidiviz.persistence.database import database
+from recidiviz.persistence.database.schema import KyFacilityAggregate
+from recidiviz.tests.utils import fakes
+
+_TABLE_NAME = 'ky_facility_aggregate'
+
+_DF = pd.DataFrame({
+    'facility_name': ['Adair', 'Allen', 'Adair'],
+    'fips': [21001, 21003, 21001],
+    'report_date': [datetime.date(2018, 8, 23), datetime.date(2018, 8, 23),
+                    datetime.date(2018, 12, 20)],
+    'total_jail_beds': [51, 72, 51],
+})
+
+
+class TestParquetExport(TestCase):
+    """Tests for parquet_export."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = self.tmpdir.name
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def testWriteDf_PartitionsByStateAndReportDate(self):
+        # Act
+        parquet_export.write_df(_TABLE_NAME, _DF, self.path)
+
+        # Assert
+        self.assertEqual(
+            sorted(os.listdir(os.path.join(self.path, _TABLE_NAME,
+                                           'state=ky'))),
+            ['report_date=2018-08-23', 'report_date=2018-12-20'])
+
+    def testReadDf_ReadsOnlyDatesInRange(self):
+        # Arrange
+        parquet_export.write_df(_TABLE_NAME, _DF, self.path)
+
+        # Act
+        result = parquet_export.read_df(
+            _TABLE_NAME, self.path, datetime.date(2018, 1, 1),
+            datetime.date(2018, 8, 31))
+
+        # Assert
+        expected_result = pd.DataFrame({
+            'facility_name': ['Adair', 'Allen'],
+            'fips': pd.Categorical(['21001', '21003']),
+            'total_jail_beds': [51, 72],
+            'state': ['ky', 'ky'],
+            'report_date': [datetime.date(2018, 8, 23)] * 2,
+        })
+        assert_frame_equal(result, expected_result)
+
+    def testReadDf_ReadsOnlyGivenStatesAndColumns(self):
+        # Arrange
+        parquet_export.write_df(_TABLE_NAME, _DF, self.path)
+        parquet_export.write_df(_TABLE_NAME, pd.DataFrame({
+            'facility_name': ['Anderson'],
+            'fips': ['48001'],
+            'report_date': [datetime.date(2018, 8, 1)],
+            'total_jail_beds': [90],
+        }), self.path)
+
+        # Act
+        result = parquet_export.read_df(
+            _TABLE_NAME, self.path, datetime.date(2018, 1, 1),
+            datetime.date(2018, 12, 31), states=['tx'],
+            columns=['total_jail_beds'])
+
+        # Assert
+        expected_result = pd.DataFrame({
+            'total_jail_beds': [90],
+            'state': ['tx'],
+            'report_date': [datetime.date(2018, 8, 1)],
+        })
+        assert_frame_equal(result, expected_result)
+
+    def testWriteDfTwice_ReplacesPartitions(self):
+        # Act
+        parquet_export.write_df(_TABLE_NAME, _DF, self.path)
+        parquet_export.write_df(_TABLE_NAME, _DF, self.path)
+
+        # Assert
+        result = parquet_export.read_df(
+            _TABLE_NAME, self.path, datetime.date(2018, 1, 1),
+            datetime.date(2018, 12, 31))
+        self.assertEqual(len(result), len(_DF))
+
+    def testReadDfWithoutExport_ReturnsEmptyDf(self):
+        # Act
+        result = parquet_export.read_df(
+            _TABLE_NAME, self.path, datetime.date(2018, 1, 1),
+            datetime.date(2018, 12, 31))
+
+        # Assert
+        self.assertTrue(result.empty)
+
+    def testWriteSnapshot_ExportsWholeTable(self):
+        # Arrange
+        fakes.use_in_memory_sqlite_database()
+        df = _DF.assign(report_granularity='MONTHLY')
+        database.write_df(KyFacilityAggregate, df)
+
+        # Act
+        snapshot_path = parquet_export.write_snapshot(
+            _TABLE_NAME, self.path, datetime.date(2019, 3, 1))
+
+        # Assert
+        self.assertEqual(snapshot_path,
+                         os.path.join(self.path, 'snapshots', '2019-03-01'))
+        result = parquet_export.read_df(
+            _TABLE_NAME, snapshot_path, datetime.date(2018, 1, 1),
+            datetime.date(2018, 12, 31),
+            columns=['facility_name', 'fips', 'total_jail_beds'])
+        expected_result = pd.DataFrame({
+            'facility_name': ['Adair', 'Allen', 'Adair'],
+            'fips': pd.Categorical(['21001', '21003', '21001']),
+            'total_jail_beds': [51, 72, 51],
+            'state': ['ky', 'ky', 'ky'],
+            'report_date': [datetime.date(2018, 8, 23),
+                            datetime.date(2018, 8, 23),
+                            datetime.date(2018, 12, 20)],
+        })
+        assert_frame_equal(result, expected_result)
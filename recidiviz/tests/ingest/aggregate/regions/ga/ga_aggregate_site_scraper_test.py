@@ -15,6 +15,7 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # =============================================================================
 """Tests for ga_aggregate_ingest.py."""
+import datetime
 from unittest import TestCase
 from mock import patch, Mock
 import requests
@@ -30,21 +31,22 @@ REPORTS_YEAR_2019 = fixtures.as_string(
     'aggregate/regions/ga', 'reports_year_2019.html')
 
 
+def _MockGet(url):
+    response = Mock()
+    if 'node/5617' in url:
+        response.text = REPORTS_YEAR_2019
+    elif 'node/4036' in url:
+        response.text = REPORTS_YEAR_2015
+    else:
+        response.text = REPORTS_LANDING_HTML
+    return response
+
+
 class TestGaAggregateSiteScraper(TestCase):
     """Test that ga_aggregate_site_scraper correctly scrapes urls."""
 
     @patch.object(requests, 'get')
     def testGetAllUrls(self, mockget):
-        def _MockGet(url):
-            response = Mock()
-            if 'node/5617' in url:
-                response.text = REPORTS_YEAR_2019
-            elif 'node/4036' in url:
-                response.text = REPORTS_YEAR_2015
-            else:
-                response.text = REPORTS_LANDING_HTML
-            return response
-
         mockget.side_effect = _MockGet
         url1 = ('https://www.dca.ga.gov/sites/default/files/'
                 'jail_report_jan19.pdf')
@@ -54,3 +56,14 @@ class TestGaAggregateSiteScraper(TestCase):
 
         urls = ga_aggregate_site_scraper.get_urls_to_download()
         self.assertEqual(expected_urls, urls)
+
+    @patch.object(requests, 'get')
+    def testGetUrlsSince_OnlyCrawlsLaterYears(self, mockget):
+        mockget.side_effect = _MockGet
+        url = ('https://www.dca.ga.gov/sites/default/files/'
+               'jail_report_jan19.pdf')
+
+        urls = ga_aggregate_site_scraper.get_urls_to_download(
+            since=datetime.date(2019, 1, 1))
+        self.assertEqual({url}, urls)
+        self.assertEqual(mockget.call_count, 2)
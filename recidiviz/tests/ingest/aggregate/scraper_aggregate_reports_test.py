@@ -18,16 +18,19 @@
 from unittest import TestCase
 import builtins
 import datetime
+import hashlib
+import json
 import os
 import tempfile
 from flask import Flask
-from mock import patch, Mock, call
+from mock import patch, MagicMock, Mock, call
 import requests
 import gcsfs
 import pytz
 
-from recidiviz.ingest.aggregate import scrape_aggregate_reports
+from recidiviz.ingest.aggregate import crawl_state, scrape_aggregate_reports
 from recidiviz.ingest.aggregate.regions.ca import ca_aggregate_site_scraper
+from recidiviz.ingest.aggregate.regions.ga import ga_aggregate_site_scraper
 from recidiviz.ingest.aggregate.regions.ny import ny_aggregate_site_scraper
 from recidiviz.ingest.aggregate.regions.tx import tx_aggregate_site_scraper
 from recidiviz.tests.ingest import fixtures
@@ -53,20 +56,41 @@ EXISTING_PDF_NAME = '_url_test_existing.pdf'
 EXISTING_PDF_NAME2 = '_url_test_existing2.pdf'
 EXISTING_CA_NAME = 'california1996'
 NONEXISTING_PDF_NAME = '_url_test_nonexisting.pdf'
-TEST_CONTENT = 'test_content'
+TEST_CONTENT = b'test_content'
 TEST_ENV = 'recidiviz-test'
+TEST_ETAG = '"5c2b7f0e-1e8b1"'
+DOWNLOAD_DIR = '/tmp/download_dir'
+
+
+def _MockHead(url, **_):
+    ret = Mock()
+    ret.status_code = 200
+    ret.headers = {'ETag': TEST_ETAG}
+    return ret
 
 
 def _MockGet(url, **_):
     ret = Mock()
     if url in (EXISTING_TEST_URL, EXISTING_TEST_URL2, EXISTING_TEST_URL_CA):
         ret.status_code = 200
-        ret.content = TEST_CONTENT
+        ret.headers = {}
+        ret.iter_content.return_value = [TEST_CONTENT]
     else:
         ret.status_code = 500
     return ret
 
 
+def _crawl_state_json(**kwargs) -> str:
+    return json.dumps(crawl_state.CrawlState(**kwargs).to_serializable())
+
+
+def _written_crawl_state(mock_fs_return, path) -> crawl_state.CrawlState:
+    mock_fs_return.open.assert_called_with(path, 'wb')
+    written = mock_fs_return.open.return_value.__enter__.return_value.write \
+        .call_args[0][0]
+    return crawl_state.CrawlState.from_serializable(json.loads(written))
+
+
 class TestScraperAggregateReports(TestCase):
     """Test that tx_aggregate_site_scraper correctly scrapes urls."""
 
@@ -77,6 +101,12 @@ class TestScraperAggregateReports(TestCase):
             scrape_aggregate_reports.HISTORICAL_BUCKET.format(TEST_ENV)
         self.upload_bucket = \
             scrape_aggregate_reports.UPLOAD_BUCKET.format(TEST_ENV)
+        self.tmpdir_patcher = patch.object(tempfile, 'TemporaryDirectory')
+        self.mock_tmpdir = self.tmpdir_patcher.start()
+        self.mock_tmpdir.return_value.__enter__.return_value = DOWNLOAD_DIR
+
+    def teardown_method(self, _test_method):
+        self.tmpdir_patcher.stop()
 
     @patch.object(metadata, 'project_id')
     @patch.object(gcsfs, 'GCSFileSystem')
@@ -87,9 +117,11 @@ class TestScraperAggregateReports(TestCase):
             self, mock_get_all_tx, mock_open, mock_get, mock_fs, mock_env):
         mock_env.return_value = TEST_ENV
         # Make the info call return an older modified time than the server time.
-        mock_fs_return = Mock()
+        mock_fs_return = MagicMock()
         mock_fs.return_value = mock_fs_return
-        mock_fs_return.exists.return_value = True
+        mock_fs_return.cat.side_effect = FileNotFoundError
+        mock_fs_return.ls.return_value = [
+            os.path.join(self.historical_bucket, 'texas', EXISTING_PDF_NAME)]
         mock_get_all_tx.return_value = {EXISTING_TEST_URL}
         mock_get.side_effect = _MockGet
 
@@ -99,27 +131,37 @@ class TestScraperAggregateReports(TestCase):
         self.assertEqual(response.status_code, 200)
 
         mock_fs.assert_called_with(project=TEST_ENV, cache_timeout=-1)
-        mock_fs_return.exists.assert_called_with(
-            os.path.join(self.historical_bucket, 'texas', EXISTING_PDF_NAME))
+        mock_fs_return.ls.assert_called_once_with(
+            os.path.join(self.historical_bucket, 'texas'))
+        self.assertNotIn(call(EXISTING_TEST_URL, stream=True),
+                         mock_get.call_args_list)
         self.assertEqual(mock_fs_return.put.called, False)
         self.assertEqual(mock_open.called, False)
 
     @patch.object(metadata, 'project_id')
     @patch.object(gcsfs, 'GCSFileSystem')
+    @patch.object(requests, 'head')
     @patch.object(requests, 'get')
     @patch.object(builtins, 'open')
     @patch.object(ny_aggregate_site_scraper, 'get_urls_to_download')
-    def testExistsIsNyUpload(
-            self, mock_get_all_tx, mock_open, mock_get, mock_fs, mock_env):
+    def testExistsIsNyUpload(self, mock_get_all_ny, mock_open, mock_get,
+                             mock_head, mock_fs, mock_env):
         upload_bucket = os.path.join(
             self.upload_bucket, 'new_york', EXISTING_PDF_NAME)
-        temploc = os.path.join(tempfile.gettempdir(), EXISTING_PDF_NAME)
+        temploc = os.path.join(DOWNLOAD_DIR, EXISTING_PDF_NAME)
+        crawl_state_path = scrape_aggregate_reports.CRAWL_STATE_PATH.format(
+            TEST_ENV, 'new_york')
         mock_env.return_value = TEST_ENV
-        # Make the info call return an older modified time than the server time.
-        mock_fs_return = Mock()
+        mock_fs_return = MagicMock()
         mock_fs.return_value = mock_fs_return
-        mock_fs_return.exists.return_value = True
-        mock_get_all_tx.return_value = {EXISTING_TEST_URL}
+        mock_fs_return.ls.return_value = [
+            os.path.join(self.historical_bucket, 'new_york',
+                         EXISTING_PDF_NAME)]
+        mock_fs_return.cat.return_value = _crawl_state_json(
+            reports={EXISTING_PDF_NAME: crawl_state.Report(
+                url=EXISTING_TEST_URL, fingerprint='"an-older-etag"')})
+        mock_get_all_ny.return_value = {EXISTING_TEST_URL}
+        mock_head.side_effect = _MockHead
         mock_get.side_effect = _MockGet
 
         headers = {'X-Appengine-Cron': "test-cron"}
@@ -129,9 +171,51 @@ class TestScraperAggregateReports(TestCase):
 
         mock_fs.assert_called_with(project=TEST_ENV, cache_timeout=-1)
         self.assertFalse(mock_fs_return.exists.called)
+        mock_fs_return.cat.assert_called_with(crawl_state_path)
         mock_fs_return.put.assert_called_with(temploc, upload_bucket)
         mock_open.assert_called_with(temploc, 'wb')
-        mock_get.assert_called_with(EXISTING_TEST_URL)
+        mock_get.assert_called_with(EXISTING_TEST_URL, stream=True)
+        self.assertEqual(
+            _written_crawl_state(mock_fs_return, crawl_state_path).reports,
+            {EXISTING_PDF_NAME: crawl_state.Report(
+                url=EXISTING_TEST_URL,
+                fingerprint='sha256:{}'.format(
+                    hashlib.sha256(TEST_CONTENT).hexdigest()))})
+
+    @patch.object(metadata, 'project_id')
+    @patch.object(gcsfs, 'GCSFileSystem')
+    @patch.object(requests, 'head')
+    @patch.object(requests, 'get')
+    @patch.object(builtins, 'open')
+    @patch.object(ny_aggregate_site_scraper, 'get_urls_to_download')
+    def testExistsIsNyUnchangedEtagNoUpload(
+            self, mock_get_all_ny, mock_open, mock_get, mock_head, mock_fs,
+            mock_env):
+        crawl_state_path = scrape_aggregate_reports.CRAWL_STATE_PATH.format(
+            TEST_ENV, 'new_york')
+        reports = {EXISTING_PDF_NAME: crawl_state.Report(
+            url=EXISTING_TEST_URL, fingerprint=TEST_ETAG)}
+        mock_env.return_value = TEST_ENV
+        mock_fs_return = MagicMock()
+        mock_fs.return_value = mock_fs_return
+        mock_fs_return.cat.return_value = _crawl_state_json(reports=reports)
+        mock_get_all_ny.return_value = {EXISTING_TEST_URL}
+        mock_head.side_effect = _MockHead
+        mock_get.side_effect = _MockGet
+
+        headers = {'X-Appengine-Cron': "test-cron"}
+        response = self.client.get(
+            '/scrape_state?state=new_york', headers=headers)
+        self.assertEqual(response.status_code, 200)
+
+        mock_head.assert_called_with(EXISTING_TEST_URL, allow_redirects=True)
+        self.assertNotIn(call(EXISTING_TEST_URL, stream=True),
+                         mock_get.call_args_list)
+        self.assertFalse(mock_open.called)
+        self.assertFalse(mock_fs_return.put.called)
+        self.assertEqual(
+            _written_crawl_state(mock_fs_return, crawl_state_path).reports,
+            reports)
 
     @patch.object(metadata, 'project_id')
     @patch.object(gcsfs, 'GCSFileSystem')
@@ -142,12 +226,13 @@ class TestScraperAggregateReports(TestCase):
             self, mock_get_all_tx, mock_open, mock_get, mock_fs, mock_env):
         upload_bucket = os.path.join(
             self.upload_bucket, 'texas', EXISTING_PDF_NAME)
-        temploc = os.path.join(tempfile.gettempdir(), EXISTING_PDF_NAME)
+        temploc = os.path.join(DOWNLOAD_DIR, EXISTING_PDF_NAME)
         mock_env.return_value = TEST_ENV
         # Make the info call return an older modified time than the server time.
-        mock_fs_return = Mock()
+        mock_fs_return = MagicMock()
         mock_fs.return_value = mock_fs_return
-        mock_fs_return.exists.return_value = False
+        mock_fs_return.cat.side_effect = FileNotFoundError
+        mock_fs_return.ls.return_value = []
         mock_get_all_tx.return_value = {EXISTING_TEST_URL}
         mock_get.side_effect = _MockGet
 
@@ -157,11 +242,13 @@ class TestScraperAggregateReports(TestCase):
         self.assertEqual(response.status_code, 200)
 
         mock_fs.assert_called_with(project=TEST_ENV, cache_timeout=-1)
-        mock_fs_return.exists.assert_called_with(
-            os.path.join(self.historical_bucket, 'texas', EXISTING_PDF_NAME))
+        mock_fs_return.ls.assert_called_once_with(
+            os.path.join(self.historical_bucket, 'texas'))
         mock_fs_return.put.assert_called_with(temploc, upload_bucket)
         mock_open.assert_called_with(temploc, 'wb')
-        mock_get.assert_called_with(EXISTING_TEST_URL)
+        mock_open.return_value.__enter__.return_value.write \
+            .assert_called_with(TEST_CONTENT)
+        mock_get.assert_called_with(EXISTING_TEST_URL, stream=True)
 
     @patch.object(metadata, 'project_id')
     @patch.object(metadata, 'project_number')
@@ -174,13 +261,14 @@ class TestScraperAggregateReports(TestCase):
             mock_number, mock_env):
         upload_bucket = os.path.join(
             self.upload_bucket, 'california', EXISTING_CA_NAME)
-        temploc = os.path.join(tempfile.gettempdir(), EXISTING_CA_NAME)
+        temploc = os.path.join(DOWNLOAD_DIR, EXISTING_CA_NAME)
         mock_env.return_value = TEST_ENV
         mock_number.return_value = TEST_ENV
         # Make the info call return an older modified time than the server time.
-        mock_fs_return = Mock()
+        mock_fs_return = MagicMock()
         mock_fs.return_value = mock_fs_return
-        mock_fs_return.exists.return_value = False
+        mock_fs_return.cat.side_effect = FileNotFoundError
+        mock_fs_return.ls.return_value = []
         mock_get_all_ca.return_value = [(EXISTING_TEST_URL_CA, CA_POST_DATA)]
         mock_post.side_effect = _MockGet
 
@@ -190,12 +278,12 @@ class TestScraperAggregateReports(TestCase):
         self.assertEqual(response.status_code, 200)
 
         mock_fs.assert_called_with(project=TEST_ENV, cache_timeout=-1)
-        mock_fs_return.exists.assert_called_with(
-            os.path.join(
-                self.historical_bucket, 'california', EXISTING_CA_NAME))
+        mock_fs_return.ls.assert_called_once_with(
+            os.path.join(self.historical_bucket, 'california'))
         mock_fs_return.put.assert_called_with(temploc, upload_bucket)
         mock_open.assert_called_with(temploc, 'wb')
-        mock_post.assert_called_with(EXISTING_TEST_URL_CA, data=CA_POST_DATA)
+        mock_post.assert_called_with(EXISTING_TEST_URL_CA, data=CA_POST_DATA,
+                                     stream=True)
 
     @patch.object(metadata, 'project_id')
     @patch.object(gcsfs, 'GCSFileSystem')
@@ -208,13 +296,14 @@ class TestScraperAggregateReports(TestCase):
             self.upload_bucket, 'texas', EXISTING_PDF_NAME)
         upload_bucket2 = os.path.join(
             self.upload_bucket, 'texas', EXISTING_PDF_NAME2)
-        temploc1 = os.path.join(tempfile.gettempdir(), EXISTING_PDF_NAME)
-        temploc2 = os.path.join(tempfile.gettempdir(), EXISTING_PDF_NAME2)
+        temploc1 = os.path.join(DOWNLOAD_DIR, EXISTING_PDF_NAME)
+        temploc2 = os.path.join(DOWNLOAD_DIR, EXISTING_PDF_NAME2)
         mock_env.return_value = TEST_ENV
         # Make the info call return an older modified time than the server time.
-        mock_fs_return = Mock()
+        mock_fs_return = MagicMock()
         mock_fs.return_value = mock_fs_return
-        mock_fs_return.exists.return_value = False
+        mock_fs_return.cat.side_effect = FileNotFoundError
+        mock_fs_return.ls.return_value = []
         mock_get_all_tx.return_value = {EXISTING_TEST_URL, EXISTING_TEST_URL2}
         mock_get.side_effect = _MockGet
 
@@ -225,14 +314,8 @@ class TestScraperAggregateReports(TestCase):
 
         mock_fs.assert_called_with(project=TEST_ENV, cache_timeout=-1)
         self.assertEqual(mock_fs.call_count, 1)
-        expected_exists_calls = [
-            call(os.path.join(
-                self.historical_bucket, 'texas', EXISTING_PDF_NAME)),
-            call(os.path.join(
-                self.historical_bucket, 'texas', EXISTING_PDF_NAME2))
-        ]
-        self.assertCountEqual(
-            mock_fs_return.exists.call_args_list, expected_exists_calls)
+        mock_fs_return.ls.assert_called_once_with(
+            os.path.join(self.historical_bucket, 'texas'))
         expected_put_calls = [call(temploc1, upload_bucket1),
                               call(temploc2, upload_bucket2)]
         self.assertCountEqual(
@@ -240,6 +323,11 @@ class TestScraperAggregateReports(TestCase):
         expected_open_calls = [call(temploc1, 'wb'),
                                call(temploc2, 'wb')]
         self.assertCountEqual(mock_open.call_args_list, expected_open_calls)
+        # Each report is downloaded into a directory of its own, which is
+        # removed once the report is uploaded.
+        self.assertEqual(self.mock_tmpdir.call_count, 2)
+        self.assertEqual(
+            self.mock_tmpdir.return_value.__exit__.call_count, 2)
 
     @patch.object(metadata, 'project_id')
     @patch.object(gcsfs, 'GCSFileSystem')
@@ -250,24 +338,15 @@ class TestScraperAggregateReports(TestCase):
             self, mock_get_all_tx, mock_open, mock_get, mock_fs, mock_env):
         historical_path1 = os.path.join(
             self.historical_bucket, 'texas', EXISTING_PDF_NAME)
-        historical_path2 = os.path.join(
-            self.historical_bucket, 'texas', EXISTING_PDF_NAME2)
-
-        def _exists_return(path):
-            ret_bool = False
-            if path == historical_path1:
-                ret_bool = True
-            elif path == historical_path2:
-                ret_bool = False
-            return ret_bool
         upload_bucket2 = os.path.join(
             self.upload_bucket, 'texas', EXISTING_PDF_NAME2)
-        temploc2 = os.path.join(tempfile.gettempdir(), EXISTING_PDF_NAME2)
+        temploc2 = os.path.join(DOWNLOAD_DIR, EXISTING_PDF_NAME2)
         mock_env.return_value = TEST_ENV
         # Make the info call return an older modified time than the server time.
-        mock_fs_return = Mock()
+        mock_fs_return = MagicMock()
         mock_fs.return_value = mock_fs_return
-        mock_fs_return.exists.side_effect = _exists_return
+        mock_fs_return.cat.side_effect = FileNotFoundError
+        mock_fs_return.ls.return_value = [historical_path1]
         mock_get_all_tx.return_value = {EXISTING_TEST_URL, EXISTING_TEST_URL2}
         mock_get.side_effect = _MockGet
 
@@ -278,13 +357,114 @@ class TestScraperAggregateReports(TestCase):
 
         mock_fs.assert_called_with(project=TEST_ENV, cache_timeout=-1)
         self.assertEqual(mock_fs.call_count, 1)
-        expected_exists_calls = [
-            call(historical_path1),
-            call(historical_path2)
-        ]
-        self.assertCountEqual(
-            mock_fs_return.exists.call_args_list, expected_exists_calls)
+        self.assertEqual(mock_fs_return.ls.call_count, 1)
+        self.assertNotIn(call(EXISTING_TEST_URL, stream=True),
+                         mock_get.call_args_list)
+        mock_get.assert_called_with(EXISTING_TEST_URL2, stream=True)
         self.assertEqual(mock_fs_return.put.call_count, 1)
         mock_fs_return.put.assert_called_with(temploc2, upload_bucket2)
         mock_open.assert_called_with(temploc2, 'wb')
         self.assertEqual(mock_open.call_count, 1)
+
+    @patch.object(metadata, 'project_id')
+    @patch.object(gcsfs, 'GCSFileSystem')
+    @patch.object(requests, 'get')
+    @patch.object(builtins, 'open')
+    @patch.object(tx_aggregate_site_scraper, 'get_urls_to_download')
+    def testMultipleUrlsOne500_UploadsOthersAndRaises(
+            self, mock_get_all_tx, mock_open, mock_get, mock_fs, mock_env):
+        upload_bucket = os.path.join(
+            self.upload_bucket, 'texas', EXISTING_PDF_NAME)
+        temploc = os.path.join(DOWNLOAD_DIR, EXISTING_PDF_NAME)
+        mock_env.return_value = TEST_ENV
+        mock_fs_return = MagicMock()
+        mock_fs.return_value = mock_fs_return
+        mock_fs_return.cat.side_effect = FileNotFoundError
+        mock_fs_return.ls.return_value = []
+        mock_get_all_tx.return_value = [NONEXISTING_TEST_URL,
+                                        EXISTING_TEST_URL]
+        mock_get.side_effect = _MockGet
+
+        headers = {'X-Appengine-Cron': "test-cron"}
+        with self.assertRaises(scrape_aggregate_reports.ScrapeAggregateError):
+            self.client.get('/scrape_state?state=texas', headers=headers)
+
+        mock_fs_return.put.assert_called_once_with(temploc, upload_bucket)
+        mock_open.assert_called_once_with(temploc, 'wb')
+        self.assertIsNone(_written_crawl_state(
+            mock_fs_return, scrape_aggregate_reports.CRAWL_STATE_PATH.format(
+                TEST_ENV, 'texas')).last_crawl_date)
+
+    @patch.object(metadata, 'project_id')
+    @patch.object(gcsfs, 'GCSFileSystem')
+    @patch.object(requests, 'get')
+    @patch.object(builtins, 'open')
+    @patch.object(tx_aggregate_site_scraper, 'get_urls_to_download')
+    def testKnownInCrawlStateNoUpload(
+            self, mock_get_all_tx, mock_open, mock_get, mock_fs, mock_env):
+        crawl_state_path = scrape_aggregate_reports.CRAWL_STATE_PATH.format(
+            TEST_ENV, 'texas')
+        mock_env.return_value = TEST_ENV
+        mock_fs_return = MagicMock()
+        mock_fs.return_value = mock_fs_return
+        mock_fs_return.ls.return_value = []
+        mock_fs_return.cat.return_value = _crawl_state_json(
+            reports={EXISTING_PDF_NAME: crawl_state.Report(
+                url=EXISTING_TEST_URL)})
+        mock_get_all_tx.return_value = {EXISTING_TEST_URL}
+        mock_get.side_effect = _MockGet
+
+        headers = {'X-Appengine-Cron': "test-cron"}
+        response = self.client.get(
+            '/scrape_state?state=texas', headers=headers)
+        self.assertEqual(response.status_code, 200)
+
+        self.assertNotIn(call(EXISTING_TEST_URL, stream=True),
+                         mock_get.call_args_list)
+        self.assertFalse(mock_open.called)
+        self.assertFalse(mock_fs_return.put.called)
+        self.assertEqual(
+            _written_crawl_state(mock_fs_return, crawl_state_path)
+            .last_crawl_date, datetime.date.today())
+
+    @patch.object(metadata, 'project_id')
+    @patch.object(gcsfs, 'GCSFileSystem')
+    @patch.object(ga_aggregate_site_scraper, 'get_urls_to_download')
+    def testIncrementalScraper_CrawlsSinceLastCrawl(
+            self, mock_get_all_ga, mock_fs, mock_env):
+        mock_env.return_value = TEST_ENV
+        mock_fs_return = MagicMock()
+        mock_fs.return_value = mock_fs_return
+        mock_fs_return.ls.return_value = []
+        mock_fs_return.cat.return_value = _crawl_state_json(
+            last_crawl_date=datetime.date(2019, 6, 1))
+        mock_get_all_ga.return_value = set()
+
+        headers = {'X-Appengine-Cron': "test-cron"}
+        response = self.client.get(
+            '/scrape_state?state=georgia', headers=headers)
+        self.assertEqual(response.status_code, 200)
+
+        # pylint: disable=protected-access
+        mock_get_all_ga.assert_called_once_with(
+            since=datetime.date(2019, 6, 1)
+            - scrape_aggregate_reports._RECRAWL_WINDOW)
+
+    @patch.object(metadata, 'project_id')
+    @patch.object(gcsfs, 'GCSFileSystem')
+    @patch.object(ga_aggregate_site_scraper, 'get_urls_to_download')
+    def testFullRecrawl_IgnoresCrawlState(
+            self, mock_get_all_ga, mock_fs, mock_env):
+        mock_env.return_value = TEST_ENV
+        mock_fs_return = MagicMock()
+        mock_fs.return_value = mock_fs_return
+        mock_fs_return.ls.return_value = []
+        mock_get_all_ga.return_value = set()
+
+        headers = {'X-Appengine-Cron': "test-cron"}
+        response = self.client.get(
+            '/scrape_state?state=georgia&full_recrawl=true', headers=headers)
+        self.assertEqual(response.status_code, 200)
+
+        self.assertFalse(mock_fs_return.cat.called)
+        mock_get_all_ga.assert_called_once_with()
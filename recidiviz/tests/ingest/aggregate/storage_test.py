@@ -0,0 +1,75 @@
+# Recidiviz - a platform for tracking granular recidivism metrics in real time
+# Copyright (C) 2019 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Tests for storage."""
+import os
+import tempfile
+from unittest import TestCase
+
+from mock import patch
+
+from recidiviz.ingest.aggregate import storage
+
+
+class TestStorage(TestCase):
+    """Tests for storage."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = self.tmpdir.name
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def testOpenPathToWrite_CreatesDirectories(self):
+        # Arrange
+        path = os.path.join(self.path, 'a', 'b', 'file')
+
+        # Act
+        with storage.open_path(path, 'wb') as f:
+            f.write(b'contents')
+
+        # Assert
+        with storage.open_path(path, 'rb') as f:
+            self.assertEqual(f.read(), b'contents')
+        self.assertEqual(storage.list_dir(os.path.join(self.path, 'a')),
+                         ['b'])
+
+    def testListDirWithoutDirectory_ReturnsEmptyList(self):
+        self.assertEqual(
+            storage.list_dir(os.path.join(self.path, 'missing')), [])
+
+    @patch('gcsfs.GCSFileSystem')
+    def testOpenGcsPath_OpensWithoutPrefix(self, mock_fs):
+        # Act
+        storage.open_path('gs://bucket/prefix/file', 'rb')
+
+        # Assert
+        mock_fs.return_value.open.assert_called_once_with(
+            'bucket/prefix/file', 'rb')
+
+    @patch('gcsfs.GCSFileSystem')
+    def testListGcsDir_ReturnsNames(self, mock_fs):
+        # Arrange
+        mock_fs.return_value.ls.return_value = [
+            'bucket/prefix/state=ky/', 'bucket/prefix/state=tx/']
+
+        # Act
+        names = storage.list_dir('gs://bucket/prefix')
+
+        # Assert
+        mock_fs.return_value.ls.assert_called_once_with('bucket/prefix')
+        self.assertEqual(names, ['state=ky', 'state=tx'])
@@ -0,0 +1,192 @@
+# Recidiviz - a platform for tracking granular recidivism metrics in real time
+# Copyright (C) 2019 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Tests for tabula_cache."""
+import os
+import tempfile
+from unittest import TestCase
+
+import pandas as pd
+from mock import patch
+from pandas.util.testing import assert_frame_equal
+
+from recidiviz.ingest.aggregate import tabula_cache
+
+_TABLE = pd.DataFrame({
+    ('County', 'Name'): ['Adair', 'Allen'],
+    ('County', 'Population'): [51, '31*'],
+})
+
+
+def _skip_header(row):
+    return row == 0
+
+
+def _skip_every(num_rows):
+    return lambda row: row % num_rows == 0
+
+
+@patch('tabula.read_pdf')
+class TestTabulaCache(TestCase):
+    """Tests for tabula_cache."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.tmpdir.name, 'cache')
+        self.pdf = self._write_pdf('report.pdf', b'%PDF report')
+        tabula_cache.set_cache_path(self.cache_path)
+
+    def tearDown(self):
+        tabula_cache.set_cache_path(None)
+        self.tmpdir.cleanup()
+
+    def _write_pdf(self, name, contents):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, 'wb') as pdf:
+            pdf.write(contents)
+        return path
+
+    def testReadPdfTwice_ReadsFromCache(self, mock_read_pdf):
+        # Arrange
+        mock_read_pdf.return_value = _TABLE
+
+        # Act
+        first = tabula_cache.read_pdf(self.pdf, pages=[3], lattice=True)
+        second = tabula_cache.read_pdf(self.pdf, lattice=True, pages=[3])
+
+        # Assert
+        mock_read_pdf.assert_called_once_with(self.pdf, pages=[3],
+                                              lattice=True)
+        assert_frame_equal(first, _TABLE)
+        assert_frame_equal(second, _TABLE)
+
+    def testReadPdfMultipleTables_CachesEveryTable(self, mock_read_pdf):
+        # Arrange
+        mock_read_pdf.return_value = [_TABLE, _TABLE.head(1)]
+
+        # Act
+        tabula_cache.read_pdf(self.pdf, multiple_tables=True)
+        result = tabula_cache.read_pdf(self.pdf, multiple_tables=True)
+
+        # Assert
+        self.assertEqual(mock_read_pdf.call_count, 1)
+        self.assertEqual(len(result), 2)
+        assert_frame_equal(result[1], _TABLE.head(1))
+
+    def testReadPdfWithOtherOptionsOrContents_RunsTabula(self, mock_read_pdf):
+        # Arrange
+        mock_read_pdf.return_value = _TABLE
+        copy = self._write_pdf('copy.pdf', b'%PDF report')
+        revised = self._write_pdf('revised.pdf', b'%PDF revised report')
+
+        # Act
+        tabula_cache.read_pdf(self.pdf, pages=[3])
+        tabula_cache.read_pdf(self.pdf, pages=[4])
+        tabula_cache.read_pdf(copy, pages=[3])
+        tabula_cache.read_pdf(revised, pages=[3])
+
+        # Assert
+        self.assertEqual(mock_read_pdf.call_count, 3)
+
+    def testReadPdfWithFunctionOption_ReadsFromCache(self, mock_read_pdf):
+        # Arrange
+        mock_read_pdf.return_value = _TABLE
+
+        # Act
+        tabula_cache.read_pdf(
+            self.pdf, pandas_options={'skiprows': _skip_header})
+        tabula_cache.read_pdf(
+            self.pdf, pandas_options={'skiprows': _skip_header})
+
+        # Assert
+        self.assertEqual(mock_read_pdf.call_count, 1)
+
+    def testReadPdfWithChangedFunctionOption_RunsTabula(self, mock_read_pdf):
+        # Arrange
+        mock_read_pdf.return_value = _TABLE
+
+        # Act
+        tabula_cache.read_pdf(
+            self.pdf, pandas_options={'skiprows': lambda i: i % 52 == 0})
+        tabula_cache.read_pdf(
+            self.pdf, pandas_options={'skiprows': lambda i: i % 60 == 0})
+
+        # Assert
+        self.assertEqual(mock_read_pdf.call_count, 2)
+
+    def testReadPdfWithChangedClosureOption_RunsTabula(self, mock_read_pdf):
+        # Arrange
+        mock_read_pdf.return_value = _TABLE
+
+        # Act
+        tabula_cache.read_pdf(
+            self.pdf, pandas_options={'skiprows': _skip_every(52)})
+        tabula_cache.read_pdf(
+            self.pdf, pandas_options={'skiprows': _skip_every(52)})
+        tabula_cache.read_pdf(
+            self.pdf, pandas_options={'skiprows': _skip_every(60)})
+
+        # Assert
+        self.assertEqual(mock_read_pdf.call_count, 2)
+
+    def testReadPdfWithCorruptCache_RunsTabula(self, mock_read_pdf):
+        # Arrange
+        mock_read_pdf.return_value = _TABLE
+        os.makedirs(self.cache_path)
+        with open(os.path.join(self.cache_path,
+                               tabula_cache.cache_key(self.pdf)), 'wb') as f:
+            f.write(b'corrupt')
+
+        # Act
+        result = tabula_cache.read_pdf(self.pdf)
+
+        # Assert
+        self.assertEqual(mock_read_pdf.call_count, 1)
+        assert_frame_equal(result, _TABLE)
+
+    def testReadPdfWithoutCachePath_RunsTabula(self, mock_read_pdf):
+        # Arrange
+        tabula_cache.set_cache_path(None)
+        mock_read_pdf.return_value = _TABLE
+
+        # Act
+        tabula_cache.read_pdf(self.pdf)
+        tabula_cache.read_pdf(self.pdf)
+
+        # Assert
+        self.assertEqual(mock_read_pdf.call_count, 2)
+        self.assertFalse(os.path.exists(self.cache_path))
+
+    def testSetGcsCachePath_Raises(self, mock_read_pdf):
+        # Act
+        with self.assertRaises(ValueError):
+            tabula_cache.set_cache_path('gs://bucket/cache')
+
+        # Assert
+        self.assertFalse(mock_read_pdf.called)
+
+    def testReadPdfWithGcsCachePathFromEnvironment_Raises(
+            self, mock_read_pdf):
+        # Arrange
+        mock_read_pdf.return_value = _TABLE
+
+        # Act
+        with patch.object(tabula_cache, '_cache_path', 'gs://bucket/cache'), \
+                self.assertRaises(ValueError):
+            tabula_cache.read_pdf(self.pdf)
+
+        # Assert
+        self.assertFalse(mock_read_pdf.called)
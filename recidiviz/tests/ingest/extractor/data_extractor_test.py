@@ -419,3 +419,22 @@ class HtmlDataExtractorTest(unittest.TestCase):
         info = self.extract('three_levels_multi_key.html',
                             'three_levels_multi_key.yaml')
         self.assertEqual(expected_info, info)
+
+    def test_setter_plans_are_cached_per_lookup_key(self):
+        # pylint: disable=protected-access
+        yaml_path = os.path.join(os.path.dirname(__file__),
+                                 '../testdata/data_extractor/yaml',
+                                 'bonds.yaml')
+        extractor = HtmlDataExtractor(yaml_path)
+        contents = html.fromstring(
+            fixtures.as_string('testdata/data_extractor/html', 'bonds.html'))
+        extractor.extract_and_populate_data(contents)
+        plans = dict(extractor._setter_plans)
+
+        extractor.extract_and_populate_data(contents)
+
+        self.assertTrue(plans)
+        self.assertEqual(plans, extractor._setter_plans)
+        bond_plan = plans['bond.amount']
+        self.assertTrue(bond_plan.is_multi_key)
+        self.assertEqual(('person', 'booking', 'charge'), bond_plan.hierarchy)
@@ -0,0 +1,71 @@
+# Recidiviz - a platform for tracking granular recidivism metrics in real time
+# Copyright (C) 2019 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+
+"""Measures the memory footprint and build time of a large IngestInfo.
+
+Benchmarks are not collected by pytest. Run directly:
+python -m recidiviz.tests.ingest.models.ingest_info_benchmark --num_people 50000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from recidiviz.ingest.models.ingest_info import IngestInfo
+
+
+def build_ingest_info(num_people: int) -> IngestInfo:
+    """Builds an IngestInfo shaped like a typical multi-page roster scrape:
+    one booking per person with two charges, each with a bond."""
+    ii = IngestInfo()
+    for i in range(num_people):
+        person = ii.create_person(person_id=str(i), full_name='LAST, FIRST',
+                                  birthdate='1/1/1980', gender='M', race='W')
+        booking = person.create_booking(booking_id='B' + str(i),
+                                        admission_date='1/1/2019',
+                                        facility='COUNTY JAIL')
+        booking.create_arrest(agency='SHERIFF')
+        for j in range(2):
+            charge = booking.create_charge(charge_id='C{}-{}'.format(i, j),
+                                           name='THEFT', degree='F3')
+            charge.create_bond(amount='$1,000.00', bond_type='CASH')
+    return ii
+
+
+def main(num_people: int):
+    tracemalloc.start()
+    start = time.perf_counter()
+    ii = build_ingest_info(num_people)
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    equal = ii == ii.prune()
+    compare_elapsed = time.perf_counter() - start
+
+    print('people:          {}'.format(len(ii.people)))
+    print('build time:      {:.2f}s'.format(elapsed))
+    print('prune + eq time: {:.2f}s ({})'.format(compare_elapsed, equal))
+    print('retained memory: {:.1f} MiB'.format(current / 2 ** 20))
+    print('peak memory:     {:.1f} MiB'.format(peak / 2 ** 20))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--num_people', type=int, default=50000)
+    main(parser.parse_args().num_people)
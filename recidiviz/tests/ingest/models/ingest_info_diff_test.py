@@ -0,0 +1,106 @@
+# Recidiviz - a platform for tracking granular recidivism metrics in real time
+# Copyright (C) 2019 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+
+"""Tests for ingest_info_diff"""
+
+import unittest
+
+from recidiviz.ingest.models import ingest_info
+from recidiviz.ingest.models.ingest_info import IngestInfo
+from recidiviz.ingest.models.ingest_info_diff import diff_ingest_infos, \
+    ingest_infos_differ
+
+
+class TestIngestInfoDiff(unittest.TestCase):
+    """Tests for ingest_info_diff"""
+
+    def test_equal(self):
+        expected = IngestInfo()
+        expected.create_person(surname='A').create_booking().create_charge()
+        actual = IngestInfo()
+        actual.create_person(surname='A').create_booking().create_charge()
+
+        self.assertEqual(diff_ingest_infos(expected, actual), [])
+        self.assertFalse(ingest_infos_differ(expected, actual))
+
+    def test_field_changed(self):
+        expected = IngestInfo()
+        expected.create_person().create_booking().create_charge(name='A')
+        actual = IngestInfo()
+        actual.create_person().create_booking().create_charge(name='B')
+
+        self.assertEqual(
+            diff_ingest_infos(expected, actual),
+            ["root.people[0].bookings[0].charges[0].name: "
+             "expected 'A' but got 'B'"])
+        self.assertTrue(ingest_infos_differ(expected, actual))
+
+    def test_child_object_missing(self):
+        expected = IngestInfo()
+        expected.create_person().create_booking().create_charge() \
+            .create_bond(amount='1')
+        actual = IngestInfo()
+        actual.create_person().create_booking().create_charge()
+
+        self.assertEqual(
+            diff_ingest_infos(expected, actual),
+            ["root.people[0].bookings[0].charges[0].bond: "
+             "expected Bond(amount='1') but got None"])
+
+    def test_children_aligned_by_id(self):
+        expected = IngestInfo()
+        expected.create_person(person_id='1', surname='A')
+        expected.create_person(person_id='2', surname='B')
+        actual = IngestInfo()
+        actual.create_person(person_id='3', surname='C')
+        actual.create_person(person_id='2', surname='B')
+        actual.create_person(person_id='1', surname='A')
+
+        self.assertEqual(
+            diff_ingest_infos(expected, actual),
+            ['root.people[0]: got the following unexpected item:\n'
+             '{}'.format(actual.people[0])])
+
+    def test_children_with_same_id_aligned_in_order(self):
+        expected = IngestInfo()
+        person = expected.create_person()
+        person.create_booking(booking_id='1', admission_date='1/1/2019')
+        person.create_booking(booking_id='1', admission_date='2/1/2019')
+        actual = IngestInfo()
+        person = actual.create_person()
+        person.create_booking(booking_id='1', admission_date='1/1/2019')
+        person.create_booking(booking_id='1', admission_date='3/1/2019')
+
+        self.assertEqual(
+            diff_ingest_infos(expected, actual),
+            ["root.people[0].bookings[1].admission_date: "
+             "expected '2/1/2019' but got '3/1/2019'"])
+
+    def test_children_without_ids_aligned_by_position(self):
+        expected = IngestInfo()
+        booking = expected.create_person().create_booking()
+        booking.create_hold(jurisdiction_name='A')
+        booking.create_hold(jurisdiction_name='B')
+        actual = IngestInfo()
+        actual.create_person().create_booking().create_hold(
+            jurisdiction_name='A')
+
+        self.assertEqual(
+            diff_ingest_infos(expected, actual),
+            ['root.people[0].bookings[0].holds[1]: expected the following '
+             'object, but none was found:\n'
+             '{}'.format(ingest_info.Hold(jurisdiction_name='B'))])
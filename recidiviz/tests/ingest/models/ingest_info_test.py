@@ -36,7 +36,7 @@ class TestIngestInfo(unittest.TestCase):
         def _verify_fields(proto, ingest_info_source, ignore=None):
             ignore = ignore or []
             proto_fields = [field.name for field in proto.DESCRIPTOR.fields]
-            source_fields = vars(ingest_info_source)
+            source_fields = ingest_info_source.__slots__
             for field in proto_fields:
                 if field not in source_fields and field not in ignore:
                     raise FieldsDontMatchError(
@@ -104,3 +104,40 @@ class TestIngestInfo(unittest.TestCase):
                         sentence=ingest_info.Sentence(is_life='False'))],
                     holds=[ingest_info.Hold(hold_id=1)])])])
         self.assertEqual(ii.prune(), expected)
+
+    def test_prune_keeps_unchanged_lists(self):
+        charges = [ingest_info.Charge(name='A'), ingest_info.Charge(name='B')]
+        booking = ingest_info.Booking(charges=charges,
+                                      holds=[ingest_info.Hold()])
+
+        booking.prune()
+
+        self.assertIs(booking.charges, charges)
+        self.assertEqual(len(booking.charges), 2)
+        self.assertEqual(booking.holds, [])
+
+    def test_setattr_unknown_field_raises(self):
+        person = ingest_info.Person()
+        with self.assertRaises(AttributeError):
+            person.not_a_field = 'value'
+
+    def test_setattr_blank_string_is_none(self):
+        person = ingest_info.Person(surname='   ')
+        person.given_names = ''
+        self.assertIsNone(person.surname)
+        self.assertIsNone(person.given_names)
+
+    def test_eq(self):
+        booking = ingest_info.Booking(booking_id='1', charges=[
+            ingest_info.Charge(name='CHARGE')])
+        same_booking = ingest_info.Booking(booking_id='1', charges=[
+            ingest_info.Charge(name='CHARGE')])
+
+        self.assertEqual(booking, same_booking)
+        self.assertNotEqual(booking, ingest_info.Booking(booking_id='2'))
+        self.assertNotEqual(ingest_info.Hold(status='A'),
+                            ingest_info.Bond(status='A'))
+
+    def test_unhashable(self):
+        with self.assertRaises(TypeError):
+            hash(ingest_info.Person())
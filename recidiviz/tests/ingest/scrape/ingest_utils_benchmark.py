@@ -0,0 +1,60 @@
+# Recidiviz - a platform for tracking granular recidivism metrics in real time
+# Copyright (C) 2019 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+
+"""Micro-benchmarks for the IngestInfo <-> proto conversions used by queue
+transport.
+
+Benchmarks are not collected by pytest. Run directly:
+python -m recidiviz.tests.ingest.scrape.ingest_utils_benchmark --num_people 1000
+"""
+
+import argparse
+import timeit
+
+from recidiviz.ingest.scrape import ingest_utils
+from recidiviz.tests.ingest.models.ingest_info_benchmark import \
+    build_ingest_info
+
+
+def main(num_people: int, repeat: int):
+    ii = build_ingest_info(num_people)
+    proto = ingest_utils.convert_ingest_info_to_proto(ii)
+    serializable = ingest_utils.ingest_info_to_serializable(ii)
+
+    benchmarks = [
+        ('py -> proto',
+         lambda: ingest_utils.convert_ingest_info_to_proto(ii)),
+        ('proto -> py',
+         lambda: ingest_utils.convert_proto_to_ingest_info(proto)),
+        ('py -> serializable',
+         lambda: ingest_utils.ingest_info_to_serializable(ii)),
+        ('serializable -> py',
+         lambda: ingest_utils.ingest_info_from_serializable(serializable)),
+    ]
+
+    for name, func in benchmarks:
+        best = min(timeit.repeat(func, number=1, repeat=repeat))
+        print('{:<20} {:8.1f} ms  {:10.0f} people/s'.format(
+            name, best * 1000, num_people / best))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--num_people', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    main(args.num_people, args.repeat)
@@ -25,7 +25,9 @@ from recidiviz.common.constants.charge import ChargeStatus
 from recidiviz.common.constants.hold import HoldStatus
 from recidiviz.common.constants.sentence import SentenceStatus
 from recidiviz.common.ingest_metadata import IngestMetadata
+from recidiviz.ingest.models import ingest_info as ingest_info_py
 from recidiviz.ingest.models.ingest_info_pb2 import IngestInfo
+from recidiviz.ingest.scrape.ingest_utils import convert_ingest_info_to_proto
 from recidiviz.persistence.converter import converter
 from recidiviz.persistence.entities import Person, Booking, Arrest, Charge, \
     Bond, Sentence, Hold
@@ -304,3 +306,32 @@ class TestConverter(unittest.TestCase):
         )]
 
         self.assertEqual(result, expected_result)
+
+    def testConvert_PythonIngestInfo_MatchesProtoConversion(self):
+        # Arrange
+        metadata = IngestMetadata.new_with_defaults(
+            region='REGION', last_seen_time=_LAST_SEEN_TIME)
+
+        ingest_info = ingest_info_py.IngestInfo()
+        person = ingest_info.create_person(person_id='PERSON_ID', race='W')
+        booking = person.create_booking(booking_id='BOOKING_ID',
+                                        total_bond_amount='$100')
+        booking.create_arrest(agency='PD')
+        booking.create_hold(jurisdiction_name='COUNTY')
+        booking.create_charge(name='DUI', number_of_counts='2')
+        # A second object with the same id is merged into the first.
+        duplicate = ingest_info.create_person(person_id='PERSON_ID')
+        duplicate.create_booking(booking_id='OTHER_BOOKING_ID')
+        charge = ingest_info.create_person().create_booking().create_charge(
+            charge_id='CHARGE_ID')
+        charge.create_sentence(is_life='True')
+        ingest_info.create_person(full_name='NO BOOKINGS')
+
+        # Act
+        result = converter.convert(ingest_info, metadata)
+
+        # Assert
+        expected_result = converter.convert(
+            convert_ingest_info_to_proto(ingest_info), metadata)
+        self.assertEqual(len(result), 3)
+        self.assertEqual(result, expected_result)
@@ -111,6 +111,41 @@ class TestDatabase(TestCase):
         # Assert
         self.assertEqual(people, [database_utils.convert(person)])
 
+    def test_readPersonIdsChangedSince(self):
+        last_run = datetime.datetime(2018, 6, 20)
+        before = last_run - datetime.timedelta(days=1)
+        after = last_run + datetime.timedelta(days=1)
+
+        session = Session()
+        for person_id in range(1, 5):
+            session.add(Person(person_id=person_id, region=_REGION))
+        for booking_id, person_id in ((1, 3), (2, 2), (3, 4)):
+            session.add(Booking(
+                booking_id=booking_id, person_id=person_id,
+                custody_status=CustodyStatus.IN_CUSTODY.value,
+                last_seen_time=before))
+        session.commit()
+
+        def booking_snapshot(booking_id, person_id, valid_from, valid_to=None):
+            return BookingHistory(
+                booking_id=booking_id, person_id=person_id,
+                custody_status=CustodyStatus.IN_CUSTODY.value,
+                valid_from=valid_from, valid_to=valid_to)
+
+        session.add(PersonHistory(person_id=1, region=_REGION,
+                                  valid_from=before))
+        session.add(PersonHistory(person_id=2, region=_REGION,
+                                  valid_from=after))
+        session.add(booking_snapshot(1, 3, before, after))
+        session.add(booking_snapshot(1, 3, after))
+        session.add(booking_snapshot(2, 2, after))
+        session.add(booking_snapshot(3, 4, before))
+        session.commit()
+
+        changed = database.read_person_ids_changed_since(session, last_run)
+
+        self.assertEqual(changed, {2, 3})
+
     def test_readPeopleByExternalId(self):
         admission_date = datetime.datetime(2018, 6, 20)
         release_date = datetime.date(2018, 7, 20)
@@ -801,3 +836,49 @@ class TestDatabase(TestCase):
         # the subject (eg. county_population = 0 for 'Alachua')
         expected_sum_county_populations = 1001056402
         self.assertEqual(result, expected_sum_county_populations)
+
+    def testWriteDf_OverlappingData_ReturnsNumberOfRowsInserted(self):
+        # Arrange
+        initial_df = pd.DataFrame({
+            'county_name': ['Alachua', 'Baker'],
+            'county_population': [257062, 26965],
+            'fips': ['0', '1'],
+            'report_date': 2 * [DATE_SCRAPED],
+            'report_granularity': 2 * [enum_strings.monthly_granularity]
+        })
+        subject = pd.DataFrame({
+            'county_name': ['Alachua', 'NewCounty', 'NewCounty', 'Baker'],
+            'county_population': [0, 1000, 2000, 0],
+            'fips': ['0', '1000', '1000', '1'],
+            'report_date': 4 * [DATE_SCRAPED],
+            'report_granularity': 4 * [enum_strings.monthly_granularity]
+        })
+
+        # Act
+        initial_inserted = database.write_df(FlCountyAggregate, initial_df)
+        inserted = database.write_df(FlCountyAggregate, subject)
+
+        # Assert
+        self.assertEqual(initial_inserted, 2)
+        self.assertEqual(inserted, 1)
+        query = Session().query(FlCountyAggregate) \
+            .filter(FlCountyAggregate.fips == '1000')
+        self.assertEqual(one(query.all()).county_population, 1000)
+
+    def testWriteDf_RowViolatingOtherConstraint_SkipsOnlyThatRow(self):
+        # Arrange
+        subject = pd.DataFrame({
+            'county_name': ['Alachua', 'Baker', 'Bay'],
+            'fips': ['0', None, '2'],
+            'report_date': 3 * [DATE_SCRAPED],
+            'report_granularity': 3 * [enum_strings.monthly_granularity]
+        })
+
+        # Act
+        inserted = database.write_df(FlCountyAggregate, subject)
+
+        # Assert
+        self.assertEqual(inserted, 2)
+        query = Session().query(FlCountyAggregate.county_name)
+        self.assertCountEqual([name for name, in query.all()],
+                              ['Alachua', 'Bay'])
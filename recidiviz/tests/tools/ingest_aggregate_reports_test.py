@@ -0,0 +1,117 @@
+# Recidiviz - a platform for tracking granular recidivism metrics in real time
+# Copyright (C) 2019 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Tests for ingest_aggregate_reports."""
+import os
+import tempfile
+import threading
+from unittest import TestCase
+
+from mock import MagicMock
+
+from recidiviz.tools import ingest_aggregate_reports
+
+
+class TestIngestAggregateReports(TestCase):
+    """Tests for ingest_aggregate_reports."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = self.tmpdir.name
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def testListLocalReports_SkipsMissingStates(self):
+        # Arrange
+        os.makedirs(os.path.join(self.path, 'florida'))
+        for filename in ['b.pdf', 'a.pdf']:
+            open(os.path.join(self.path, 'florida', filename), 'w').close()
+
+        # Act
+        state_paths = ingest_aggregate_reports.list_local_reports(
+            self.path, ['florida', 'kentucky'])
+
+        # Assert
+        self.assertEqual(state_paths, [
+            ('florida', os.path.join(self.path, 'florida', 'a.pdf')),
+            ('florida', os.path.join(self.path, 'florida', 'b.pdf')),
+        ])
+
+    def testDownloadReports_SkipsMissingStates(self):
+        # Arrange
+        def _ls(path):
+            if path != 'bucket/florida':
+                raise FileNotFoundError(path)
+            return ['bucket/florida/a.pdf']
+
+        fs = MagicMock()
+        fs.ls.side_effect = _ls
+
+        # Act
+        state_paths = list(ingest_aggregate_reports.download_reports(
+            fs, 'bucket', ['florida', 'kentucky'], self.path, []))
+
+        # Assert
+        self.assertEqual(state_paths, [
+            ('florida', os.path.join(self.path, 'florida', 'a.pdf'))])
+
+    def testDownloadReports_DownloadsNextReportWhileHandlingOne(self):
+        # Arrange
+        next_report_downloaded = threading.Event()
+
+        def _get(remote_path, local_path):
+            open(local_path, 'w').close()
+            if remote_path.endswith('b.pdf'):
+                next_report_downloaded.set()
+
+        fs = MagicMock()
+        fs.ls.return_value = ['bucket/florida/a.pdf', 'bucket/florida/b.pdf']
+        fs.get.side_effect = _get
+
+        # Act
+        state_paths = []
+        for state, path in ingest_aggregate_reports.download_reports(
+                fs, 'bucket', ['florida'], self.path, []):
+            if not state_paths:
+                # b.pdf is downloaded while a.pdf is being handled.
+                self.assertTrue(next_report_downloaded.wait(timeout=5))
+            state_paths.append((state, os.path.basename(path)))
+
+        # Assert
+        self.assertEqual(state_paths,
+                         [('florida', 'a.pdf'), ('florida', 'b.pdf')])
+
+    def testDownloadReportsWithFailedDownload_DownloadsTheRest(self):
+        # Arrange
+        def _get(remote_path, local_path):
+            if remote_path.endswith('a.pdf'):
+                raise IOError('Failed to download {}'.format(remote_path))
+            open(local_path, 'w').close()
+
+        fs = MagicMock()
+        fs.ls.return_value = ['bucket/florida/a.pdf', 'bucket/florida/b.pdf']
+        fs.get.side_effect = _get
+        failed_paths = []
+
+        # Act
+        state_paths = list(ingest_aggregate_reports.download_reports(
+            fs, 'bucket', ['florida'], self.path, failed_paths))
+
+        # Assert
+        self.assertEqual(state_paths, [
+            ('florida', os.path.join(self.path, 'florida', 'b.pdf'))])
+        self.assertEqual(failed_paths, ['gs://bucket/florida/a.pdf'])
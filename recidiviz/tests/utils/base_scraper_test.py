@@ -79,7 +79,7 @@ class BaseScraperTest:
             # in the relevant class.
             for value in manifest['key_mappings'].values():
                 class_to_set, attr = value.split('.')
-                if attr not in vars(object_verification_map[class_to_set]):
+                if attr not in object_verification_map[class_to_set].__slots__:
                     raise AttributeError(
                         "Attribute %s is unknown on %s, found in key_mappings"
                         % (attr, class_to_set))
@@ -87,7 +87,8 @@ class BaseScraperTest:
             if 'multi_key_mappings' in manifest:
                 for value in manifest['multi_key_mappings'].values():
                     class_to_set, attr = value.split('.')
-                    if attr not in vars(object_verification_map[class_to_set]):
+                    fields = object_verification_map[class_to_set].__slots__
+                    if attr not in fields:
                         raise AttributeError(
                             "Attribute %s is unknown on %s, found in "
                             "multi_key_mappings" % (attr, class_to_set))
@@ -151,6 +152,11 @@ class BaseScraperTest:
         converted_people = converter.convert(result_proto, metadata)
         validate_one_open_booking(converted_people)
 
+        # Scraped data is persisted without the proto hop, so make sure the
+        # direct conversion agrees with the proto conversion.
+        assert converter.convert(result.ingest_info, metadata) == \
+            converted_people
+
         differences = diff_ingest_infos(expected_ingest_info,
                                         result.ingest_info)
 